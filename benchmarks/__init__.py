@@ -0,0 +1 @@
+"""Performance benchmarks for the text processing application."""
@@ -0,0 +1,66 @@
+"""
+Benchmark for transcript generation on large synthetic documents.
+
+Usage:
+    python -m benchmarks.bench_transcript --paragraphs 100000
+"""
+import argparse
+import random
+import time
+
+from src.models.document import Document, Paragraph, StructuralTag, ArgumentRole
+from src.synthesizers.basic_synthesis import generate_transcript
+
+
+def build_document(paragraph_count: int, seed: int = 0) -> Document:
+    """
+    Build a processed document with random tags, roles and keyword text.
+
+    Args:
+        paragraph_count: Number of paragraphs to generate
+        seed: Random seed for reproducible documents
+
+    Returns:
+        Document: The synthetic document
+    """
+    rng = random.Random(seed)
+    words = ["digital", "literacy", "skills", "economy", "students", "example",
+             "introduction", "conclusion", "evidence", "research", "policy"]
+    tags = list(StructuralTag)
+    roles = list(ArgumentRole)
+
+    paragraphs = [
+        Paragraph(
+            id=f"p-{i + 1}",
+            text=" ".join(rng.choices(words, k=rng.randint(3, 120))),
+            structural_tag=rng.choice(tags),
+            argument_role=rng.choice(roles),
+            gist=f"Gist of paragraph {i + 1}."
+        )
+        for i in range(paragraph_count)
+    ]
+    return Document(metadata={"title": "Benchmark Document"}, paragraphs=paragraphs)
+
+
+def main():
+    """Run the transcript benchmark and print timings."""
+    parser = argparse.ArgumentParser(description="Benchmark transcript generation")
+    parser.add_argument("--paragraphs", type=int, default=100000, help="Number of paragraphs")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    args = parser.parse_args()
+
+    document = build_document(args.paragraphs)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        generate_transcript(document)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"generate_transcript: {args.paragraphs} paragraphs, "
+          f"best {best * 1000:.1f} ms ({args.paragraphs / best:,.0f} paragraphs/s)")
+
+
+if __name__ == "__main__":
+    main()
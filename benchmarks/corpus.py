@@ -0,0 +1,113 @@
+"""
+Synthetic corpus generator for the benchmarks.
+
+Generates reproducible documents of any size from a fixed vocabulary, with
+a configurable share of sentences containing the abbreviations and
+ellipses that make sentence splitting expensive, and optionally annotates
+them the way AI processing would so synthesis and rendering can be
+benchmarked without any API calls.
+"""
+import random
+from dataclasses import dataclass
+from typing import List
+
+from src.extractors.text_extractor import TextExtractor
+from src.models.document import ArgumentRole, Document, GistSentence, StructuralTag
+from src.utils.text_utils import split_into_sentences
+
+WORDS = ["digital", "literacy", "skills", "economy", "students", "teachers", "access",
+         "research", "policy", "schools", "networks", "devices", "communities", "training",
+         "evidence", "programs", "income", "workers", "libraries", "broadband", "online",
+         "services", "health", "citizens", "systems", "learning", "growth", "divide"]
+
+# Abbreviations that do not end a sentence
+ABBREVIATIONS = ["Dr.", "Prof.", "e.g.", "i.e.", "etc.", "U.S.A.", "approx.", "vs.", "St."]
+
+TAGS = [StructuralTag.THESIS, StructuralTag.POINT, StructuralTag.EXAMPLE, StructuralTag.CONCLUSION]
+ROLES = [ArgumentRole.SUPPORTING, ArgumentRole.COUNTERPOINT, ArgumentRole.ELABORATION]
+
+
+@dataclass
+class CorpusSpec:
+    """Shape of a synthetic document."""
+    paragraphs: int = 100
+    sentences_per_paragraph: int = 5
+    words_per_sentence: int = 18
+    abbreviation_density: float = 0.2
+    ellipsis_density: float = 0.05
+    seed: int = 0
+
+
+def _sentence(rng: random.Random, spec: CorpusSpec) -> str:
+    """Generate one sentence, possibly with an abbreviation or an ellipsis."""
+    count = max(3, int(rng.gauss(spec.words_per_sentence, spec.words_per_sentence / 3)))
+    words = rng.choices(WORDS, k=count)
+    if rng.random() < spec.abbreviation_density:
+        words.insert(rng.randrange(1, count), rng.choice(ABBREVIATIONS))
+    if rng.random() < spec.ellipsis_density:
+        position = rng.randrange(1, count)
+        words[position] = words[position] + "..."
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice(".....?!")
+
+
+def generate_text(spec: CorpusSpec) -> str:
+    """
+    Generate the raw text of a synthetic document.
+
+    Args:
+        spec: Shape of the document
+
+    Returns:
+        str: A title line followed by blank-line separated paragraphs
+    """
+    rng = random.Random(spec.seed)
+    paragraphs = ["Synthetic Benchmark Document"]
+    for _ in range(spec.paragraphs):
+        count = max(1, int(rng.gauss(spec.sentences_per_paragraph, spec.sentences_per_paragraph / 3)))
+        paragraphs.append(" ".join(_sentence(rng, spec) for _ in range(count)))
+    return "\n\n".join(paragraphs) + "\n"
+
+
+def annotate(document: Document, seed: int = 0) -> Document:
+    """
+    Fill in the fields AI processing would set, without any API calls.
+
+    Tags and roles are drawn at random; the gist of each paragraph is its
+    first sentence.
+
+    Args:
+        document: An extracted document
+        seed: Random seed for reproducible annotations
+
+    Returns:
+        Document: The same document, annotated in place
+    """
+    rng = random.Random(seed)
+    for i, paragraph in enumerate(document.paragraphs):
+        if i == 0:
+            paragraph.structural_tag = StructuralTag.THESIS
+        elif i == len(document.paragraphs) - 1:
+            paragraph.structural_tag = StructuralTag.CONCLUSION
+        else:
+            paragraph.structural_tag = rng.choice(TAGS[1:3])
+        paragraph.argument_role = rng.choice(ROLES)
+        sentences: List[str] = split_into_sentences(paragraph.text)[:1]
+        paragraph.gist = " ".join(sentences)
+        paragraph.gist_sentences = [GistSentence(text=s, image_tag="a chart") for s in sentences]
+    return document
+
+
+def generate_document(spec: CorpusSpec, processed: bool = False) -> Document:
+    """
+    Generate a synthetic document.
+
+    Args:
+        spec: Shape of the document
+        processed: Whether to annotate it as if AI processing had run
+
+    Returns:
+        Document: The extracted, and optionally annotated, document
+    """
+    document = TextExtractor.extract_from_text(generate_text(spec), {"title": "Synthetic Benchmark Document"})
+    return annotate(document, spec.seed) if processed else document
@@ -0,0 +1,95 @@
+"""
+Stand-in for the OpenAI client with simulated latency.
+
+Answers the three kinds of chat requests the application makes, paragraph
+analysis, image tags and transcript refinement, with deterministic
+plausible responses after a fixed delay, so the whole pipeline can be
+benchmarked without network access or API costs.
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from src.utils.text_utils import estimate_tokens
+
+_TAGS = ["THESIS", "POINT", "EXAMPLE", "CONCLUSION"]
+_ROLES = ["SUPPORTING", "COUNTERPOINT", "ELABORATION"]
+
+# Paragraph text in the analysis prompt
+_PARAGRAPH_PATTERN = re.compile(r'Paragraph:\s*(.*?)\s*1\. Identify', re.DOTALL)
+
+
+class _Completions:
+    """The ``chat.completions`` namespace of the fake client."""
+
+    def __init__(self, client: "FakeLLMClient"):
+        self._client = client
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs: Any) -> SimpleNamespace:
+        """Answer a chat request after the simulated latency."""
+        return self._client.respond(messages, kwargs.get("max_tokens", 1000))
+
+
+class FakeLLMClient:
+    """A drop-in replacement for ``OpenAI()`` in benchmarks and tests."""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Initialize the fake client.
+
+        Args:
+            latency: Seconds every request takes
+        """
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def respond(self, messages: List[Dict[str, str]], max_tokens: int) -> SimpleNamespace:
+        """
+        Build the response to a chat request.
+
+        Args:
+            messages: The chat messages
+            max_tokens: Maximum completion tokens requested
+
+        Returns:
+            SimpleNamespace: An object shaped like a chat completion
+        """
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        system, prompt = messages[0]["content"], messages[-1]["content"]
+        if "document analysis" in system:
+            content = self._analysis(prompt)
+        elif "visual descriptions" in system:
+            content = "A group of people using laptops in a library"
+        else:
+            # Refinement: keep the transcript's text lines up to the token limit
+            lines = [line.strip("*-✓ ") for line in prompt.splitlines()
+                     if line.strip() and not line.strip().startswith("#")]
+            content = " ".join(lines)[:max_tokens * 4]
+
+        usage = SimpleNamespace(prompt_tokens=estimate_tokens(system + prompt),
+                                completion_tokens=estimate_tokens(content))
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    @staticmethod
+    def _analysis(prompt: str) -> str:
+        """Answer a paragraph analysis request with a JSON object."""
+        match = _PARAGRAPH_PATTERN.search(prompt)
+        text = match.group(1) if match else prompt
+        digest = zlib.crc32(text.encode("utf-8"))
+        words = text.split()
+        return json.dumps({
+            "structural_tag": _TAGS[digest % len(_TAGS)],
+            "argument_role": _ROLES[(digest // len(_TAGS)) % len(_ROLES)],
+            "gist": " ".join(words[:12]).rstrip(".!?") + ".",
+        })
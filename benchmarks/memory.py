@@ -0,0 +1,227 @@
+"""
+Peak memory of the pipeline stages on large inputs.
+
+Each operation runs in a fresh interpreter so earlier work cannot hide its
+peak: once with tracemalloc to measure the peak of the Python allocations it
+makes, and once without to measure the growth of the peak resident set size.
+Peaks are reported in bytes per input byte, which stays comparable across
+input sizes.
+
+Usage:
+    python -m benchmarks.memory --size-mb 100
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import ROLES, TAGS, CorpusSpec, generate_text
+from src.extractors.text_extractor import TextExtractor
+from src.models.serialization import FORMAT_JSON, save_document
+from src.synthesizers.comparison import save_comparison
+
+# Operations measured, in pipeline order
+OPERATIONS = ("extraction", "json_export", "comparison")
+
+# Paragraphs in the block of text repeated to build inputs of any size
+_BLOCK_PARAGRAPHS = 500
+
+
+def write_input(path: str, size_bytes: int, seed: int = 0) -> int:
+    """
+    Write a synthetic text file of about the given size.
+
+    A generated block of paragraphs is repeated, which is much faster than
+    generating the whole text and makes no difference to the pipeline.
+
+    Args:
+        path: Path of the file to write
+        size_bytes: Target size in bytes
+        seed: Random seed of the generated block
+
+    Returns:
+        int: The actual size in bytes
+    """
+    block = generate_text(CorpusSpec(paragraphs=_BLOCK_PARAGRAPHS, seed=seed)).encode("utf-8")
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size_bytes:
+            f.write(block)
+            f.write(b"\n")
+            written += len(block) + 1
+    return written
+
+
+def _rss_status() -> Dict[str, int]:
+    """Read the current and peak resident set size in bytes from /proc, if available."""
+    values = {}
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak resident set size of this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _max_rss() -> int:
+    """Get the peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _prepare(operation: str, input_path: str) -> Callable[[], Any]:
+    """Set up everything an operation needs and return the operation itself."""
+    if operation == "extraction":
+        return lambda: TextExtractor.extract_from_file(input_path)
+
+    # Short gists are enough here, and much faster than sentence splitting
+    document = TextExtractor.extract_from_file(input_path)
+    for i, paragraph in enumerate(document.paragraphs):
+        paragraph.structural_tag = TAGS[i % len(TAGS)]
+        paragraph.argument_role = ROLES[i % len(ROLES)]
+        paragraph.gist = " ".join(paragraph.text.split()[:20])
+    output_dir = os.path.dirname(input_path)
+    if operation == "json_export":
+        path = os.path.join(output_dir, "processed_document.json")
+        return lambda: save_document(document, path, FORMAT_JSON)
+    if operation == "comparison":
+        synthesis = "\n\n".join(p.gist for p in document.paragraphs[:200])
+        path = os.path.join(output_dir, "comparison.html")
+        return lambda: save_comparison(document, synthesis, path)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def measure_here(operation: str, input_path: str, traced: bool) -> Dict[str, Any]:
+    """
+    Measure the peak memory of an operation in this process.
+
+    Args:
+        operation: One of ``OPERATIONS``
+        input_path: Path of the input text file
+        traced: Measure Python allocations with tracemalloc rather than
+            the resident set size
+
+    Returns:
+        Dict[str, Any]: The input size and the measured peak in bytes
+    """
+    run = _prepare(operation, input_path)
+    gc.collect()
+    result: Dict[str, Any] = {"operation": operation, "input_bytes": os.path.getsize(input_path)}
+
+    if traced:
+        tracemalloc.start()
+        value = run()
+        result["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    elif _reset_peak_rss():
+        before = _rss_status().get("VmRSS", 0)
+        value = run()
+        result["peak_rss_bytes"] = max(0, _rss_status().get("VmHWM", 0) - before)
+    else:
+        # Without a resettable peak, the peak so far is the best baseline
+        before = _max_rss()
+        value = run()
+        result["peak_rss_bytes"] = max(0, _max_rss() - before)
+    del value
+    return result
+
+
+def measure(operation: str, input_path: str) -> Dict[str, Any]:
+    """
+    Measure the peak memory of an operation in fresh interpreters.
+
+    Args:
+        operation: One of ``OPERATIONS``
+        input_path: Path of the input text file
+
+    Returns:
+        Dict[str, Any]: Peak traced and resident bytes, and both per input byte
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result: Dict[str, Any] = {}
+    for flag in ("--traced", "--rss"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.memory", "--operation", operation,
+             "--input", input_path, flag],
+            cwd=root, check=True, capture_output=True, text=True
+        ).stdout
+        result.update(json.loads(output))
+
+    for key in ("peak_traced_bytes", "peak_rss_bytes"):
+        result[key.replace("_bytes", "_per_input_byte")] = round(result[key] / result["input_bytes"], 3)
+    return result
+
+
+def run_all(size_bytes: int, operations: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Measure every operation on a synthetic input of the given size.
+
+    Args:
+        size_bytes: Input size in bytes
+        operations: Operations to measure, defaults to all
+
+    Returns:
+        List[Dict[str, Any]]: One measurement per operation
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, "input.txt")
+        write_input(input_path, size_bytes)
+        return [measure(operation, input_path) for operation in operations or OPERATIONS]
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    """Format measurements as a text table."""
+    lines = [f"{'operation':<14}{'input MB':>10}{'traced MB':>11}{'per byte':>10}{'RSS MB':>10}{'per byte':>10}"]
+    for r in results:
+        lines.append(f"{r['operation']:<14}{r['input_bytes'] / 2**20:>10.1f}"
+                     f"{r['peak_traced_bytes'] / 2**20:>11.1f}{r['peak_traced_per_input_byte']:>10.2f}"
+                     f"{r['peak_rss_bytes'] / 2**20:>10.1f}{r['peak_rss_per_input_byte']:>10.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    """Measure all operations, or one operation in this process when run by ``measure``."""
+    parser = argparse.ArgumentParser(description="Measure peak memory per input byte")
+    parser.add_argument("--size-mb", type=float, default=20, help="Input size in MB")
+    parser.add_argument("--only", nargs="+", choices=OPERATIONS, help="Only measure these operations")
+    parser.add_argument("--output", help="Write the measurements to this JSON file")
+    parser.add_argument("--operation", choices=OPERATIONS, help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--traced", action="store_true", help=argparse.SUPPRESS)
+    mode.add_argument("--rss", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.operation:
+        print(json.dumps(measure_here(args.operation, args.input, args.traced)))
+        return
+
+    results = run_all(int(args.size_mb * 2**20), args.only)
+    print(format_report(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Measurements saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
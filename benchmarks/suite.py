@@ -0,0 +1,273 @@
+"""
+Benchmark suite for the text processing pipeline.
+
+Times text extraction, sentence splitting, transcript generation, comparison
+rendering, tag and word statistics over regular and compact documents, and
+end-to-end AI processing against a simulated-latency LLM on a synthetic
+corpus, writes the results as JSON and compares them with a stored baseline.
+
+Usage:
+    python -m benchmarks.suite --size medium --output results.json
+    python -m benchmarks.suite --size medium --save-baseline
+    python -m benchmarks.suite --size medium            # compare with the baseline
+"""
+import argparse
+import copy
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import CorpusSpec, annotate, generate_text
+from benchmarks.fake_llm import FakeLLMClient
+from src.extractors.text_extractor import TextExtractor
+from src.models.compact import CompactDocument
+from src.processors.text_processor import TextProcessor
+from src.synthesizers.basic_synthesis import generate_transcript
+from src.synthesizers.comparison import create_comparison_html
+from src.utils.text_utils import split_into_sentences
+
+# Stored results new runs are compared with
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Corpus shape of each suite size; end-to-end processing uses fewer
+# paragraphs since every one of them waits for the simulated LLM
+SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"paragraphs": 100, "llm_paragraphs": 10},
+    "medium": {"paragraphs": 2000, "llm_paragraphs": 40},
+    "large": {"paragraphs": 20000, "llm_paragraphs": 200},
+}
+
+
+@dataclass
+class Case:
+    """A benchmarked operation."""
+    name: str
+    unit: str
+    units: int
+    run: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+
+
+def build_cases(spec: CorpusSpec, llm_paragraphs: int, llm_latency: float) -> List[Case]:
+    """
+    Generate the corpus and define the benchmarked operations on it.
+
+    Args:
+        spec: Shape of the synthetic document
+        llm_paragraphs: Number of paragraphs processed end to end
+        llm_latency: Seconds every simulated LLM request takes
+
+    Returns:
+        List[Case]: The benchmark cases
+    """
+    text = generate_text(spec)
+    document = TextExtractor.extract_from_text(text, {"title": "Synthetic Benchmark Document"})
+    processed = annotate(copy.deepcopy(document), spec.seed)
+    synthesis = generate_transcript(processed)
+    compact = CompactDocument.from_document(processed)
+    word_count = len(text.split())
+
+    llm_text = generate_text(replace(spec, paragraphs=llm_paragraphs))
+    llm_document = TextExtractor.extract_from_text(llm_text, {"title": "Synthetic Benchmark Document"})
+
+    def document_stats(doc):
+        """Count the paragraphs per tag and the words of a regular document."""
+        counts: Dict[str, int] = {}
+        for p in doc.paragraphs:
+            counts[p.structural_tag.name] = counts.get(p.structural_tag.name, 0) + 1
+        return counts, sum(len(p.text.split()) for p in doc.paragraphs)
+
+    def process(doc):
+        processor = TextProcessor(api_key="benchmark", request_delay=0)
+        processor.client = FakeLLMClient(llm_latency)
+        return processor.process_document(doc)
+
+    return [
+        Case("extract_from_text", "words", word_count,
+             lambda _: TextExtractor.extract_from_text(text)),
+        Case("split_into_sentences", "words", word_count,
+             lambda _: [split_into_sentences(p.text) for p in document.paragraphs]),
+        Case("generate_transcript", "paragraphs", len(processed.paragraphs),
+             lambda _: generate_transcript(processed)),
+        Case("create_comparison_html", "paragraphs", len(processed.paragraphs),
+             lambda _: create_comparison_html(processed, synthesis)),
+        Case("document_stats", "paragraphs", len(processed.paragraphs),
+             lambda _: document_stats(processed)),
+        Case("compact_stats", "paragraphs", len(processed.paragraphs),
+             lambda _: (compact.tag_counts(), compact.total_words())),
+        Case("compact_from_document", "paragraphs", len(processed.paragraphs),
+             lambda _: CompactDocument.from_document(processed)),
+        Case("process_document", "paragraphs", len(llm_document.paragraphs),
+             process, lambda: copy.deepcopy(llm_document)),
+    ]
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """
+    Time a case, with garbage collection paused as ``timeit`` does.
+
+    Args:
+        case: The case to time
+        repeat: Number of timed runs
+
+    Returns:
+        Dict[str, Any]: Run times in seconds and throughput at the median
+    """
+    timings = []
+    for _ in range(repeat):
+        argument = case.setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            case.run(argument)
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    median = statistics.median(timings)
+    return {
+        "unit": case.unit,
+        "units": case.units,
+        "runs": len(timings),
+        "min_s": round(min(timings), 6),
+        "median_s": round(median, 6),
+        "mean_s": round(statistics.mean(timings), 6),
+        "throughput": round(case.units / median, 1) if median else None,
+    }
+
+
+def run_suite(size: str = "small", repeat: int = 5, llm_latency: float = 0.01,
+              only: Optional[List[str]] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        size: One of ``SIZES``
+        repeat: Number of timed runs per case
+        llm_latency: Seconds every simulated LLM request takes
+        only: Names of the cases to run, defaults to all
+        seed: Random seed of the corpus
+
+    Returns:
+        Dict[str, Any]: Run settings and environment under ``meta``, and
+        the measurements of each case under ``results``
+    """
+    shape = SIZES[size]
+    spec = CorpusSpec(paragraphs=shape["paragraphs"], seed=seed)
+    results = {}
+    for case in build_cases(spec, shape["llm_paragraphs"], llm_latency):
+        if only and case.name not in only:
+            continue
+        results[case.name] = measure(case, repeat)
+
+    return {
+        "meta": {
+            "size": size,
+            "repeat": repeat,
+            "llm_latency": llm_latency,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare median run times with a baseline.
+
+    Args:
+        current: Results of ``run_suite``
+        baseline: Stored results of an earlier run
+        tolerance: Relative slowdown of the median tolerated before a case
+            counts as a regression
+
+    Returns:
+        List[Dict[str, Any]]: One row per case present in both results,
+        with the relative ``change`` of the median and a ``regression`` flag
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["median_s"]:
+            continue
+        change = result["median_s"] / base["median_s"] - 1
+        rows.append({
+            "name": name,
+            "baseline_s": base["median_s"],
+            "current_s": result["median_s"],
+            "change": round(change, 3),
+            "regression": change > tolerance,
+        })
+    return rows
+
+
+def format_results(results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Format the results, and their comparison with a baseline if any, as a text table."""
+    changes = {row["name"]: row for row in comparison or []}
+    lines = [f"{'case':<24}{'median ms':>11}{'min ms':>10}{'throughput':>24}{'vs baseline':>13}"]
+    for name, result in results["results"].items():
+        row = changes.get(name)
+        change = ""
+        if row:
+            change = f"{row['change']:+.1%}" + (" !" if row["regression"] else "")
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        lines.append(f"{name:<24}{result['median_s'] * 1000:>11.2f}{result['min_s'] * 1000:>10.2f}"
+                     f"{throughput:>24}{change:>13}")
+    return "\n".join(lines)
+
+
+def main():
+    """Run the suite, save the results and report regressions against the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the text processing pipeline")
+    parser.add_argument("--size", choices=list(SIZES), default="small", help="Corpus size")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per case")
+    parser.add_argument("--llm-latency", type=float, default=0.01,
+                        help="Seconds every simulated LLM request takes")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="Only run these cases")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.size, args.repeat, args.llm_latency, args.only)
+
+    # Compare with a baseline of the same size
+    comparison = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["size"] == args.size:
+            comparison = compare(results, baseline, args.tolerance)
+            results["comparison"] = comparison
+        else:
+            print(f"Baseline is for size {baseline['meta']['size']}, not compared", file=sys.stderr)
+
+    print(format_results(results, comparison))
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {path}")
+
+    regressions = [row["name"] for row in comparison or [] if row["regression"]]
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,17 +6,43 @@ import sys
 import json
 import os
 import datetime
+import functools
 import pathlib
+import subprocess
 from dotenv import load_dotenv
 
 from src.extractors.text_extractor import TextExtractor
+from src.jobs.paragraph_jobs import apply_results, enqueue_document
+from src.jobs.work_queue import DONE, FAILED, LEASED, QUEUED, WorkQueue
+from src.models.serialization import (
+    FORMAT_BINARY, FORMAT_JSON, FORMAT_NDJSON, NDJSONWriter, SerializationError, load_document,
+    save_document, sniff_format, to_output_dict
+)
+from src.processors.deadline import Deadline, degraded_fields, set_degraded_fields
+from src.processors.routing import MODES as ROUTING_MODES, ModelRouter
+from src.processors.sharding import ShardedProcessor
 from src.processors.text_processor import TextProcessor
+from src.reporting.dashboard import save_dashboard
+from src.reporting.run_index import update_index, write_run_info
+from src.retrieval.inverted_index import focus_document, load_or_build_index
+from src.storage.artifact_store import ArtifactStore
+from src.synthesizers.alignment import align_summary
 from src.synthesizers.basic_synthesis import generate_transcript, refine_transcript
-from src.synthesizers.comparison import save_comparison
+from src.synthesizers.budget import pack_transcript
+from src.synthesizers.comparison import save_comparison, save_lazy_comparison
+from src.synthesizers.extractive import extractive_summary
+from src.synthesizers.redundancy import prune_redundant_gists
+from src.utils.file_utils import OUTPUT_ROOT, atomic_write
+from src.utils.metrics import REGISTRY, route_latencies, serve_metrics
+from src.utils.profiling import MODES, StageProfiler
+from src.utils.tracing import STAGE, begin_span, end_span, start_tracing
 
 # Load environment variables
 load_dotenv()
 
+# Share of a --deadline kept for refining the synthesis after processing
+DEADLINE_REFINE_SHARE = 0.25
+
 
 def create_output_directory(input_file_path, project_name=None):
     """
@@ -29,10 +55,8 @@ def create_output_directory(input_file_path, project_name=None):
     Returns:
         str: Path to the output directory
     """
-    # Get base output directory
-    base_output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
-    
     # Create base output directory if it doesn't exist
+    base_output_dir = OUTPUT_ROOT
     os.makedirs(base_output_dir, exist_ok=True)
     
     # Determine project name
@@ -50,6 +74,76 @@ def create_output_directory(input_file_path, project_name=None):
     return output_dir
 
 
+def in_output_directory(path, output_dir):
+    """
+    Place a bare file name in the run's output directory.
+    
+    Args:
+        path: File path given on the command line
+        output_dir: The --auto-output directory, if any
+        
+    Returns:
+        str: The path to write to
+    """
+    if output_dir and not os.path.dirname(path):
+        return os.path.join(output_dir, path)
+    return path
+
+
+def process_with_queue(document, queue_path, local_workers=0, routing="fixed"):
+    """
+    Analyze the paragraphs of a document through a shared work queue.
+    
+    Args:
+        document: The extracted document
+        queue_path: Path to the SQLite queue database
+        local_workers: Number of worker processes to start on this host
+        routing: Model routing mode of the local workers
+        
+    Returns:
+        Document: The document with the analysis results applied
+    """
+    # Workers run in the repository directory, so give them an absolute path
+    queue_path = os.path.abspath(queue_path)
+    queue = WorkQueue(queue_path)
+    batch = enqueue_document(queue, document)
+    print(f"Enqueued batch {batch} in {queue_path}; start workers with:")
+    print(f"  python -m src.jobs.paragraph_jobs {queue_path}")
+    
+    # Optionally start workers here as well
+    workers = [
+        subprocess.Popen([sys.executable, "-m", "src.jobs.paragraph_jobs", queue_path, "--routing", routing],
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(local_workers)
+    ]
+    # Stop waiting if every local worker exited, since nobody may be left
+    active = (lambda: any(worker.poll() is None for worker in workers)) if workers else None
+    try:
+        counts = queue.wait(batch, on_progress=lambda counts: print(
+            f"  {counts[DONE]} done, {counts[FAILED]} failed, "
+            f"{counts[LEASED]} in progress, {counts[QUEUED]} queued"
+        ), active=active)
+        if counts[QUEUED] or counts[LEASED]:
+            print("Warning: all local workers exited before the batch finished", file=sys.stderr)
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.wait()
+    
+    failed = apply_results(queue, batch, document)
+    if failed:
+        print(f"Warning: {failed} paragraph jobs failed", file=sys.stderr)
+    return document
+
+
+def update_dashboard():
+    """Reindex the runs in the output directory and rewrite the dashboard."""
+    os.makedirs(OUTPUT_ROOT, exist_ok=True)
+    index, read = update_index(OUTPUT_ROOT)
+    path = save_dashboard(index, OUTPUT_ROOT)
+    print(f"Indexed {len(index)} runs ({read} updated); dashboard saved to {path}")
+
+
 def main():
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(
@@ -57,7 +151,8 @@ def main():
     )
     parser.add_argument(
         "file_path", 
-        help="Path to the text file to process"
+        nargs="?",
+        help="Path to the text file to process, or a saved processed document"
     )
     parser.add_argument(
         "--output", 
@@ -66,9 +161,10 @@ def main():
     )
     parser.add_argument(
         "--format",
-        choices=["json", "summary"],
+        choices=["json", "binary", "ndjson", "summary"],
         default="summary",
-        help="Output format (default: summary)"
+        help="Output format (default: summary); binary writes the compact binary document format, "
+             "ndjson streams one line per paragraph as soon as it is processed"
     )
     parser.add_argument(
         "--process",
@@ -80,6 +176,48 @@ def main():
         action="store_true",
         help="Generate a synthesized summary from the processed document"
     )
+    parser.add_argument(
+        "--from-processed",
+        metavar="PROCESSED_FILE",
+        help="Rebuild the document from a saved processed document (JSON or binary) "
+             "and only run synthesis and/or HTML rendering, without AI processing",
+        default=None
+    )
+    parser.add_argument(
+        "--extractive",
+        action="store_true",
+        help="Synthesize with the offline extractive summarizer instead of the AI pipeline; "
+             "also used automatically when the document has not been processed"
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Collapse near-duplicate gists in the transcript before AI refinement"
+    )
+    parser.add_argument(
+        "--prompt-budget",
+        type=int,
+        default=None,
+        help="Maximum transcript size in tokens sent for AI refinement; the least important "
+             "gists are compressed or dropped to fit, and the cuts are recorded in the output"
+    )
+    parser.add_argument(
+        "--no-refine",
+        action="store_true",
+        help="Skip the AI refinement step and use the programmatic transcript as the summary"
+    )
+    parser.add_argument(
+        "--query",
+        help="Summarize only what the document says about this query, using the "
+             "top-ranked paragraphs of a search index saved next to the processed document",
+        default=None
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=5,
+        help="Number of paragraphs to select for --query (default: 5)"
+    )
     parser.add_argument(
         "--summary-file",
         help="Path to save the synthesized summary",
@@ -90,6 +228,12 @@ def main():
         help="Path to save HTML comparison between original and summary",
         default=None
     )
+    parser.add_argument(
+        "--lazy-comparison",
+        action="store_true",
+        help="Write the comparison page with the original sections and JSON data in a "
+             "sidecar directory that the page loads on demand, for long documents"
+    )
     parser.add_argument(
         "--project",
         help="Project name for output directory",
@@ -105,76 +249,332 @@ def main():
         action="store_true",
         help="Open the comparison HTML in the default browser after processing"
     )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        help="Write a Chrome/Perfetto trace of all pipeline stages and API calls to this file, "
+             "plus a per-stage timing summary next to it; a bare file name is placed in the "
+             "output directory with --auto-output",
+        default=None
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="QUEUE_DB",
+        help="With --process, enqueue the paragraph analysis in this SQLite work queue and wait "
+             "for workers (python -m src.jobs.paragraph_jobs QUEUE_DB) on any host sharing it",
+        default=None
+    )
+    parser.add_argument(
+        "--queue-workers",
+        type=int,
+        metavar="N",
+        help="Start N queue workers on this host as well",
+        default=0
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Finish the run within this time: analyze likely thesis and conclusion paragraphs "
+             "first, defer image tags, and fall back to local heuristics for the rest; the "
+             "degraded fields are listed in the output metadata, and processing the saved "
+             "document again with --process completes them",
+        default=None
+    )
+    parser.add_argument(
+        "--routing",
+        choices=ROUTING_MODES,
+        default="fixed",
+        help="Model routing (default: fixed): fixed uses the standard model for every call; "
+             "adaptive picks a fast, standard or large model per call from paragraph length, "
+             "position and a local pre-classification, escalating unparseable responses"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        metavar="N",
+        help="With --process, split the document into contiguous shards analyzed by N worker "
+             "processes",
+        default=0
+    )
+    parser.add_argument(
+        "--profile",
+        choices=MODES,
+        help="Profile each pipeline stage (cpu: cProfile stats and sampled call stacks; "
+             "memory: top tracemalloc allocation sites) and save the reports in the output "
+             "directory, or the current directory without --auto-output",
+        default=None
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="METRICS_FILE",
+        help="Write LLM call metrics in the Prometheus text format to this file after the run; "
+             "a bare file name is placed in the output directory with --auto-output",
+        default=None
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve LLM call metrics at http://127.0.0.1:PORT/metrics while the run is in progress",
+        default=None
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="With --auto-output, keep plain copies of the input and output files instead of "
+             "linking them to the content-addressed store in output/.store"
+    )
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="Index all runs in the output directory and write output/dashboard.html; "
+             "can be used without a file path"
+    )
     
     args = parser.parse_args()
     
+    # The time budget covers the whole run
+    deadline = Deadline(args.deadline) if args.deadline else None
+    if deadline and (args.queue or args.processes > 1):
+        parser.error("--deadline cannot be combined with --queue or --processes")
+    if args.query and not args.synthesize:
+        parser.error("--query requires --synthesize")
+    
+    input_path = args.from_processed or args.file_path
+    if not input_path:
+        if args.dashboard:
+            update_dashboard()
+            return
+        parser.error("a file path or --from-processed is required")
+    
+    # Spans are always recorded; the stage totals go into run_info.json
+    tracer = start_tracing()
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(args.profile)
+        tracer.listeners.append(profiler)
+    run_span = begin_span("run", STAGE)
+    
+    # Let a Prometheus server scrape the LLM call metrics during long runs
+    metrics_server = None
+    if args.metrics_port is not None:
+        metrics_server = serve_metrics(args.metrics_port)
+        print(f"Serving metrics at http://127.0.0.1:{metrics_server.server_port}/metrics")
+    
+    ndjson_file = None
     try:
+        # Load a saved processed document, or extract text from the file
+        stage = begin_span("extraction", STAGE)
+        saved = None
+        if args.from_processed or sniff_format(input_path):
+            saved = load_document(input_path)
+            document = saved.document
+            print(f"Loaded processed document from {input_path}")
+        else:
+            document = TextExtractor.extract_from_file(input_path)
+        end_span(stage)
+        
         # Create output directory if auto-output is enabled
         output_dir = None
         output_paths = {}
         
         if args.auto_output:
-            output_dir = create_output_directory(args.file_path, args.project)
+            # Name runs from a saved document after its original source file
+            source_name = input_path
+            if saved and document.metadata.get('filename'):
+                source_name = document.metadata['filename']
+            output_dir = create_output_directory(source_name, args.project)
             print(f"Created output directory: {output_dir}")
             
             # Set automatic output paths
             output_paths = {
                 "json": os.path.join(output_dir, "processed_document.json"),
+                "binary": os.path.join(output_dir, "processed_document.samd"),
+                "ndjson": os.path.join(output_dir, "processed_document.ndjson"),
                 "summary": os.path.join(output_dir, "summary.txt"),
                 "comparison": os.path.join(output_dir, "comparison.html")
             }
             
-            # Create a copy of the input file in the output directory
-            input_filename = os.path.basename(args.file_path)
-            pathlib.Path(os.path.join(output_dir, input_filename)).write_bytes(
-                pathlib.Path(args.file_path).read_bytes()
-            )
-            print(f"Copied input file to output directory")
+            # Create a copy of the input file in the output directory, unless
+            # it goes into the artifact store with the other outputs
+            if not saved and args.no_store:
+                input_filename = os.path.basename(input_path)
+                pathlib.Path(os.path.join(output_dir, input_filename)).write_bytes(
+                    pathlib.Path(input_path).read_bytes()
+                )
+                print(f"Copied input file to output directory")
         
-        # Extract text from the file
-        document = TextExtractor.extract_from_file(args.file_path)
+        # The queue and the process pool reanalyze every paragraph, so no
+        # field of a document resumed with them stays degraded
+        if args.process and (args.queue or args.processes > 1) and degraded_fields(document):
+            print(f"Reprocessing all paragraphs; discarding deferred work on "
+                  f"{len(degraded_fields(document))} paragraphs")
+            set_degraded_fields(document, {})
+        
+        # Start the NDJSON stream before processing so paragraphs are written as they finish
+        ndjson_path = None
+        ndjson_writer = None
+        if args.format == FORMAT_NDJSON:
+            ndjson_path = args.output or output_paths.get("ndjson")
+            if not ndjson_path:
+                print("Error: --format ndjson requires --output or --auto-output", file=sys.stderr)
+                sys.exit(1)
+            # The file may link to a stored blob, so replace it rather than writing into it
+            if os.path.lexists(ndjson_path):
+                os.remove(ndjson_path)
+            ndjson_file = open(ndjson_path, 'w', encoding='utf-8')
+            ndjson_writer = NDJSONWriter(ndjson_file)
+            ndjson_writer.write_header(document.metadata)
         
         # Process with AI if requested
         processor = None
+        processing_failed = False
         if args.process:
+            stage = begin_span("processing", STAGE)
             try:
                 print("Processing document with AI... (this may take a while)")
-                processor = TextProcessor()
-                document = processor.process_document(document)
+                processor = TextProcessor(router=ModelRouter(args.routing))
+                on_paragraph = None
+                if ndjson_writer:
+                    on_paragraph = lambda i, p: ndjson_writer.write_paragraph(p)
+                if args.queue:
+                    document = process_with_queue(document, args.queue, args.queue_workers, args.routing)
+                elif args.processes > 1:
+                    sharded = ShardedProcessor(
+                        args.processes, functools.partial(TextProcessor, router=processor.router)
+                    )
+                    document = sharded.process_document(document, on_paragraph=on_paragraph)
+                    for key, value in sharded.token_usage.items():
+                        processor.token_usage[key] = processor.token_usage.get(key, 0) + value
+                else:
+                    # Keep part of the time budget for refining the synthesis
+                    processing_deadline = deadline
+                    if deadline and args.synthesize and not args.no_refine:
+                        processing_deadline = deadline.reserve(args.deadline * DEADLINE_REFINE_SHARE)
+                    if degraded_fields(document):
+                        print(f"Completing deferred work on {len(degraded_fields(document))} paragraphs")
+                    document = processor.process_document(document, on_paragraph=on_paragraph,
+                                                          deadline=processing_deadline)
+                
+                # Report what did not fit the deadline
+                degraded = degraded_fields(document)
+                if degraded:
+                    analyzed_locally = sum(1 for fields in degraded.values() if "gist" in fields)
+                    print(f"Degraded output: {analyzed_locally} paragraphs analyzed locally, image tags "
+                          f"deferred for {len(degraded)}; process the saved document again to complete them")
                 print("AI processing complete")
             except Exception as e:
                 print(f"Error during AI processing: {str(e)}", file=sys.stderr)
+                processing_failed = True
                 if not args.output:  # Only exit if not saving output
                     sys.exit(1)
+            end_span(stage)
+        
+        # Stream any paragraphs that were not written during processing
+        if ndjson_writer:
+            for p in document.paragraphs[ndjson_writer.paragraphs_written:]:
+                ndjson_writer.write_paragraph(p)
                     
+        # Reuse the saved synthesis unless a new one is requested
+        synthesis_result = saved.synthesis if saved and not args.process else None
+        synthesis_extras = dict(saved.extras) if saved and not args.process else {}
+        
         # Generate synthesis if requested
-        synthesis_result = None
-        if args.synthesize and args.process:  # Only synthesize if we've processed
+        if args.synthesize:
+            stage = begin_span("synthesis", STAGE)
             try:
                 print("Generating synthesis...")
+                synthesis_extras.pop("alignment", None)
+                synthesis_extras.pop("synthesis_degraded", None)
+                
+                # Select the paragraphs relevant to the query, if one was given
+                synthesis_document = document
+                if args.query:
+                    processed_path = input_path if saved else (args.output or output_paths.get(args.format))
+                    index = load_or_build_index(document, processed_path)
+                    synthesis_document = focus_document(document, index, args.query, args.top_k)
+                    if synthesis_document.paragraphs:
+                        print(f"Selected {len(synthesis_document.paragraphs)} paragraphs for query: {args.query}")
+                    else:
+                        print(f"No paragraphs match the query: {args.query}")
                 
-                # First generate the programmatic transcript
-                transcript = generate_transcript(document)
+                # Without usable AI analysis, fall back to offline extraction
+                use_extractive = args.extractive or processing_failed or not (args.process or saved)
                 
-                # Then refine it with AI if we have a processor available
-                if processor:
-                    synthesis_result = refine_transcript(transcript, processor.client)
+                if args.query and not synthesis_document.paragraphs:
+                    # Nothing to summarize, so make no synthesis or refinement call
+                    print("Skipping synthesis")
+                    synthesis_result = None
+                elif use_extractive:
+                    print("Using offline extractive summarization")
+                    synthesis_result = extractive_summary(synthesis_document)
                 else:
-                    synthesis_result = transcript
+                    # First generate the programmatic transcript, fitted to the prompt budget if set
+                    synthesis_extras.pop("synthesis_budget", None)
+                    if args.prompt_budget:
+                        packed = pack_transcript(synthesis_document, args.prompt_budget)
+                        transcript = packed.transcript
+                        synthesis_extras["synthesis_budget"] = packed.to_dict()
+                        print(f"Packed transcript into {packed.transcript_tokens} tokens "
+                              f"({len(packed.cuts)} gists compressed or dropped)")
+                    else:
+                        transcript = generate_transcript(synthesis_document)
                     
-                print("Synthesis complete")
-                
-                # Determine summary output path
-                summary_path = args.summary_file
-                if not summary_path and args.auto_output:
-                    summary_path = output_paths["summary"]
-                
-                # Save summary if path is specified
-                if summary_path:
-                    with open(summary_path, 'w', encoding='utf-8') as f:
-                        f.write(synthesis_result)
-                    print(f"Summary saved to {summary_path}")
-                
+                    # Collapse repeated points so refinement gets a shorter prompt
+                    if args.dedupe:
+                        pruned = prune_redundant_gists(transcript)
+                        transcript = pruned.transcript
+                        print(f"Pruned {pruned.lines_removed} redundant gists "
+                              f"(~{pruned.tokens_saved} tokens saved)")
+                    
+                    # Saved documents have no processor yet, so create one for refinement
+                    if not processor and saved and not args.no_refine:
+                        try:
+                            processor = TextProcessor(router=ModelRouter(args.routing))
+                        except ValueError as e:
+                            print(f"Skipping refinement: {str(e)}", file=sys.stderr)
+                    
+                    # Then refine it with AI if we have a processor and time available
+                    if deadline and deadline.expired() and processor and not args.no_refine:
+                        print("Deadline reached: skipping refinement")
+                        synthesis_extras["synthesis_degraded"] = "unrefined"
+                        synthesis_result = transcript
+                    elif processor and not args.no_refine:
+                        synthesis_result = refine_transcript(transcript, processor.client, focus=args.query,
+                                                             router=processor.router)
+                    else:
+                        synthesis_result = transcript
+                    
+                if synthesis_result is not None:
+                    print("Synthesis complete")
+                    
+                    # Determine summary output path
+                    summary_path = args.summary_file
+                    if not summary_path and args.auto_output:
+                        summary_path = output_paths["summary"]
+                    
+                    # Save summary if path is specified
+                    if summary_path:
+                        with atomic_write(summary_path) as f:
+                            f.write(synthesis_result)
+                        print(f"Summary saved to {summary_path}")
+                    
+            except Exception as e:
+                print(f"Error during synthesis: {str(e)}", file=sys.stderr)
+            end_span(stage)
+        
+        # Map each summary sentence to the source paragraphs supporting it
+        if synthesis_result and "alignment" not in synthesis_extras:
+            alignment = align_summary(document, synthesis_result)
+            synthesis_extras["alignment"] = [a.to_dict() for a in alignment]
+            supported = sum(1 for a in alignment if a.paragraph_ids)
+            print(f"Aligned {supported} of {len(alignment)} summary sentences with source paragraphs")
+        
+        # Render the HTML comparison whenever a synthesis is available
+        if synthesis_result:
+            stage = begin_span("rendering", STAGE)
+            try:
                 # Determine comparison output path
                 comparison_path = args.comparison
                 if not comparison_path and args.auto_output:
@@ -182,7 +582,11 @@ def main():
                 
                 # Generate HTML comparison if requested or auto-output
                 if comparison_path:
-                    save_comparison(document, synthesis_result, comparison_path)
+                    alignment = synthesis_extras.get("alignment")
+                    if args.lazy_comparison:
+                        save_lazy_comparison(document, synthesis_result, comparison_path, alignment)
+                    else:
+                        save_comparison(document, synthesis_result, comparison_path, alignment)
                     print(f"Comparison saved to {comparison_path}")
                     
                     # Open browser if requested
@@ -191,7 +595,8 @@ def main():
                         webbrowser.open(f"file://{os.path.abspath(comparison_path)}")
                     
             except Exception as e:
-                print(f"Error during synthesis: {str(e)}", file=sys.stderr)
+                print(f"Error during comparison rendering: {str(e)}", file=sys.stderr)
+            end_span(stage)
         
         # Display information about the document
         if args.format == "summary":
@@ -201,7 +606,7 @@ def main():
             print(f"Total characters: {sum(len(p.text) for p in document.paragraphs)}")
             
             # If document was processed, show some stats
-            if args.process:
+            if args.process or saved:
                 # Count paragraphs by structural tag
                 tag_counts = {}
                 for p in document.paragraphs:
@@ -232,46 +637,68 @@ def main():
                 print("\n\n--- Synthesized Summary ---\n")
                 print(synthesis_result)
             
-        elif args.format == "json":
-            # Convert document to JSON
-            doc_dict = {
-                "metadata": document.metadata,
-                "paragraphs": [
-                    {
-                        "id": p.id,
-                        "text": p.text,
-                        "structural_tag": p.structural_tag.name,
-                        "argument_role": p.argument_role.name,
-                        "gist": p.gist,
-                        # Add word count as additional metadata
-                        "word_count": len(p.text.split()),
-                        # Add gist sentences with image tags
-                        "gist_sentences": [
-                            {
-                                "text": s.text,
-                                "image_tag": s.image_tag
-                            } for s in p.gist_sentences
-                        ]
-                    } for p in document.paragraphs
-                ]
-            }
-            
-            # Add synthesis to JSON if available
-            if synthesis_result:
-                doc_dict["synthesis"] = synthesis_result
-            
-            # Determine JSON output path
+        elif args.format in (FORMAT_JSON, FORMAT_BINARY):
+            # Determine output path
             json_path = args.output
             if not json_path and args.auto_output:
-                json_path = output_paths["json"]
+                json_path = output_paths[args.format]
             
             # Save to file or print to stdout
             if json_path:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(doc_dict, f, indent=2)
+                save_document(document, json_path, args.format,
+                              synthesis=synthesis_result, extras=synthesis_extras)
                 print(f"Document structure saved to {json_path}")
+            elif args.format == FORMAT_BINARY:
+                print("Error: --format binary requires --output or --auto-output", file=sys.stderr)
+                sys.exit(1)
             else:
-                print(json.dumps(doc_dict, indent=2))
+                print(json.dumps(to_output_dict(document, synthesis_result, synthesis_extras), indent=2))
+                
+        elif args.format == FORMAT_NDJSON:
+            # Finish the stream with the synthesis line
+            ndjson_writer.write_footer(synthesis_result, synthesis_extras)
+            ndjson_writer.stream.close()
+            print(f"Document structure saved to {ndjson_path}")
+        
+        end_span(run_span)
+        
+        # Save the profiles of all stages with the other outputs
+        if profiler:
+            profile_paths = profiler.save(output_dir or os.getcwd())
+            print(f"Profiles saved to {', '.join(profile_paths)}")
+        
+        # Save the trace, next to the other outputs unless a directory is given
+        if args.trace:
+            trace_path = in_output_directory(args.trace, output_dir)
+            summary_path = tracer.save(trace_path)
+            print(f"\n{tracer.format_summary()}")
+            print(f"Trace saved to {trace_path} (summary: {summary_path})")
+        
+        # Save the LLM call metrics for a textfile collector
+        if args.metrics:
+            metrics_path = in_output_directory(args.metrics, output_dir)
+            REGISTRY.write(metrics_path)
+            print(f"Metrics saved to {metrics_path}")
+        
+        # Record timings and token usage for the runs dashboard
+        if output_dir:
+            timings = tracer.stage_timings()
+            timings["total"] = timings.pop("run")
+            write_run_info(output_dir, {
+                "input": input_path,
+                "options": {key: value for key, value in vars(args).items() if value not in (None, False)},
+                "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+                "token_usage": processor.token_usage if processor else {},
+                "routes": route_latencies(),
+            })
+        
+        # Keep identical inputs and outputs of all runs only once
+        if output_dir and not args.no_store:
+            manifest = ArtifactStore(OUTPUT_ROOT).store_run(output_dir, None if saved else input_path)
+            print(f"Stored {len(manifest['files'])} run files in the artifact store")
+        
+        if args.dashboard:
+            update_dashboard()
                 
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -279,6 +706,18 @@ def main():
     except IOError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    except SerializationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        # Close the NDJSON stream if the run ended before its footer
+        if ndjson_file:
+            ndjson_file.close()
+        if profiler:
+            profiler.stop()
+        if metrics_server:
+            metrics_server.shutdown()
+            metrics_server.server_close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Durable job queue for processing across processes and hosts."""
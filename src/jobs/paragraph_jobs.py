@@ -0,0 +1,215 @@
+"""
+Paragraph analysis as jobs on a shared work queue.
+
+The coordinator enqueues one job per paragraph of a document that needs
+analysis, each carrying everything the analysis prompt uses, and waits for
+the batch. Workers on any number of processes and hosts claim the jobs,
+analyze the paragraphs with their own ``TextProcessor`` and store only the
+analysis fields. The coordinator then applies the results to its document
+in paragraph order.
+
+Run a worker with:
+    python -m src.jobs.paragraph_jobs path/to/queue.db
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.jobs.work_queue import DONE, Job, WorkQueue
+from src.models.document import ArgumentRole, Document, Paragraph, StructuralTag
+from src.processors.routing import MODES as ROUTING_MODES, ModelRouter
+from src.processors.text_processor import TextProcessor
+from src.utils.text_utils import get_position_context
+
+
+def enqueue_document(queue: WorkQueue, document: Document) -> str:
+    """
+    Enqueue the analysis of every paragraph of a document that needs it.
+
+    Args:
+        queue: The work queue
+        document: The extracted document
+
+    Returns:
+        str: The batch id
+    """
+    title = document.metadata.get('title', '')
+    total = len(document.paragraphs)
+    jobs = [
+        (i, {
+            "id": paragraph.id,
+            "text": paragraph.text,
+            "position_context": get_position_context(i, total),
+            "title": title,
+        })
+        for i, paragraph in enumerate(document.paragraphs)
+        if TextProcessor.needs_analysis(paragraph)
+    ]
+    return queue.create_batch(jobs, {"title": title, "paragraphs": total})
+
+
+def apply_results(queue: WorkQueue, batch: str, document: Document) -> int:
+    """
+    Apply the analysis results of a finished batch to the document.
+
+    Paragraphs whose job failed are marked the way a failed API call
+    leaves them, with the error as their gist.
+
+    Args:
+        queue: The work queue
+        batch: The batch id returned by ``enqueue_document``
+        document: The document the batch was created from
+
+    Returns:
+        int: Number of paragraphs whose job failed
+    """
+    failed = 0
+    for job in queue.results(batch):
+        paragraph = document.paragraphs[job.seq]
+        if job.status == DONE and job.result is not None:
+            paragraph.apply_analysis(job.result)
+        else:
+            failed += 1
+            paragraph.structural_tag = StructuralTag.UNKNOWN
+            paragraph.argument_role = ArgumentRole.UNKNOWN
+            paragraph.gist = f"Error: {job.error or 'job did not finish'}"
+            paragraph.gist_sentences = []
+    return failed
+
+
+def process_job(processor: TextProcessor, job: Job) -> Dict[str, Any]:
+    """
+    Analyze the paragraph of a job.
+
+    Args:
+        processor: The processor making the API calls
+        job: The claimed job
+
+    Returns:
+        Dict[str, Any]: The analysis fields of the paragraph
+
+    Raises:
+        RuntimeError: If the analysis failed, so the job can be retried
+    """
+    payload = job.payload
+    paragraph = Paragraph(id=payload["id"], text=payload["text"])
+    processor.analyze_paragraph(paragraph, payload["position_context"], payload["title"])
+    # The processor reports API errors in the gist instead of raising
+    if paragraph.structural_tag == StructuralTag.UNKNOWN and paragraph.gist.startswith("Error:"):
+        raise RuntimeError(paragraph.gist[len("Error:"):].strip())
+    return paragraph.analysis_dict()
+
+
+class Heartbeat:
+    """Renews the lease of a job from a background thread while it is processed."""
+
+    def __init__(self, queue: WorkQueue, job: Job, worker: str, interval: float):
+        """
+        Initialize the heartbeat.
+
+        Args:
+            queue: The work queue
+            job: The claimed job
+            worker: Identifier of the worker holding the lease
+            interval: Seconds between renewals
+        """
+        self.queue = queue
+        self.job = job
+        self.worker = worker
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job.id}", daemon=True)
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Renew the lease until stopped or the lease is lost."""
+        while not self._stop.wait(self.interval):
+            if not self.queue.heartbeat(self.job, self.worker):
+                self.lost = True
+                return
+
+
+def default_worker_id() -> str:
+    """Build a worker identifier that is unique across hosts."""
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def run_worker(queue: WorkQueue,
+               processor: TextProcessor,
+               worker: Optional[str] = None,
+               idle_timeout: Optional[float] = None,
+               poll_interval: float = 1.0,
+               stop: Optional[threading.Event] = None) -> int:
+    """
+    Claim and process paragraph jobs until stopped.
+
+    Args:
+        queue: The work queue
+        processor: The processor making the API calls
+        worker: Identifier of this worker, defaults to host, process and thread
+        idle_timeout: Stop after this many seconds without any queued job,
+            or never if None
+        poll_interval: Seconds to wait before checking an empty queue again
+        stop: Optional event that stops the worker after its current job
+
+    Returns:
+        int: Number of jobs completed
+    """
+    worker = worker or default_worker_id()
+    completed = 0
+    idle_since = time.monotonic()
+    while not (stop and stop.is_set()):
+        job = queue.claim(worker)
+        if job is None:
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        # Renew the lease well before it expires while the API calls run
+        with Heartbeat(queue, job, worker, queue.lease_seconds / 3):
+            try:
+                result = process_job(processor, job)
+            except Exception as e:
+                queue.fail(job, worker, str(e))
+                result = None
+        if result is not None and queue.complete(job, worker, result):
+            completed += 1
+        idle_since = time.monotonic()
+
+        # Pace the API calls as process_document does
+        if processor.request_delay:
+            time.sleep(processor.request_delay)
+    return completed
+
+
+def main():
+    """Run a paragraph worker against a queue database."""
+    parser = argparse.ArgumentParser(description="Process paragraph analysis jobs from a work queue")
+    parser.add_argument("queue", help="Path to the SQLite queue database")
+    parser.add_argument("--worker-id", help="Identifier of this worker, unique across hosts")
+    parser.add_argument("--lease", type=float, default=120.0, help="Lease duration in seconds")
+    parser.add_argument("--routing", choices=ROUTING_MODES, default="fixed", help="Model routing mode")
+    parser.add_argument("--exit-when-idle", type=float, metavar="SECONDS", default=None,
+                        help="Exit after this many seconds without queued jobs")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue, lease_seconds=args.lease)
+    processor = TextProcessor(router=ModelRouter(args.routing))
+    completed = run_worker(queue, processor, args.worker_id, args.exit_when_idle)
+    print(f"Worker finished after {completed} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Durable work queue with leased jobs, stored in SQLite.
+
+Jobs belong to a batch and carry a sequence number, so results can be put
+back in order once the whole batch is finished. A worker claims a job with a
+time-limited lease and renews the lease with heartbeats while it works;
+jobs whose lease expires, because their worker died or lost its connection,
+are put back in the queue the next time any worker claims a job or the
+coordinator checks on the batch. A job that keeps failing or expiring is
+marked failed after ``max_attempts`` claims.
+
+Every operation runs in its own short ``BEGIN IMMEDIATE`` transaction on a
+fresh connection, so any number of threads and processes can share a queue.
+Workers on several hosts can share it when the database lives on a file
+system with working POSIX locks; the default rollback journal is used
+because the WAL journal only works within a single host.
+"""
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Job states
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, LEASED, DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    metadata TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch TEXT NOT NULL REFERENCES batches(id),
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (batch, seq)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_expires);
+"""
+
+
+@dataclass
+class Job:
+    """A job claimed by a worker."""
+    id: int
+    batch: str
+    seq: int
+    payload: Dict[str, Any]
+    attempts: int
+    lease_expires: float
+
+
+@dataclass
+class JobResult:
+    """The outcome of a job of a batch."""
+    seq: int
+    status: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+
+class WorkQueue:
+    """A job queue in a SQLite database shared by a coordinator and its workers."""
+
+    def __init__(self, path: str, lease_seconds: float = 120.0, max_attempts: int = 3,
+                 clock: Callable[[], float] = time.time):
+        """
+        Open the queue, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database
+            lease_seconds: How long a claimed job stays leased without a heartbeat
+            max_attempts: Claims of a job before it is marked failed
+            clock: Source of the current time, as seconds since the epoch
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        with self._read() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction on a new connection."""
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Run queries or a script on a new connection in autocommit mode."""
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def create_batch(self, jobs: Iterable[Tuple[int, Dict[str, Any]]],
+                     metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Enqueue a batch of jobs.
+
+        Args:
+            jobs: Sequence numbers and JSON-serializable payloads
+            metadata: Optional JSON-serializable description of the batch
+
+        Returns:
+            str: The batch id
+        """
+        batch = uuid.uuid4().hex
+        now = self.clock()
+        with self._transaction() as db:
+            db.execute("INSERT INTO batches (id, metadata, created) VALUES (?, ?, ?)",
+                       (batch, json.dumps(metadata or {}), now))
+            db.executemany(
+                "INSERT INTO jobs (batch, seq, payload, status, updated) VALUES (?, ?, ?, ?, ?)",
+                ((batch, seq, json.dumps(payload), QUEUED, now) for seq, payload in jobs)
+            )
+        return batch
+
+    def _requeue_expired(self, db: sqlite3.Connection, now: float) -> int:
+        """Put jobs with expired leases back in the queue, or fail them if out of attempts."""
+        failed = db.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ?, updated = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, "Lease expired", now, LEASED, now, self.max_attempts)
+        ).rowcount
+        requeued = db.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, updated = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (QUEUED, now, LEASED, now)
+        ).rowcount
+        return failed + requeued
+
+    def requeue_expired(self) -> int:
+        """
+        Put jobs whose lease has expired back in the queue.
+
+        Returns:
+            int: Number of expired jobs requeued or, when out of attempts, failed
+        """
+        with self._transaction() as db:
+            return self._requeue_expired(db, self.clock())
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Lease the oldest queued job.
+
+        Args:
+            worker: Identifier of the claiming worker, unique across hosts
+
+        Returns:
+            Optional[Job]: The leased job, or None if the queue is empty
+        """
+        now = self.clock()
+        expires = now + self.lease_seconds
+        with self._transaction() as db:
+            self._requeue_expired(db, now)
+            row = db.execute(
+                "SELECT id, batch, seq, payload, attempts FROM jobs WHERE status = ? ORDER BY id LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, batch, seq, payload, attempts = row
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = ?, updated = ? "
+                "WHERE id = ?",
+                (LEASED, worker, expires, attempts + 1, now, job_id)
+            )
+        return Job(job_id, batch, seq, json.loads(payload), attempts + 1, expires)
+
+    def heartbeat(self, job: Job, worker: str) -> bool:
+        """
+        Renew the lease of a job.
+
+        Args:
+            job: The claimed job
+            worker: Identifier of the worker holding the lease
+
+        Returns:
+            bool: False if the worker no longer holds the lease
+        """
+        now = self.clock()
+        with self._transaction() as db:
+            renewed = db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND status = ? AND worker = ?",
+                (now + self.lease_seconds, now, job.id, LEASED, worker)
+            ).rowcount
+        if renewed:
+            job.lease_expires = now + self.lease_seconds
+        return bool(renewed)
+
+    def complete(self, job: Job, worker: str, result: Dict[str, Any]) -> bool:
+        """
+        Store the result of a job.
+
+        Args:
+            job: The claimed job
+            worker: Identifier of the worker holding the lease
+            result: JSON-serializable result
+
+        Returns:
+            bool: False if the lease was lost and the result was discarded
+        """
+        with self._transaction() as db:
+            return bool(db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, worker = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, json.dumps(result), self.clock(), job.id, LEASED, worker)
+            ).rowcount)
+
+    def fail(self, job: Job, worker: str, error: str) -> bool:
+        """
+        Give up a job after an error; it is retried unless out of attempts.
+
+        Args:
+            job: The claimed job
+            worker: Identifier of the worker holding the lease
+            error: Description of the error
+
+        Returns:
+            bool: False if the lease was already lost
+        """
+        status = FAILED if job.attempts >= self.max_attempts else QUEUED
+        with self._transaction() as db:
+            return bool(db.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_expires = NULL, "
+                "updated = ? WHERE id = ? AND status = ? AND worker = ?",
+                (status, error, self.clock(), job.id, LEASED, worker)
+            ).rowcount)
+
+    def counts(self, batch: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count the jobs in each state.
+
+        Args:
+            batch: Only count the jobs of this batch
+
+        Returns:
+            Dict[str, int]: Number of jobs per state
+        """
+        query = "SELECT status, COUNT(*) FROM jobs"
+        params: Tuple[Any, ...] = ()
+        if batch:
+            query += " WHERE batch = ?"
+            params = (batch,)
+        with self._read() as db:
+            counts = dict(db.execute(query + " GROUP BY status", params).fetchall())
+        return {state: counts.get(state, 0) for state in STATES}
+
+    def batch_metadata(self, batch: str) -> Dict[str, Any]:
+        """Get the metadata a batch was created with."""
+        with self._read() as db:
+            row = db.execute("SELECT metadata FROM batches WHERE id = ?", (batch,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown batch: {batch}")
+        return json.loads(row[0])
+
+    def results(self, batch: str) -> List[JobResult]:
+        """
+        Get the outcome of every job of a batch.
+
+        Args:
+            batch: The batch id
+
+        Returns:
+            List[JobResult]: One entry per job, in sequence order
+        """
+        with self._read() as db:
+            rows = db.execute(
+                "SELECT seq, status, result, error FROM jobs WHERE batch = ? ORDER BY seq", (batch,)
+            ).fetchall()
+        return [JobResult(seq, status, json.loads(result) if result else None, error)
+                for seq, status, result, error in rows]
+
+    def wait(self, batch: str, poll_interval: float = 1.0, timeout: Optional[float] = None,
+             on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+             active: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Wait until every job of a batch is done or failed.
+
+        Expired leases are requeued while waiting, so a batch finishes even
+        if all of its workers die, as soon as new workers join.
+
+        Args:
+            batch: The batch id
+            poll_interval: Seconds between checks
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            on_progress: Optional callback invoked with the job counts
+                whenever they change
+            active: Optional check of whether the batch is still being
+                worked on; waiting stops early once it returns False
+
+        Returns:
+            Dict[str, int]: The final job counts, with jobs left queued or
+            leased if waiting stopped early
+
+        Raises:
+            TimeoutError: If the batch is not finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last = None
+        while True:
+            self.requeue_expired()
+            counts = self.counts(batch)
+            if on_progress and counts != last:
+                on_progress(counts)
+            last = counts
+            if not counts[QUEUED] and not counts[LEASED]:
+                return counts
+            if active is not None and not active():
+                return counts
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch} not finished: {counts}")
+            time.sleep(poll_interval)
@@ -0,0 +1,299 @@
+"""
+Compact columnar representation of documents for large corpora.
+
+A ``CompactDocument`` stores the same information as a ``Document`` but
+without one Python object per paragraph and gist sentence. Tags and roles
+live in small-int arrays, all strings live in a handful of string arenas
+addressed by offsets, and gist sentences are kept in flat parallel arrays.
+Read-only ``ParagraphView`` objects expose the familiar ``Paragraph``
+attributes so existing synthesis and comparison code can consume a
+compact document unchanged. Views are not zero-copy: every attribute
+access slices a new string out of its arena.
+
+The pipeline itself still works on ``Document``; a compact document is
+meant for holding many processed documents at once. It takes about a
+third less memory per paragraph, most of the rest being the text itself,
+and passes that only need tags and word counts, such as ``tag_counts``
+and ``total_words``, run on the arrays without touching any string. The
+``document_stats`` and ``compact_stats`` cases of ``benchmarks.suite``
+compare such a pass over both representations.
+"""
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.models.document import (
+    Document, Paragraph, GistSentence, StructuralTag, ArgumentRole
+)
+
+# Enum members indexed by their position in the small-int arrays
+_STRUCTURAL_TAGS = list(StructuralTag)
+_ARGUMENT_ROLES = list(ArgumentRole)
+_STRUCTURAL_TAG_CODES = {tag: i for i, tag in enumerate(_STRUCTURAL_TAGS)}
+_ARGUMENT_ROLE_CODES = {role: i for i, role in enumerate(_ARGUMENT_ROLES)}
+
+
+def _offset_array(values: List[int]) -> array:
+    """
+    Create the smallest unsigned array able to hold the given offsets.
+
+    Args:
+        values: Monotonically increasing offsets
+
+    Returns:
+        array: A 4-byte array when possible, otherwise an 8-byte array
+    """
+    typecode = 'I' if not values or values[-1] < 2 ** 32 else 'Q'
+    return array(typecode, values)
+
+
+class StringArena:
+    """Stores many strings in one buffer, addressed by their index."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, strings: Iterable[str]):
+        """
+        Build the arena from a sequence of strings.
+
+        Args:
+            strings: The strings to store, in order
+        """
+        parts = []
+        offsets = [0]
+        for s in strings:
+            parts.append(s)
+            offsets.append(offsets[-1] + len(s))
+
+        self.data = "".join(parts)
+        self.offsets = _offset_array(offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the arena buffers in bytes."""
+        return len(self.data.encode('utf-8')) + self.offsets.itemsize * len(self.offsets)
+
+
+class ParagraphView:
+    """
+    Read-only view of one paragraph inside a ``CompactDocument``.
+
+    The view exposes the same attributes as ``Paragraph`` and materializes
+    each value from the underlying arrays only when it is accessed.
+    """
+
+    __slots__ = ("_doc", "_index")
+
+    def __init__(self, doc: "CompactDocument", index: int):
+        self._doc = doc
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._doc._ids[self._index]
+
+    @property
+    def text(self) -> str:
+        return self._doc._texts[self._index]
+
+    @property
+    def structural_tag(self) -> StructuralTag:
+        return _STRUCTURAL_TAGS[self._doc._tags[self._index]]
+
+    @property
+    def argument_role(self) -> ArgumentRole:
+        return _ARGUMENT_ROLES[self._doc._roles[self._index]]
+
+    @property
+    def gist(self) -> str:
+        return self._doc._gists[self._index]
+
+    @property
+    def gist_sentences(self) -> List[GistSentence]:
+        doc = self._doc
+        start = doc._sentence_starts[self._index]
+        end = doc._sentence_starts[self._index + 1]
+        return [
+            GistSentence(text=doc._sentence_texts[i], image_tag=doc._image_tags[i])
+            for i in range(start, end)
+        ]
+
+    @property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words, precomputed at build time."""
+        return self._doc._word_counts[self._index]
+
+    def to_paragraph(self) -> Paragraph:
+        """Materialize this view as a regular ``Paragraph``."""
+        return Paragraph(
+            id=self.id,
+            text=self.text,
+            structural_tag=self.structural_tag,
+            argument_role=self.argument_role,
+            gist=self.gist,
+            gist_sentences=self.gist_sentences
+        )
+
+    # Views serialize exactly like regular paragraphs
+    to_dict = Paragraph.to_dict
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ParagraphView):
+            return self._doc is other._doc and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._doc), self._index))
+
+    def __repr__(self) -> str:
+        return f"ParagraphView(id={self.id!r}, structural_tag={self.structural_tag.name})"
+
+
+class ParagraphSequence:
+    """Sequence of ``ParagraphView`` objects over a ``CompactDocument``."""
+
+    __slots__ = ("_doc",)
+
+    def __init__(self, doc: "CompactDocument"):
+        self._doc = doc
+
+    def __len__(self) -> int:
+        return len(self._doc._tags)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ParagraphView, List[ParagraphView]]:
+        if isinstance(index, slice):
+            return [ParagraphView(self._doc, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("paragraph index out of range")
+        return ParagraphView(self._doc, index)
+
+    def __iter__(self) -> Iterator[ParagraphView]:
+        doc = self._doc
+        for i in range(len(self)):
+            yield ParagraphView(doc, i)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class CompactDocument:
+    """
+    Columnar, memory-efficient version of ``Document``.
+
+    Instances are immutable snapshots; build one with ``from_document`` and
+    convert back with ``to_document`` when paragraphs need to be modified.
+    """
+
+    __slots__ = (
+        "metadata", "_ids", "_texts", "_gists", "_tags", "_roles",
+        "_word_counts", "_sentence_starts", "_sentence_texts", "_image_tags"
+    )
+
+    def __init__(self, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Create an empty compact document.
+
+        Args:
+            metadata: Optional metadata for the document
+        """
+        self.metadata = metadata if metadata is not None else {}
+        self._ids = StringArena([])
+        self._texts = StringArena([])
+        self._gists = StringArena([])
+        self._tags = array('B')
+        self._roles = array('B')
+        self._word_counts = array('I')
+        self._sentence_starts = _offset_array([0])
+        self._sentence_texts = StringArena([])
+        self._image_tags = StringArena([])
+
+    @classmethod
+    def from_document(cls, document: Document) -> "CompactDocument":
+        """
+        Build a compact document from a regular ``Document``.
+
+        Args:
+            document: The document to convert
+
+        Returns:
+            CompactDocument: The columnar representation of the document
+        """
+        compact = cls(metadata=document.metadata)
+        paragraphs = document.paragraphs
+
+        compact._ids = StringArena(p.id for p in paragraphs)
+        compact._texts = StringArena(p.text for p in paragraphs)
+        compact._gists = StringArena(p.gist for p in paragraphs)
+        compact._tags = array('B', (_STRUCTURAL_TAG_CODES[p.structural_tag] for p in paragraphs))
+        compact._roles = array('B', (_ARGUMENT_ROLE_CODES[p.argument_role] for p in paragraphs))
+        compact._word_counts = array('I', (len(p.text.split()) for p in paragraphs))
+
+        # Flatten gist sentences into parallel arenas with per-paragraph starts
+        sentence_starts = [0]
+        sentence_texts = []
+        image_tags = []
+        for p in paragraphs:
+            for s in p.gist_sentences:
+                sentence_texts.append(s.text)
+                image_tags.append(s.image_tag)
+            sentence_starts.append(len(sentence_texts))
+
+        compact._sentence_starts = _offset_array(sentence_starts)
+        compact._sentence_texts = StringArena(sentence_texts)
+        compact._image_tags = StringArena(image_tags)
+
+        return compact
+
+    def to_document(self) -> Document:
+        """
+        Materialize a regular ``Document`` with one ``Paragraph`` per entry.
+
+        Returns:
+            Document: An independent, mutable copy of this document
+        """
+        return Document(
+            metadata=dict(self.metadata),
+            paragraphs=[view.to_paragraph() for view in self.paragraphs]
+        )
+
+    # Serializes through the paragraph views like a regular document
+    to_dict = Document.to_dict
+
+    @property
+    def paragraphs(self) -> ParagraphSequence:
+        """Paragraph views in document order."""
+        return ParagraphSequence(self)
+
+    def tag_counts(self) -> Dict[str, int]:
+        """
+        Count paragraphs per structural tag without materializing views.
+
+        Returns:
+            Dict[str, int]: Mapping of tag name to paragraph count
+        """
+        counts = [0] * len(_STRUCTURAL_TAGS)
+        for code in self._tags:
+            counts[code] += 1
+        return {tag.name: count for tag, count in zip(_STRUCTURAL_TAGS, counts) if count}
+
+    def total_words(self) -> int:
+        """Total number of words across all paragraphs."""
+        return sum(self._word_counts)
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory used by the columnar buffers in bytes.
+
+        Returns:
+            int: Combined size of all arenas and arrays
+        """
+        arrays = (self._tags, self._roles, self._word_counts, self._sentence_starts)
+        arenas = (self._ids, self._texts, self._gists, self._sentence_texts, self._image_tags)
+        return (sum(a.itemsize * len(a) for a in arrays) +
+                sum(arena.nbytes() for arena in arenas))
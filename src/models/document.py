@@ -36,6 +36,15 @@ class GistSentence:
     text: str
     image_tag: str = ""
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the gist sentence to a JSON-serializable dictionary."""
+        return {"text": self.text, "image_tag": self.image_tag}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GistSentence":
+        """Create a gist sentence from a dictionary produced by ``to_dict``."""
+        return cls(text=data.get("text", ""), image_tag=data.get("image_tag", ""))
+
 
 @dataclass
 class Paragraph:
@@ -47,9 +56,103 @@ class Paragraph:
     gist: str = ""
     gist_sentences: List[GistSentence] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the paragraph to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: Paragraph fields with enum names and a word count
+        """
+        return {
+            "id": self.id,
+            "text": self.text,
+            "structural_tag": self.structural_tag.name,
+            "argument_role": self.argument_role.name,
+            "gist": self.gist,
+            # Add word count as additional metadata
+            "word_count": len(self.text.split()),
+            "gist_sentences": [s.to_dict() for s in self.gist_sentences]
+        }
+
+    def analysis_dict(self) -> Dict[str, Any]:
+        """
+        Get the fields set by AI analysis, without the paragraph text.
+
+        Returns:
+            Dict[str, Any]: Structural tag, argument role, gist and gist sentences
+        """
+        return {
+            "structural_tag": self.structural_tag.name,
+            "argument_role": self.argument_role.name,
+            "gist": self.gist,
+            "gist_sentences": [s.to_dict() for s in self.gist_sentences]
+        }
+
+    def apply_analysis(self, data: Dict[str, Any]) -> None:
+        """
+        Set the fields of AI analysis from a dictionary produced by ``analysis_dict``.
+
+        Args:
+            data: Dictionary with the analysis fields
+        """
+        self.structural_tag = StructuralTag[data.get("structural_tag", "UNKNOWN")]
+        self.argument_role = ArgumentRole[data.get("argument_role", "UNKNOWN")]
+        self.gist = data.get("gist", "")
+        self.gist_sentences = [GistSentence.from_dict(s) for s in data.get("gist_sentences", [])]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Paragraph":
+        """
+        Create a paragraph from a dictionary produced by ``to_dict``.
+
+        Args:
+            data: Dictionary with paragraph fields
+
+        Returns:
+            Paragraph: The reconstructed paragraph
+        """
+        return cls(
+            id=data["id"],
+            text=data.get("text", ""),
+            structural_tag=StructuralTag[data.get("structural_tag", "UNKNOWN")],
+            argument_role=ArgumentRole[data.get("argument_role", "UNKNOWN")],
+            gist=data.get("gist", ""),
+            gist_sentences=[GistSentence.from_dict(s) for s in data.get("gist_sentences", [])]
+        )
+
 
 @dataclass
 class Document:
     """Represents a document with its paragraphs and metadata."""
     metadata: Dict[str, Any] = field(default_factory=dict)
-    paragraphs: List[Paragraph] = field(default_factory=list)
\ No newline at end of file
+    paragraphs: List[Paragraph] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the document to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: Dictionary with "metadata" and "paragraphs" keys
+        """
+        return {
+            "metadata": self.metadata,
+            "paragraphs": [p.to_dict() for p in self.paragraphs]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Document":
+        """
+        Create a document from a dictionary produced by ``to_dict``.
+
+        Extra top-level keys such as "synthesis" are ignored.
+
+        Args:
+            data: Dictionary with "metadata" and "paragraphs" keys
+
+        Returns:
+            Document: The reconstructed document
+        """
+        return cls(
+            metadata=dict(data.get("metadata", {})),
+            paragraphs=[Paragraph.from_dict(p) for p in data.get("paragraphs", [])]
+        )
@@ -0,0 +1,511 @@
+"""
+Serialization of processed documents to JSON and a compact binary format.
+
+Processed documents are saved as an envelope holding the document itself,
+the optional synthesis and any extra top-level fields. Three formats are
+supported:
+
+- ``json``: indented JSON, identical in layout to what ``main.py`` has
+  always written to ``processed_document.json``
+- ``binary``: a length-prefixed struct encoding with a versioned header,
+  which is about a fifth smaller than JSON
+- ``ndjson``: one metadata line, one line per paragraph and a final
+  synthesis line, written incrementally by ``NDJSONWriter``
+"""
+import io
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from src.models.document import (
+    Document, Paragraph, GistSentence, StructuralTag, ArgumentRole
+)
+from src.utils.file_utils import atomic_write
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+FORMAT_NDJSON = "ndjson"
+FORMATS = (FORMAT_JSON, FORMAT_BINARY, FORMAT_NDJSON)
+
+# Record types of the lines in an NDJSON stream
+NDJSON_METADATA = "metadata"
+NDJSON_PARAGRAPH = "paragraph"
+NDJSON_SYNTHESIS = "synthesis"
+
+BINARY_MAGIC = b"SAMD"
+BINARY_VERSION = 1
+
+# Header: magic, format version, flags, paragraph count
+_HEADER = struct.Struct("<4sHHI")
+_LENGTH = struct.Struct("<I")
+# Per paragraph: structural tag, argument role, gist sentence count
+_PARAGRAPH = struct.Struct("<BBI")
+
+_FLAG_HAS_SYNTHESIS = 0x1
+
+# Enum members are encoded by their position, which is fixed per version
+_STRUCTURAL_TAGS = list(StructuralTag)
+_ARGUMENT_ROLES = list(ArgumentRole)
+_STRUCTURAL_TAG_CODES = {tag: i for i, tag in enumerate(_STRUCTURAL_TAGS)}
+_ARGUMENT_ROLE_CODES = {role: i for i, role in enumerate(_ARGUMENT_ROLES)}
+
+
+class SerializationError(ValueError):
+    """Raised when serialized document data cannot be decoded."""
+
+
+@dataclass
+class ProcessedDocument:
+    """A document loaded back from disk together with its saved outputs."""
+    document: Document
+    synthesis: Optional[str] = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+def to_output_dict(document: Document,
+                   synthesis: Optional[str] = None,
+                   extras: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the dictionary written to ``processed_document.json``.
+
+    Args:
+        document: The document to serialize
+        synthesis: Optional synthesized summary to include
+        extras: Optional additional top-level fields
+
+    Returns:
+        Dict[str, Any]: The serializable output dictionary
+    """
+    doc_dict = document.to_dict()
+
+    # Add synthesis to the output if available
+    if synthesis:
+        doc_dict["synthesis"] = synthesis
+
+    if extras:
+        doc_dict.update(extras)
+
+    return doc_dict
+
+
+def _indent(text: str, spaces: int) -> str:
+    """Indent all lines but the first of a JSON fragment."""
+    return text.replace("\n", "\n" + " " * spaces)
+
+
+def iter_output_json(document: Document,
+                     synthesis: Optional[str] = None,
+                     extras: Optional[Dict[str, Any]] = None,
+                     include_empty_synthesis: bool = False) -> Iterator[str]:
+    """
+    Encode the output dictionary as indented JSON, one paragraph at a time.
+
+    The concatenated chunks are identical to ``json.dumps`` of
+    ``to_output_dict`` with ``indent=2``, but the full dictionary and the
+    full JSON string are never held in memory.
+
+    Args:
+        document: The document to serialize
+        synthesis: Optional synthesized summary to include
+        extras: Optional additional top-level fields
+        include_empty_synthesis: Whether to write the "synthesis" key even
+            when the synthesis is empty
+
+    Returns:
+        Iterator[str]: Consecutive chunks of the JSON text
+    """
+    yield '{\n  "metadata": ' + _indent(json.dumps(document.metadata, indent=2), 2)
+
+    yield ',\n  "paragraphs": '
+    if not document.paragraphs:
+        yield '[]'
+    else:
+        separator = '[\n    '
+        for p in document.paragraphs:
+            yield separator + _indent(json.dumps(p.to_dict(), indent=2), 4)
+            separator = ',\n    '
+        yield '\n  ]'
+
+    trailing: Dict[str, Any] = {}
+    if synthesis or include_empty_synthesis:
+        trailing["synthesis"] = synthesis
+    if extras:
+        trailing.update(extras)
+    for key, value in trailing.items():
+        yield ',\n  ' + json.dumps(key) + ': ' + _indent(json.dumps(value, indent=2), 2)
+
+    yield '\n}'
+
+
+def from_output_dict(data: Dict[str, Any]) -> ProcessedDocument:
+    """
+    Rebuild a processed document from an output dictionary.
+
+    Args:
+        data: Dictionary as produced by ``to_output_dict``
+
+    Returns:
+        ProcessedDocument: The document, synthesis and extra fields
+
+    Raises:
+        SerializationError: If a paragraph is missing a field or has an
+            unknown structural tag or argument role
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("paragraphs"), list):
+        raise SerializationError("Data does not look like a processed document")
+
+    extras = {k: v for k, v in data.items() if k not in ("metadata", "paragraphs", "synthesis")}
+    try:
+        document = Document.from_dict(data)
+    except (KeyError, TypeError, ValueError) as e:
+        raise SerializationError(f"Invalid processed document: {type(e).__name__}: {str(e)}")
+    return ProcessedDocument(
+        document=document,
+        synthesis=data.get("synthesis"),
+        extras=extras
+    )
+
+
+def _pack_string(out: bytearray, value: str) -> None:
+    """Append a length-prefixed UTF-8 string to the buffer."""
+    encoded = value.encode('utf-8')
+    out += _LENGTH.pack(len(encoded))
+    out += encoded
+
+
+def _encode_binary(document: Document,
+                   synthesis: Optional[str],
+                   extras: Optional[Dict[str, Any]]) -> bytes:
+    """
+    Encode a document in the binary format.
+
+    Args:
+        document: The document to encode
+        synthesis: Optional synthesized summary
+        extras: Optional additional top-level fields
+
+    Returns:
+        bytes: The encoded document
+    """
+    flags = _FLAG_HAS_SYNTHESIS if synthesis else 0
+    out = bytearray(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(document.paragraphs)))
+
+    # Free-form fields are stored as embedded JSON
+    _pack_string(out, json.dumps(document.metadata))
+    _pack_string(out, json.dumps(extras or {}))
+    if synthesis:
+        _pack_string(out, synthesis)
+
+    for p in document.paragraphs:
+        out += _PARAGRAPH.pack(
+            _STRUCTURAL_TAG_CODES[p.structural_tag],
+            _ARGUMENT_ROLE_CODES[p.argument_role],
+            len(p.gist_sentences)
+        )
+        _pack_string(out, p.id)
+        _pack_string(out, p.text)
+        _pack_string(out, p.gist)
+        for s in p.gist_sentences:
+            _pack_string(out, s.text)
+            _pack_string(out, s.image_tag)
+
+    return bytes(out)
+
+
+def _decode_binary(data: bytes) -> ProcessedDocument:
+    """
+    Decode a document from the binary format.
+
+    Args:
+        data: The encoded document
+
+    Returns:
+        ProcessedDocument: The decoded document, synthesis and extra fields
+
+    Raises:
+        SerializationError: If the data is truncated, corrupt or has an
+            unknown version
+    """
+    view = memoryview(data)
+    try:
+        magic, version, flags, count = _HEADER.unpack_from(view, 0)
+    except struct.error:
+        raise SerializationError("Binary document header is truncated")
+
+    if magic != BINARY_MAGIC:
+        raise SerializationError("Not a binary processed document")
+    if version != BINARY_VERSION:
+        raise SerializationError(f"Unsupported binary document version: {version}")
+
+    offset = _HEADER.size
+    unpack_length = _LENGTH.unpack_from
+    unpack_paragraph = _PARAGRAPH.unpack_from
+    length_size = _LENGTH.size
+
+    def read_string() -> str:
+        nonlocal offset
+        (length,) = unpack_length(view, offset)
+        offset += length_size
+        if offset + length > len(view):
+            raise SerializationError("Binary document is truncated")
+        value = str(view[offset:offset + length], 'utf-8')
+        offset += length
+        return value
+
+    try:
+        metadata = json.loads(read_string())
+        extras = json.loads(read_string())
+        synthesis = read_string() if flags & _FLAG_HAS_SYNTHESIS else None
+
+        paragraphs: List[Paragraph] = []
+        for _ in range(count):
+            tag_code, role_code, sentence_count = unpack_paragraph(view, offset)
+            offset += _PARAGRAPH.size
+            p_id = read_string()
+            text = read_string()
+            gist = read_string()
+            gist_sentences = [
+                GistSentence(text=read_string(), image_tag=read_string())
+                for _ in range(sentence_count)
+            ]
+            paragraphs.append(Paragraph(
+                id=p_id,
+                text=text,
+                structural_tag=_STRUCTURAL_TAGS[tag_code],
+                argument_role=_ARGUMENT_ROLES[role_code],
+                gist=gist,
+                gist_sentences=gist_sentences
+            ))
+    except SerializationError:
+        raise
+    except (struct.error, IndexError, KeyError, TypeError, ValueError) as e:
+        # Includes undecodable text and invalid embedded JSON
+        raise SerializationError(f"Corrupt binary document: {str(e)}")
+
+    return ProcessedDocument(
+        document=Document(metadata=metadata, paragraphs=paragraphs),
+        synthesis=synthesis,
+        extras=extras
+    )
+
+
+class NDJSONWriter:
+    """
+    Writes a processed document as newline-delimited JSON, one record at a time.
+
+    Every line is flushed as soon as it is written, so consumers can read
+    paragraphs while the rest of the document is still being processed.
+    """
+
+    def __init__(self, stream: TextIO):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Text stream to write the records to
+        """
+        self.stream = stream
+        self.paragraphs_written = 0
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def write_header(self, metadata: Dict[str, Any]) -> None:
+        """Write the metadata line that starts the stream."""
+        self._write({"type": NDJSON_METADATA, "metadata": metadata})
+
+    def write_paragraph(self, paragraph: Paragraph) -> None:
+        """Write one paragraph line."""
+        record = {"type": NDJSON_PARAGRAPH}
+        record.update(paragraph.to_dict())
+        self._write(record)
+        self.paragraphs_written += 1
+
+    def write_footer(self,
+                     synthesis: Optional[str] = None,
+                     extras: Optional[Dict[str, Any]] = None) -> None:
+        """Write the final line with the synthesis and any extra fields."""
+        record = {"type": NDJSON_SYNTHESIS, "synthesis": synthesis}
+        if extras:
+            record.update(extras)
+        self._write(record)
+
+
+def _decode_ndjson(data: bytes) -> ProcessedDocument:
+    """
+    Decode a document from an NDJSON stream.
+
+    Streams cut off before the synthesis line, for example from a run that
+    is still in progress, load with the paragraphs written so far.
+
+    Args:
+        data: The encoded document
+
+    Returns:
+        ProcessedDocument: The decoded document, synthesis and extra fields
+    """
+    document = Document()
+    synthesis = None
+    extras: Dict[str, Any] = {}
+
+    try:
+        for line in data.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop("type", None)
+            if record_type == NDJSON_METADATA:
+                document.metadata = record.get("metadata", {})
+            elif record_type == NDJSON_PARAGRAPH:
+                document.paragraphs.append(Paragraph.from_dict(record))
+            elif record_type == NDJSON_SYNTHESIS:
+                synthesis = record.pop("synthesis", None)
+                extras = record
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        # Includes undecodable text, invalid JSON and lines that are not objects
+        raise SerializationError(f"Invalid NDJSON document: {type(e).__name__}: {str(e)}")
+
+    return ProcessedDocument(document=document, synthesis=synthesis, extras=extras)
+
+
+def _is_ndjson(data: bytes) -> bool:
+    """Check whether data starts with an NDJSON metadata record."""
+    end = data.find(b"\n")
+    first_line = data[:end] if end >= 0 else data
+    try:
+        record = json.loads(first_line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return False
+    return isinstance(record, dict) and record.get("type") == NDJSON_METADATA
+
+
+def dumps(document: Document,
+          fmt: str = FORMAT_JSON,
+          synthesis: Optional[str] = None,
+          extras: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Serialize a document to bytes.
+
+    Args:
+        document: The document to serialize
+        fmt: Output format, one of ``FORMATS``
+        synthesis: Optional synthesized summary to include
+        extras: Optional additional top-level fields
+
+    Returns:
+        bytes: The serialized document
+    """
+    if fmt == FORMAT_BINARY:
+        return _encode_binary(document, synthesis, extras)
+    if fmt == FORMAT_JSON:
+        return "".join(iter_output_json(document, synthesis, extras)).encode('utf-8')
+    if fmt == FORMAT_NDJSON:
+        buffer = io.StringIO()
+        writer = NDJSONWriter(buffer)
+        writer.write_header(document.metadata)
+        for p in document.paragraphs:
+            writer.write_paragraph(p)
+        writer.write_footer(synthesis, extras)
+        return buffer.getvalue().encode('utf-8')
+    raise ValueError(f"Unknown serialization format: {fmt}")
+
+
+def loads(data: bytes) -> ProcessedDocument:
+    """
+    Deserialize a document, detecting the format from its content.
+
+    Args:
+        data: Serialized document in any supported format
+
+    Returns:
+        ProcessedDocument: The document, synthesis and extra fields
+    """
+    if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return _decode_binary(data)
+    if _is_ndjson(data):
+        return _decode_ndjson(data)
+
+    try:
+        return from_output_dict(json.loads(data))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise SerializationError(f"Invalid JSON document: {str(e)}")
+
+
+def save_document(document: Document,
+                  path: str,
+                  fmt: str = FORMAT_JSON,
+                  synthesis: Optional[str] = None,
+                  extras: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Save a document to a file.
+
+    Args:
+        document: The document to save
+        path: Destination file path
+        fmt: Output format, one of ``FORMATS``
+        synthesis: Optional synthesized summary to include
+        extras: Optional additional top-level fields
+    """
+    if fmt == FORMAT_JSON:
+        # Stream JSON paragraph by paragraph instead of building it in memory
+        with atomic_write(path) as f:
+            for chunk in iter_output_json(document, synthesis, extras):
+                f.write(chunk)
+        return
+
+    with atomic_write(path, 'wb') as f:
+        f.write(dumps(document, fmt, synthesis, extras))
+
+
+def load_document(path: str) -> ProcessedDocument:
+    """
+    Load a document previously written with ``save_document``.
+
+    Args:
+        path: Path to a JSON, binary or NDJSON processed document
+
+    Returns:
+        ProcessedDocument: The document, synthesis and extra fields
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        SerializationError: If the file is not a valid processed document
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def sniff_format(path: str) -> Optional[str]:
+    """
+    Detect whether a file is a saved processed document.
+
+    Binary documents are recognized by their header; JSON and NDJSON
+    documents must have a ``.json``, ``.ndjson`` or ``.jsonl`` extension and
+    start with an object.
+
+    Args:
+        path: Path to the file to inspect
+
+    Returns:
+        Optional[str]: The detected format, or None for other files
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(64)
+    except OSError:
+        return None
+
+    if head.startswith(BINARY_MAGIC):
+        return FORMAT_BINARY
+    if not head.lstrip().startswith(b"{"):
+        return None
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        return FORMAT_JSON
+    if extension in (".ndjson", ".jsonl"):
+        return FORMAT_NDJSON
+    return None
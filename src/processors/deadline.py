@@ -0,0 +1,134 @@
+"""
+Time budgets for processing, and the local fallbacks used when they run out.
+
+A ``Deadline`` tracks the time left of a budget. Processing under a deadline
+analyzes the paragraphs most likely to hold the thesis and conclusion
+first, leaves image tags until every paragraph has been analyzed, and
+gives the paragraphs it had no time for a local heuristic analysis: the
+structural tag and argument role of the cue-phrase pre-classification and
+the leading sentences as gist.
+
+Which fields of which paragraphs are degraded is recorded in the document
+metadata under ``degraded``, so it is saved with the document in every
+output format and the deferred work can be completed later.
+"""
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.models.document import ArgumentRole, Document, GistSentence, StructuralTag
+from src.processors.routing import preclassify
+from src.utils.text_utils import split_into_sentences
+
+# Metadata key of the degraded fields of each paragraph, by paragraph id
+DEGRADED_KEY = "degraded"
+
+# Fields of a paragraph that were degraded
+ANALYSIS_FIELDS = ("structural_tag", "argument_role", "gist")
+IMAGE_TAGS = "image_tags"
+
+# Tags whose paragraphs are analyzed first
+PRIORITY_TAGS = (StructuralTag.THESIS, StructuralTag.CONCLUSION)
+
+
+class DeadlineExpired(Exception):
+    """Raised instead of starting an API call after the deadline passed."""
+
+
+class Deadline:
+    """The time left of a budget."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Start the budget.
+
+        Args:
+            seconds: Length of the budget
+            clock: Source of monotonic time in seconds
+        """
+        self.clock = clock
+        self.end = clock() + seconds
+
+    def remaining(self) -> float:
+        """Get the seconds left, which are negative once the deadline passed."""
+        return self.end - self.clock()
+
+    def expired(self) -> bool:
+        """Check whether the deadline passed."""
+        return self.remaining() <= 0
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """
+        Get a deadline that ends earlier, leaving time for later steps.
+
+        Args:
+            seconds: Time to keep for the later steps
+
+        Returns:
+            Deadline: A deadline ending the given time before this one
+        """
+        earlier = Deadline(0, self.clock)
+        earlier.end = self.end - seconds
+        return earlier
+
+
+def priority(text: str, position_context: str) -> int:
+    """
+    Rank a paragraph for processing under a deadline.
+
+    Args:
+        text: The paragraph text
+        position_context: Position of the paragraph ("beginning", "middle", "end")
+
+    Returns:
+        int: 0 for likely thesis and conclusion paragraphs, 1 for the others
+    """
+    return 0 if preclassify(text, position_context).structural_tag in PRIORITY_TAGS else 1
+
+
+def heuristic_analysis(text: str,
+                       position_context: str) -> Tuple[StructuralTag, ArgumentRole, str, List[GistSentence]]:
+    """
+    Analyze a paragraph locally, without any API call.
+
+    Args:
+        text: The paragraph text
+        position_context: Position of the paragraph ("beginning", "middle", "end")
+
+    Returns:
+        Tuple containing the pre-classified structural tag and argument role,
+        the leading sentences as gist and its sentences without image tags
+    """
+    guess = preclassify(text, position_context)
+    # As many sentences as the analysis prompt asks for
+    max_sentences = max(1, len(text.split()) // 50)
+    sentences = split_into_sentences(text)[:max_sentences]
+    gist = " ".join(sentences)
+    return guess.structural_tag, guess.argument_role, gist, [GistSentence(text=s) for s in sentences]
+
+
+def degraded_fields(document: Document) -> Dict[str, List[str]]:
+    """
+    Get the degraded fields of each paragraph of a document.
+
+    Args:
+        document: The document
+
+    Returns:
+        Dict[str, List[str]]: Degraded field names by paragraph id, empty if
+        nothing is degraded
+    """
+    return document.metadata.get(DEGRADED_KEY) or {}
+
+
+def set_degraded_fields(document: Document, degraded: Dict[str, List[str]]) -> None:
+    """
+    Record the degraded fields of each paragraph, or remove the record if none are.
+
+    Args:
+        document: The document
+        degraded: Degraded field names by paragraph id
+    """
+    if degraded:
+        document.metadata[DEGRADED_KEY] = degraded
+    else:
+        document.metadata.pop(DEGRADED_KEY, None)
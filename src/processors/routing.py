@@ -0,0 +1,297 @@
+"""
+Model routing for the chat calls of document processing.
+
+A ``ModelRouter`` picks the model and token limit of every chat call from
+three tiers: a fast, cheap model for short paragraphs whose role is
+obvious, a standard model, and a large model for long or ambiguous
+paragraphs and long transcripts. Whether a paragraph is obvious comes from
+a local pre-classification by cue phrases and position, which costs no API
+call. A response that cannot be parsed is escalated to the next tier.
+
+Every decision is counted per call type, route and reason in the LLM
+metrics, and the latency of the calls is recorded per route, so the
+thresholds can be tuned against the latency and quality they produce.
+The models of the tiers can be set with the ``MODEL_FAST``,
+``MODEL_STANDARD`` and ``MODEL_LARGE`` environment variables.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.models.document import ArgumentRole, StructuralTag
+from src.utils.metrics import ANALYZE, IMAGE_TAG, REFINE, record_route, record_route_escalation
+from src.utils.text_utils import estimate_tokens
+
+# Route tiers, from cheapest to most capable
+FAST = "fast"
+STANDARD = "standard"
+LARGE = "large"
+TIERS = (FAST, STANDARD, LARGE)
+
+# Routing modes: adaptive routing, or the standard route for every call
+ADAPTIVE = "adaptive"
+FIXED = "fixed"
+MODES = (ADAPTIVE, FIXED)
+
+DEFAULT_MODELS = {FAST: "gpt-4o-mini", STANDARD: "gpt-3.5-turbo", LARGE: "gpt-4o"}
+
+# Token limits of the calls on the standard route
+ANALYSIS_MAX_TOKENS = 300
+IMAGE_TAG_MAX_TOKENS = 50
+
+# Tokens of the JSON around the gist and per gist sentence of an analysis
+_ANALYSIS_BASE_TOKENS = 100
+_GIST_SENTENCE_TOKENS = 50
+_MAX_ANALYSIS_TOKENS = 1000
+
+# Largest token limit an escalation may double to, by call type; calls not
+# listed, such as refinement, keep the limit their caller set
+_MAX_ESCALATED_TOKENS = {ANALYZE: _MAX_ANALYSIS_TOKENS, IMAGE_TAG: 2 * IMAGE_TAG_MAX_TOKENS}
+
+# Cue phrases by the structural tag they suggest
+TAG_CUES = {
+    StructuralTag.THESIS: ("this essay", "this paper", "we argue", "i argue", "the central claim",
+                           "this article", "main argument"),
+    StructuralTag.POINT: ("first", "second", "third", "another reason", "a key", "most importantly"),
+    StructuralTag.EXAMPLE: ("for example", "for instance", "such as", "case study", "consider",
+                            "to illustrate", "in one study"),
+    StructuralTag.CONCLUSION: ("in conclusion", "to conclude", "in summary", "to sum up", "ultimately",
+                               "overall", "therefore"),
+}
+
+# Cue phrases by the argument role they suggest
+ROLE_CUES = {
+    ArgumentRole.COUNTERPOINT: ("however", "critics", "on the other hand", "although", "despite",
+                                "nevertheless", "opponents"),
+    ArgumentRole.ELABORATION: ("in other words", "specifically", "that is", "furthermore", "moreover",
+                               "in addition"),
+}
+
+# Prior scores of the structural tags by position in the document
+_TAG_PRIORS = {
+    "beginning": {StructuralTag.THESIS: 1.0, StructuralTag.POINT: 0.6,
+                  StructuralTag.EXAMPLE: 0.2, StructuralTag.CONCLUSION: 0.1},
+    "middle": {StructuralTag.POINT: 1.0, StructuralTag.EXAMPLE: 0.6,
+               StructuralTag.THESIS: 0.2, StructuralTag.CONCLUSION: 0.2},
+    "end": {StructuralTag.CONCLUSION: 1.0, StructuralTag.POINT: 0.6,
+            StructuralTag.EXAMPLE: 0.2, StructuralTag.THESIS: 0.1},
+}
+_ROLE_PRIORS = {ArgumentRole.SUPPORTING: 1.0, ArgumentRole.ELABORATION: 0.6, ArgumentRole.COUNTERPOINT: 0.3}
+
+# Score added per cue phrase found
+_CUE_WEIGHT = 1.5
+
+# Confidence factor for paragraphs with counterpoint cues
+_COUNTERPOINT_FACTOR = 0.75
+
+
+@dataclass(frozen=True)
+class Route:
+    """The model and token limit of a chat call."""
+    tier: str
+    model: str
+    max_tokens: int
+
+
+@dataclass
+class PreClassification:
+    """A local guess of a paragraph's structural tag and argument role."""
+    structural_tag: StructuralTag
+    argument_role: ArgumentRole
+    confidence: float
+
+
+def _cue_pattern(phrases: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Build a pattern matching any of the phrases as whole words."""
+    return re.compile(r'\b(?:' + "|".join(re.escape(p) for p in phrases) + r')\b', re.IGNORECASE)
+
+
+_TAG_PATTERNS = {tag: _cue_pattern(phrases) for tag, phrases in TAG_CUES.items()}
+_ROLE_PATTERNS = {role: _cue_pattern(phrases) for role, phrases in ROLE_CUES.items()}
+
+
+def _best(scores: Dict) -> Tuple[object, float]:
+    """Get the highest scoring key and its margin over the runner-up, relative to its score."""
+    ranked = sorted(scores.items(), key=lambda item: -item[1])
+    best, top = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    return best, (top - runner_up) / top if top else 0.0
+
+
+def preclassify(text: str, position_context: str) -> PreClassification:
+    """
+    Guess a paragraph's structural tag and argument role from cue phrases.
+
+    The position in the document sets the prior of each tag, and every
+    distinct cue phrase adds to the tag or role it suggests. The confidence
+    is the margin of the best tag over the runner-up, so paragraphs without
+    cues or with cues of different tags get a low confidence. Cues of a
+    counterpoint lower it further, since the role is then in question.
+
+    Args:
+        text: The paragraph text
+        position_context: Position of the paragraph ("beginning", "middle", "end")
+
+    Returns:
+        PreClassification: The guessed tag and role, with a confidence from 0 to 1
+    """
+    tag_scores = dict(_TAG_PRIORS.get(position_context, _TAG_PRIORS["middle"]))
+    for tag, pattern in _TAG_PATTERNS.items():
+        tag_scores[tag] += _CUE_WEIGHT * len({m.lower() for m in pattern.findall(text)})
+    role_scores = dict(_ROLE_PRIORS)
+    for role, pattern in _ROLE_PATTERNS.items():
+        role_scores[role] += _CUE_WEIGHT * len({m.lower() for m in pattern.findall(text)})
+
+    tag, tag_margin = _best(tag_scores)
+    role, _ = _best(role_scores)
+    confidence = tag_margin
+    if role_scores[ArgumentRole.COUNTERPOINT] > _ROLE_PRIORS[ArgumentRole.COUNTERPOINT]:
+        confidence *= _COUNTERPOINT_FACTOR
+    return PreClassification(tag, role, round(confidence, 3))
+
+
+def default_models() -> Dict[str, str]:
+    """Get the model of every tier, from the environment or the defaults."""
+    return {tier: os.getenv(f"MODEL_{tier.upper()}", model) for tier, model in DEFAULT_MODELS.items()}
+
+
+class ModelRouter:
+    """Picks the model and token limit of every chat call."""
+
+    def __init__(self,
+                 mode: str = FIXED,
+                 models: Optional[Dict[str, str]] = None,
+                 short_words: int = 80,
+                 long_words: int = 350,
+                 confident: float = 0.5,
+                 ambiguous: float = 0.25,
+                 long_transcript_tokens: int = 3000):
+        """
+        Initialize the router.
+
+        Args:
+            mode: ``adaptive``, or ``fixed`` (the default) to use the
+                standard route with the original token limits for every call
+            models: Model of each tier, defaults to ``default_models()``
+            short_words: Paragraphs up to this many words may take the fast route
+            long_words: Paragraphs over this many words take the large route;
+                above the about 300 words of the chunks ``TextProcessor``
+                splits longer paragraphs into, so chunks are not sent to
+                the large model for their length
+            confident: Minimum pre-classification confidence for the fast route
+            ambiguous: Pre-classification confidence below which a paragraph
+                takes the large route
+            long_transcript_tokens: Transcripts over this many tokens are
+                refined on the large route
+
+        Raises:
+            ValueError: If the mode is not supported
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unsupported routing mode: {mode}")
+        self.mode = mode
+        self.models = {**default_models(), **(models or {})}
+        self.short_words = short_words
+        self.long_words = long_words
+        self.confident = confident
+        self.ambiguous = ambiguous
+        self.long_transcript_tokens = long_transcript_tokens
+
+    def route(self, tier: str, max_tokens: int) -> Route:
+        """Build the route of a tier."""
+        return Route(tier, self.models[tier], max_tokens)
+
+    def route_analysis(self, text: str, position_context: str) -> Route:
+        """
+        Pick the route of a paragraph analysis.
+
+        Paragraphs at the beginning and end of a document hold the thesis and
+        conclusion, which the whole synthesis depends on, so they never take
+        the fast route.
+
+        Args:
+            text: The paragraph text
+            position_context: Position of the paragraph ("beginning", "middle", "end")
+
+        Returns:
+            Route: The route of the call
+        """
+        if self.mode == FIXED:
+            return self._decide(ANALYZE, STANDARD, ANALYSIS_MAX_TOKENS, "fixed")
+
+        # Leave room for the gist sentences the prompt asks for
+        word_count = len(text.split())
+        gist_sentences = max(1, word_count // 50)
+        max_tokens = min(_MAX_ANALYSIS_TOKENS, _ANALYSIS_BASE_TOKENS + _GIST_SENTENCE_TOKENS * gist_sentences)
+
+        guess = preclassify(text, position_context)
+        if word_count > self.long_words:
+            return self._decide(ANALYZE, LARGE, max_tokens, "long")
+        if guess.confidence < self.ambiguous:
+            return self._decide(ANALYZE, LARGE, max_tokens, "ambiguous")
+        if position_context != "middle":
+            return self._decide(ANALYZE, STANDARD, max_tokens, "position")
+        if word_count <= self.short_words and guess.confidence >= self.confident:
+            return self._decide(ANALYZE, FAST, max_tokens, "obvious")
+        return self._decide(ANALYZE, STANDARD, max_tokens, "default")
+
+    def route_image_tag(self, sentence: str) -> Route:
+        """
+        Pick the route of an image tag, a short description any model writes well.
+
+        Args:
+            sentence: The gist sentence to illustrate
+
+        Returns:
+            Route: The route of the call
+        """
+        if self.mode == FIXED:
+            return self._decide(IMAGE_TAG, STANDARD, IMAGE_TAG_MAX_TOKENS, "fixed")
+        return self._decide(IMAGE_TAG, FAST, IMAGE_TAG_MAX_TOKENS, "short")
+
+    def route_refinement(self, transcript: str, max_tokens: int) -> Route:
+        """
+        Pick the route of a transcript refinement.
+
+        Args:
+            transcript: The transcript to refine
+            max_tokens: Maximum number of tokens in the refined summary
+
+        Returns:
+            Route: The route of the call
+        """
+        if self.mode == FIXED:
+            return self._decide(REFINE, STANDARD, max_tokens, "fixed")
+        if estimate_tokens(transcript) > self.long_transcript_tokens:
+            return self._decide(REFINE, LARGE, max_tokens, "long")
+        return self._decide(REFINE, STANDARD, max_tokens, "default")
+
+    def escalate(self, call: str, route: Route) -> Optional[Route]:
+        """
+        Pick the route to retry a call on after its response could not be parsed.
+
+        The next tier also gets twice the token limit, in case the response
+        was cut off, up to the cap of the call type.
+
+        Args:
+            call: Call type label, such as ``ANALYZE``
+            route: The route of the failed call
+
+        Returns:
+            Optional[Route]: The next route, or None if the route is already
+            the largest
+        """
+        index = TIERS.index(route.tier)
+        if index == len(TIERS) - 1:
+            return None
+        cap = _MAX_ESCALATED_TOKENS.get(call, route.max_tokens)
+        escalated = self.route(TIERS[index + 1], max(route.max_tokens, min(cap, route.max_tokens * 2)))
+        record_route_escalation(call, route.tier, escalated.tier)
+        return escalated
+
+    def _decide(self, call: str, tier: str, max_tokens: int, reason: str) -> Route:
+        """Record a routing decision and build its route."""
+        record_route(call, tier, reason)
+        return self.route(tier, max_tokens)
+
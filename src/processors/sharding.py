@@ -0,0 +1,165 @@
+"""
+Sharded paragraph analysis of a single document across processes.
+
+The paragraphs of a document are split into contiguous shards, and a pool of
+worker processes analyzes the shards, each process with its own
+``TextProcessor``. A shard carries only what the analysis prompt uses: the
+id, text and global index of each paragraph that needs analysis, the
+paragraph count of the whole document and its title. Every paragraph thus
+gets the same position context as in ``TextProcessor.process_document``,
+including those at the edges of a shard. Workers send back only the
+analysis fields, which are applied to the original paragraphs in document
+order.
+"""
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.models.document import Document, Paragraph
+from src.processors.text_processor import TextProcessor
+
+# Shards per process, so processes that finish early can take on more work
+SHARDS_PER_PROCESS = 4
+
+# Processor of the current worker process, created by _init_worker
+_processor: Optional[TextProcessor] = None
+
+
+@dataclass
+class Shard:
+    """A contiguous range of paragraphs of a document, as sent to a worker."""
+    start: int
+    end: int
+    total: int
+    title: str
+    # Global index, id and text of every paragraph in the range that needs analysis
+    paragraphs: List[Tuple[int, str, str]] = field(default_factory=list)
+
+
+@dataclass
+class ShardResult:
+    """The analysis of the paragraphs of a shard, as sent back by a worker."""
+    start: int
+    end: int
+    analyses: List[Tuple[int, Dict[str, Any]]]
+    token_usage: Dict[str, int]
+
+
+def make_shards(document: Document, count: int) -> List[Shard]:
+    """
+    Split a document into contiguous shards.
+
+    The shards cover all paragraphs and get about equal numbers of
+    paragraphs that need analysis; short paragraphs cost nothing to process.
+
+    Args:
+        document: The document to split
+        count: Maximum number of shards
+
+    Returns:
+        List[Shard]: The shards in document order
+    """
+    title = document.metadata.get('title', '')
+    total = len(document.paragraphs)
+    needed = [i for i, p in enumerate(document.paragraphs) if TextProcessor.needs_analysis(p)]
+    count = max(1, min(count, len(needed)))
+
+    shards = []
+    start = 0
+    for k in range(count):
+        indices = needed[len(needed) * k // count:len(needed) * (k + 1) // count]
+        # The last shard also takes any trailing paragraphs that need no analysis
+        end = total if k == count - 1 else indices[-1] + 1
+        paragraphs = [(i, document.paragraphs[i].id, document.paragraphs[i].text) for i in indices]
+        shards.append(Shard(start, end, total, title, paragraphs))
+        start = end
+    return shards
+
+
+def analyze_shard(shard: Shard, processor: Optional[TextProcessor] = None) -> ShardResult:
+    """
+    Analyze the paragraphs of a shard.
+
+    Args:
+        shard: The shard to analyze
+        processor: The processor making the API calls, defaults to the one
+            of the worker process
+
+    Returns:
+        ShardResult: The analysis fields of every analyzed paragraph
+    """
+    processor = processor or _processor
+    usage_before = dict(processor.token_usage)
+    analyses = []
+    for index, paragraph_id, text in shard.paragraphs:
+        paragraph = Paragraph(id=paragraph_id, text=text)
+        # The position context is relative to the whole document, not the shard
+        position_context = processor._get_position_context(index, shard.total)
+        processor.analyze_paragraph(paragraph, position_context, shard.title)
+        analyses.append((index, paragraph.analysis_dict()))
+
+        # Pace the API calls as process_document does
+        if processor.request_delay:
+            time.sleep(processor.request_delay)
+
+    usage = {key: processor.token_usage[key] - usage_before.get(key, 0) for key in processor.token_usage}
+    return ShardResult(shard.start, shard.end, analyses, usage)
+
+
+def _init_worker(processor_factory: Callable[[], TextProcessor]) -> None:
+    """Create the processor of a worker process."""
+    global _processor
+    _processor = processor_factory()
+
+
+class ShardedProcessor:
+    """Analyzes the paragraphs of one document with a pool of processes."""
+
+    def __init__(self,
+                 processes: int,
+                 processor_factory: Callable[[], TextProcessor] = TextProcessor,
+                 shards_per_process: int = SHARDS_PER_PROCESS):
+        """
+        Initialize the sharded processor.
+
+        Args:
+            processes: Number of worker processes
+            processor_factory: Picklable callable creating the processor of
+                each worker process
+            shards_per_process: Number of shards per worker process
+        """
+        self.processes = max(1, processes)
+        self.processor_factory = processor_factory
+        self.shards_per_process = max(1, shards_per_process)
+
+        # Token usage of all API calls made by the worker processes
+        self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "calls": 0}
+
+    def process_document(self,
+                         document: Document,
+                         on_paragraph: Optional[Callable[[int, Paragraph], None]] = None) -> Document:
+        """
+        Process an entire document, analyzing its shards in parallel.
+
+        Args:
+            document: The document to process
+            on_paragraph: Optional callback invoked with the index and paragraph
+                as soon as each paragraph is finished, in document order
+
+        Returns:
+            Document: The processed document with enhanced paragraph metadata
+        """
+        shards = make_shards(document, self.processes * self.shards_per_process)
+        with multiprocessing.Pool(min(self.processes, len(shards)), initializer=_init_worker,
+                                  initargs=(self.processor_factory,)) as pool:
+            # Shards come back in order, so paragraphs can be reported in order
+            for result in pool.imap(analyze_shard, shards):
+                for index, analysis in result.analyses:
+                    document.paragraphs[index].apply_analysis(analysis)
+                for key, value in result.token_usage.items():
+                    self.token_usage[key] = self.token_usage.get(key, 0) + value
+                if on_paragraph:
+                    for index in range(result.start, result.end):
+                        on_paragraph(index, document.paragraphs[index])
+        return document
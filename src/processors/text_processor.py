@@ -6,17 +6,34 @@ argument roles, and generate concise gists using OpenAI's API.
 """
 import os
 import json
-from typing import Dict, List, Any, Optional, Tuple
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import time
 from dotenv import load_dotenv
 from openai import OpenAI
 
 from src.models.document import Document, Paragraph, GistSentence, StructuralTag, ArgumentRole
-from src.utils.text_utils import split_into_sentences
+from src.processors.deadline import (
+    ANALYSIS_FIELDS, IMAGE_TAGS, Deadline, DeadlineExpired, degraded_fields, heuristic_analysis, priority,
+    set_degraded_fields
+)
+from src.processors.routing import ModelRouter, Route
+from src.utils.text_utils import estimate_tokens, get_position_context, split_into_chunks, split_into_sentences
+from src.utils.metrics import ANALYZE, IMAGE_TAG, record_parse_failure, record_tokens, track_llm_call
+from src.utils.tracing import span
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Paragraphs over this many tokens are analyzed in chunks
+MAX_PARAGRAPH_TOKENS = 400
+
+# Most chunks of one paragraph analyzed at the same time
+CHUNK_WORKERS = 4
+
 
 class TextProcessor:
     """
@@ -28,12 +45,22 @@ class TextProcessor:
     concise summaries (gists) of the content.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, request_delay: float = 0.5,
+                 router: Optional[ModelRouter] = None,
+                 max_paragraph_tokens: int = MAX_PARAGRAPH_TOKENS,
+                 chunk_workers: int = CHUNK_WORKERS):
         """
         Initialize the text processor with API key.
         
         Args:
             api_key: Optional API key for OpenAI service, defaults to env variable
+            request_delay: Seconds to wait after each paragraph to stay under
+                the API rate limits
+            router: Optional router picking the model of each call, defaults
+                to fixed routing on the standard model
+            max_paragraph_tokens: Paragraphs over this many tokens are split
+                into chunks on sentence boundaries and analyzed in parallel
+            chunk_workers: Most chunks of one paragraph analyzed at the same time
         """
         # Use provided API key or get from environment
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
@@ -42,58 +69,257 @@ class TextProcessor:
         
         # Initialize OpenAI client
         self.client = OpenAI(api_key=self.api_key)
+        
+        self.request_delay = request_delay
+        self.router = router or ModelRouter()
+        self.max_paragraph_tokens = max_paragraph_tokens
+        self.chunk_workers = chunk_workers
+        
+        # Token usage of all API calls made by this processor, which the
+        # chunks of a paragraph add to from several threads
+        self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "calls": 0}
+        self._usage_lock = threading.Lock()
+        
+        # Deadline the API calls of the current document must finish by, if any
+        self._deadline: Optional[Deadline] = None
     
-    def process_document(self, document: Document) -> Document:
+    def process_document(self,
+                         document: Document,
+                         on_paragraph: Optional[Callable[[int, Paragraph], None]] = None,
+                         deadline: Optional[Deadline] = None) -> Document:
         """
         Process an entire document, analyzing all paragraphs.
         
         This method goes through each paragraph in the document, identifying
         structural tags, argument roles, and generating gists for each.
         
+        Under a deadline, or for a document with work deferred by an earlier
+        deadline, the work is done in order of priority instead; see
+        ``_process_prioritized``.
+        
         Args:
             document: The document to process
+            on_paragraph: Optional callback invoked with the index and paragraph
+                as soon as each paragraph is finished, in document order
+            deadline: Optional deadline to finish processing by
             
         Returns:
             Document: The processed document with enhanced paragraph metadata
         """
+        if deadline or degraded_fields(document):
+            return self._process_prioritized(document, on_paragraph, deadline)
+        
         # Process each paragraph in the document
         for i, paragraph in enumerate(document.paragraphs):
             # Skip very short paragraphs or titles
-            if len(paragraph.text.split()) < 3:
+            if not self.needs_analysis(paragraph):
+                if on_paragraph:
+                    on_paragraph(i, paragraph)
                 continue
                 
             # Add context about position in document
             position_context = self._get_position_context(i, len(document.paragraphs))
             
             # Get AI analysis for the paragraph
-            structural_tag, argument_role, gist, gist_sentences = self._analyze_paragraph(
-                paragraph.text, 
-                position_context,
-                document.metadata.get('title', '')
-            )
+            self.analyze_paragraph(paragraph, position_context, document.metadata.get('title', ''))
             
-            # Update the paragraph with the analysis
-            paragraph.structural_tag = structural_tag
-            paragraph.argument_role = argument_role
-            paragraph.gist = gist
-            paragraph.gist_sentences = gist_sentences
+            if on_paragraph:
+                on_paragraph(i, paragraph)
             
             # Add a small delay to avoid rate limits with the API
-            time.sleep(0.5)
+            if self.request_delay:
+                with span("rate_limit_delay"):
+                    time.sleep(self.request_delay)
         
         return document
     
+    def _process_prioritized(self,
+                             document: Document,
+                             on_paragraph: Optional[Callable[[int, Paragraph], None]],
+                             deadline: Optional[Deadline]) -> Document:
+        """
+        Process a document in order of priority, degrading what does not fit a deadline.
+        
+        Paragraphs likely to be the thesis or conclusion are analyzed first,
+        then the others in document order, all without image tags. Image tags
+        follow in the same order once every paragraph is analyzed. No call is
+        started that the mean duration of the earlier ones says would miss
+        the deadline, and calls are given the time left as timeout. Once the
+        deadline passed, no further call is made, including the escalations,
+        chunks and image tags of a paragraph already started.
+        Paragraphs left unanalyzed, or whose analysis failed, get a heuristic
+        analysis. The degraded fields are recorded in the document metadata.
+        
+        For a document with degraded fields recorded by an earlier run, only
+        the degraded work is done; finished analyses and image tags are kept.
+        
+        Args:
+            document: The document to process
+            on_paragraph: Optional callback invoked with the index and paragraph
+                of every paragraph once all are finished, in document order
+            deadline: Optional deadline to finish processing by
+            
+        Returns:
+            Document: The processed document with enhanced paragraph metadata
+        """
+        title = document.metadata.get('title', '')
+        total = len(document.paragraphs)
+        contexts = [self._get_position_context(i, total) for i in range(total)]
+        
+        # Work left from an earlier run, or all of it
+        previous = degraded_fields(document)
+        if previous:
+            to_analyze = [i for i, p in enumerate(document.paragraphs)
+                          if set(ANALYSIS_FIELDS) & set(previous.get(p.id, []))]
+            to_tag = [i for i, p in enumerate(document.paragraphs)
+                      if IMAGE_TAGS in previous.get(p.id, []) and i not in to_analyze]
+        else:
+            to_analyze = [i for i, p in enumerate(document.paragraphs) if self.needs_analysis(p)]
+            to_tag = []
+        rank = {i: (priority(document.paragraphs[i].text, contexts[i]), i) for i in to_analyze + to_tag}
+        
+        def time_left(durations: List[float]) -> bool:
+            """Check whether a call of the mean duration so far still fits the deadline."""
+            if deadline is None:
+                return True
+            expected = sum(durations) / len(durations) if durations else 0.0
+            return deadline.remaining() > expected
+        
+        clock = deadline.clock if deadline else time.monotonic
+        self._deadline = deadline
+        degraded: Dict[str, List[str]] = {}
+        try:
+            # Analyze without image tags, most important paragraphs first
+            durations: List[float] = []
+            for i in sorted(to_analyze, key=rank.get):
+                paragraph = document.paragraphs[i]
+                if time_left(durations):
+                    start = clock()
+                    self.analyze_paragraph(paragraph, contexts[i], title, image_tags=False)
+                    durations.append(clock() - start)
+                    self._pace(deadline)
+                    if not paragraph.gist.startswith("Error:"):
+                        to_tag.append(i)
+                        continue
+                
+                # Fall back to a local analysis without time or a usable response
+                (paragraph.structural_tag, paragraph.argument_role,
+                 paragraph.gist, paragraph.gist_sentences) = heuristic_analysis(paragraph.text, contexts[i])
+                degraded[paragraph.id] = list(ANALYSIS_FIELDS) + [IMAGE_TAGS]
+            
+            # Then add image tags in the same order while time is left
+            durations = []
+            for i in sorted(to_tag, key=rank.get):
+                paragraph = document.paragraphs[i]
+                if time_left(durations):
+                    start = clock()
+                    self.add_image_tags(paragraph)
+                    durations.append(clock() - start)
+                    if all(s.image_tag for s in paragraph.gist_sentences):
+                        continue
+
+                # Defer the tags left without time
+                degraded[paragraph.id] = [IMAGE_TAGS]
+        finally:
+            self._deadline = None
+        
+        set_degraded_fields(document, degraded)
+        if on_paragraph:
+            for i, paragraph in enumerate(document.paragraphs):
+                on_paragraph(i, paragraph)
+        return document
+    
+    def _pace(self, deadline: Optional[Deadline]) -> None:
+        """Wait between API calls to stay under rate limits, but not past a deadline."""
+        delay = self.request_delay
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline.remaining()))
+        if delay:
+            with span("rate_limit_delay"):
+                time.sleep(delay)
+    
+    @staticmethod
+    def needs_analysis(paragraph: Paragraph) -> bool:
+        """
+        Check whether a paragraph is long enough to be analyzed.
+        
+        Very short paragraphs, such as titles, are left unanalyzed.
+        
+        Args:
+            paragraph: The paragraph to check
+            
+        Returns:
+            bool: True if the paragraph should be analyzed
+        """
+        return len(paragraph.text.split()) >= 3
+    
+    def analyze_paragraph(self,
+                          paragraph: Paragraph,
+                          position_context: str,
+                          document_title: str,
+                          image_tags: bool = True) -> Paragraph:
+        """
+        Analyze a single paragraph and store the results in it.
+        
+        Args:
+            paragraph: The paragraph to analyze
+            position_context: Information about paragraph's position in document
+            document_title: Title of the document for context
+            image_tags: Whether to generate the image tags of the gist sentences
+            
+        Returns:
+            Paragraph: The same paragraph, updated with the analysis
+        """
+        with span("analyze_paragraph", paragraph=paragraph.id):
+            structural_tag, argument_role, gist, gist_sentences = self._analyze_paragraph(
+                paragraph.text,
+                position_context,
+                document_title,
+                image_tags
+            )
+        
+        # Update the paragraph with the analysis
+        paragraph.structural_tag = structural_tag
+        paragraph.argument_role = argument_role
+        paragraph.gist = gist
+        paragraph.gist_sentences = gist_sentences
+        return paragraph
+    
+    def add_image_tags(self, paragraph: Paragraph) -> Paragraph:
+        """
+        Generate the image tags missing from the gist sentences of an analyzed paragraph.
+        
+        Args:
+            paragraph: The analyzed paragraph
+            
+        Returns:
+            Paragraph: The same paragraph, updated with the image tags
+        """
+        for sentence in paragraph.gist_sentences:
+            if not sentence.image_tag:
+                with span("generate_image_tag"):
+                    sentence.image_tag = self._generate_image_tag(sentence.text)
+        return paragraph
+    
     def _analyze_paragraph(self, 
                           text: str, 
                           position_context: str,
-                          document_title: str) -> Tuple[StructuralTag, ArgumentRole, str]:
+                          document_title: str,
+                          image_tags: bool = True,
+                          part: Optional[Tuple[int, int]] = None) -> Tuple[StructuralTag, ArgumentRole, str]:
         """
         Analyze a single paragraph using OpenAI to identify its characteristics.
         
+        Paragraphs over ``max_paragraph_tokens`` are analyzed in chunks; see
+        ``_analyze_chunked``.
+        
         Args:
             text: The paragraph text
             position_context: Information about paragraph's position in document
             document_title: Title of the document for context
+            image_tags: Whether to generate the image tags of the gist sentences
+            part: Number and count of the chunk, if the text is a chunk of a
+                longer paragraph
             
         Returns:
             Tuple containing:
@@ -101,14 +327,24 @@ class TextProcessor:
                 - ArgumentRole: The argument role of the paragraph
                 - str: A concise gist of the paragraph's content
         """
+        # Keep the prompt and response of every call bounded
+        if part is None and estimate_tokens(text) > self.max_paragraph_tokens:
+            return self._analyze_chunked(text, position_context, document_title, image_tags)
+        
         # Calculate word count and determine maximum gist length
         word_count = len(text.split())
         max_sentences = max(1, word_count // 50)  # 1 sentence per 50 words, minimum 1 sentence
         
+        # Tell the model a chunk is only part of the paragraph
+        part_context = ""
+        if part is not None:
+            part_context = f"This is part {part[0]} of {part[1]} of a long paragraph; analyze it on its own."
+        
         # Construct a prompt for the AI
         prompt = f"""
         Analyze the following paragraph from a document titled "{document_title}".
         This paragraph appears at the {position_context} of the document.
+        {part_context}
         
         Paragraph:
         {text}
@@ -146,38 +382,25 @@ class TextProcessor:
         }}
         """
         
+        messages = [
+            {"role": "system", "content": "You are a document analysis assistant that identifies the structural elements of text and creates concise summaries."},
+            {"role": "user", "content": prompt}
+        ]
+        
         try:
-            # Make OpenAI API call using the newer Client interface
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",  # Use appropriate model for your needs
-                messages=[
-                    {"role": "system", "content": "You are a document analysis assistant that identifies the structural elements of text and creates concise summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.1  # Keep temperature low for more deterministic outputs
-            )
-            
-            # Parse JSON response
-            result_text = response.choices[0].message.content.strip()
-            
-            # The result might have markdown formatting, so we need to extract just the JSON part
-            # Find JSON content between backticks or braces
-            import re
-            json_match = re.search(r'```json\s*(.*?)\s*```|```\s*(.*?)\s*```|(\{.*\})', result_text, re.DOTALL)
-            
-            if json_match:
-                # Use the first non-None group
-                json_str = next(group for group in json_match.groups() if group is not None)
-                result = json.loads(json_str)
-            else:
-                # If we can't find JSON with regex, try to parse the whole response
-                result = json.loads(result_text)
-            
-            # Convert string values to enum types
-            structural_tag = StructuralTag[result["structural_tag"]]
-            argument_role = ArgumentRole[result["argument_role"]]
-            gist = result["gist"]
+            # Pick the model for this paragraph, escalating while responses cannot be parsed
+            route = self.router.route_analysis(text, position_context)
+            while True:
+                # Keep temperature low for more deterministic outputs
+                result_text = self._complete(ANALYZE, route, messages, temperature=0.1)
+                try:
+                    structural_tag, argument_role, gist = self._parse_analysis(result_text)
+                    break
+                except (ValueError, KeyError, TypeError):
+                    record_parse_failure(ANALYZE, "error")
+                    route = self.router.escalate(ANALYZE, route)
+                    if route is None:
+                        raise
             
             # Process gist sentences - ALWAYS split ourselves for consistency
             gist_sentences = []
@@ -187,8 +410,11 @@ class TextProcessor:
             
             # Generate image tags for each sentence
             for sentence in sentences:
-                # For each sentence, we'll generate an image tag
-                image_tag = self._generate_image_tag(sentence)
+                # For each sentence, we'll generate an image tag unless deferred
+                image_tag = ""
+                if image_tags:
+                    with span("generate_image_tag"):
+                        image_tag = self._generate_image_tag(sentence)
                 gist_sentences.append(
                     GistSentence(
                         text=sentence,
@@ -202,7 +428,120 @@ class TextProcessor:
             # In case of error, return defaults with error message
             print(f"Error processing paragraph: {str(e)}")
             return StructuralTag.UNKNOWN, ArgumentRole.UNKNOWN, f"Error: {str(e)}", []
+    
+    def _analyze_chunked(self,
+                         text: str,
+                         position_context: str,
+                         document_title: str,
+                         image_tags: bool) -> Tuple[StructuralTag, ArgumentRole, str, List[GistSentence]]:
+        """
+        Analyze an oversized paragraph in token-bounded chunks and merge the results.
+        
+        The chunks are split on sentence boundaries and analyzed in parallel,
+        each with the gist length its own word count allows, so the gist of
+        the paragraph keeps the length of a whole-paragraph analysis. The
+        structural tag and argument role are the most common of the chunks,
+        ties going to the earliest chunk, and the gists are joined in order.
+        Chunks whose analysis failed are left out of the merge.
+        
+        Args:
+            text: The paragraph text
+            position_context: Information about paragraph's position in document
+            document_title: Title of the document for context
+            image_tags: Whether to generate the image tags of the gist sentences
             
+        Returns:
+            Tuple containing the merged structural tag, argument role, gist and
+            gist sentences, or the error of the first chunk if every chunk failed
+        """
+        chunks = split_into_chunks(text, self.max_paragraph_tokens)
+        
+        def analyze(numbered: Tuple[int, str]) -> Tuple[StructuralTag, ArgumentRole, str, List[GistSentence]]:
+            """Analyze one chunk, tracing it under its own span."""
+            number, chunk = numbered
+            with span("analyze_chunk", chunk=number, chunks=len(chunks)):
+                return self._analyze_paragraph(chunk, position_context, document_title, image_tags,
+                                               part=(number, len(chunks)))
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.chunk_workers, len(chunks)))) as pool:
+            results = list(pool.map(analyze, enumerate(chunks, start=1)))
+        
+        # Merge the chunks that were analyzed
+        analyzed = [result for result in results if result[0] != StructuralTag.UNKNOWN]
+        if not analyzed:
+            return results[0]
+        tags = Counter(result[0] for result in analyzed)
+        roles = Counter(result[1] for result in analyzed)
+        structural_tag = max(tags, key=lambda tag: tags[tag])
+        argument_role = max(roles, key=lambda role: roles[role])
+        gist = " ".join(result[2] for result in analyzed)
+        gist_sentences = [sentence for result in analyzed for sentence in result[3]]
+        return structural_tag, argument_role, gist, gist_sentences
+    
+    def _parse_analysis(self, result_text: str) -> Tuple[StructuralTag, ArgumentRole, str]:
+        """
+        Parse the JSON response of a paragraph analysis.
+        
+        Args:
+            result_text: The response text
+            
+        Returns:
+            Tuple containing the structural tag, argument role and gist
+            
+        Raises:
+            ValueError: If the response holds no valid JSON
+            KeyError: If a field or enum value is missing or unknown
+            TypeError: If the JSON is not an object
+        """
+        # The result might have markdown formatting, so we need to extract just the JSON part
+        # Find JSON content between backticks or braces
+        json_match = re.search(r'```json\s*(.*?)\s*```|```\s*(.*?)\s*```|(\{.*\})', result_text, re.DOTALL)
+        
+        if json_match:
+            # Use the first non-None group
+            json_str = next(group for group in json_match.groups() if group is not None)
+            result = json.loads(json_str)
+        else:
+            # If we can't find JSON with regex, try to parse the whole response
+            record_parse_failure(ANALYZE, "fallback")
+            result = json.loads(result_text)
+        
+        # Convert string values to enum types
+        return StructuralTag[result["structural_tag"]], ArgumentRole[result["argument_role"]], result["gist"]
+    
+    def _complete(self, call: str, route: Route, messages: List[Dict[str, str]], temperature: float) -> str:
+        """
+        Make a chat call on a route and record its usage.
+        
+        Args:
+            call: Call type label of the metrics
+            route: The model and token limit to use
+            messages: The chat messages
+            temperature: Sampling temperature
+            
+        Returns:
+            str: The stripped response text
+            
+        Raises:
+            DeadlineExpired: If the deadline of the processing passed
+        """
+        # Skip calls once the deadline passed, and give up on those that would run past it
+        options: Dict[str, Any] = {}
+        if self._deadline is not None:
+            if self._deadline.expired():
+                raise DeadlineExpired("Deadline passed before the call")
+            options["timeout"] = self._deadline.remaining()
+        with track_llm_call(call, route.tier):
+            response = self.client.chat.completions.create(
+                model=route.model,
+                messages=messages,
+                max_tokens=route.max_tokens,
+                temperature=temperature,
+                **options
+            )
+        self._record_usage(response, call)
+        return response.choices[0].message.content.strip()
+    
     def _generate_image_tag(self, sentence: str) -> str:
         """
         Generate an image tag for a single sentence.
@@ -229,23 +568,38 @@ class TextProcessor:
             """
             
             # Make the API call
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates concise visual descriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.7
-            )
+            messages = [
+                {"role": "system", "content": "You are a helpful assistant that creates concise visual descriptions."},
+                {"role": "user", "content": prompt}
+            ]
+            image_tag = self._complete(IMAGE_TAG, self.router.route_image_tag(sentence), messages, temperature=0.7)
             
             # Return the image tag
-            return response.choices[0].message.content.strip().strip('"\'')
+            return image_tag.strip('"\'')
             
+        except DeadlineExpired:
+            # Leave the tag missing, so it is degraded and added by a later run
+            return ""
         except Exception as e:
             print(f"Error generating image tag: {str(e)}")
             return "Error generating image"
     
+    def _record_usage(self, response: Any, call: str) -> None:
+        """
+        Add the token usage reported for an API response to the totals and metrics.
+        
+        Args:
+            response: The chat completion response
+            call: Call type label of the metrics
+        """
+        record_tokens(call, response)
+        usage = getattr(response, "usage", None)
+        with self._usage_lock:
+            self.token_usage["calls"] += 1
+            if usage:
+                self.token_usage["prompt_tokens"] += usage.prompt_tokens or 0
+                self.token_usage["completion_tokens"] += usage.completion_tokens or 0
+    
     def _get_position_context(self, index: int, total_paragraphs: int) -> str:
         """
         Determine the position context of a paragraph within the document.
@@ -257,9 +611,4 @@ class TextProcessor:
         Returns:
             str: A description of the paragraph's position ("beginning", "middle", "end")
         """
-        if index < 2:
-            return "beginning"
-        elif index >= total_paragraphs - 2:
-            return "end"
-        else:
-            return "middle"
\ No newline at end of file
+        return get_position_context(index, total_paragraphs)
@@ -0,0 +1 @@
+"""Reporting across processing runs."""
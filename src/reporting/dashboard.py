@@ -0,0 +1,151 @@
+"""
+Dashboard page summarizing all indexed processing runs.
+
+The dashboard is a single static HTML file in the output directory with
+one table row per run, linking to each run's comparison page. It uses the
+same precompiled stylesheet approach as the comparison pages, so it opens
+without network access.
+"""
+import html
+import os
+import re
+from typing import Any, List, Optional
+
+from src.reporting.run_index import RunIndex
+from src.synthesizers.stylesheet import compile_stylesheet
+
+# File name of the dashboard in the output directory
+DASHBOARD_FILENAME = "dashboard.html"
+
+_CELL_CLASS = "px-3 py-2 border-b border-gray-700"
+_NUMBER_CLASS = "px-3 py-2 border-b border-gray-700 text-right"
+
+# Table columns: heading, row field and whether the value is numeric
+_TABLE_COLUMNS = (
+    ("Created", "created", False),
+    ("Title", "title", False),
+    ("Paragraphs", "paragraphs", True),
+    ("Words", "original_words", True),
+    ("Summary", "summary_words", True),
+    ("Reduction %", "reduction_pct", True),
+    ("T / P / E / C / U", None, False),
+    ("Time (s)", "total_seconds", True),
+    ("Tokens", None, True),
+)
+
+
+def _format(value: Any) -> str:
+    """Format a table value, showing missing values as a dash."""
+    if value is None:
+        return "–"
+    if isinstance(value, float):
+        return f"{value:,.1f}"
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"{value:,}"
+    return html.escape(str(value))
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    """Average the values that are present."""
+    present = [v for v in values if v is not None]
+    return sum(present) / len(present) if present else None
+
+
+def render_dashboard(index: RunIndex) -> str:
+    """
+    Render the dashboard page for a run index.
+
+    Args:
+        index: The run index, newest runs first
+
+    Returns:
+        str: The dashboard HTML
+    """
+    columns = index.columns
+    tokens = [
+        (prompt or 0) + (completion or 0) if prompt is not None or completion is not None else None
+        for prompt, completion in zip(columns["prompt_tokens"], columns["completion_tokens"])
+    ]
+
+    # Aggregates over all runs
+    cards = [
+        ("Runs", _format(len(index))),
+        ("Mean reduction", _format(_mean(columns["reduction_pct"])) + " %"),
+        ("Total tokens", _format(sum(t for t in tokens if t is not None))),
+    ]
+
+    parts = ["""<body class="bg-gray-900 text-gray-100 min-h-screen">
+<div class="max-w-7xl mx-auto px-4 py-10">
+<h1 class="text-3xl font-bold text-white mb-8">Runs Dashboard</h1>
+<div class="grid grid-cols-3 gap-4 mb-8">"""]
+
+    for label, value in cards:
+        parts.append(f'<div class="bg-gray-800 rounded-lg shadow-lg p-4">'
+                     f'<p class="text-sm text-gray-400">{label}</p>'
+                     f'<p class="text-xl font-bold text-white">{value}</p></div>')
+
+    parts.append('</div>\n<div class="bg-gray-800 rounded-lg shadow-lg overflow-x-auto">')
+    parts.append('<table class="w-full text-sm text-left">\n<thead class="bg-gray-700"><tr>')
+    for heading, _, numeric in _TABLE_COLUMNS:
+        cell_class = _NUMBER_CLASS if numeric else _CELL_CLASS
+        parts.append(f'<th class="{cell_class} font-semibold whitespace-nowrap">{heading}</th>')
+    parts.append('</tr></thead>\n<tbody class="text-gray-300">')
+
+    for i, row in enumerate(index.rows()):
+        # Link the title to the run's comparison page when there is one
+        title = _format(row["title"])
+        if row["has_comparison"]:
+            href = html.escape(f"{row['run']}/comparison.html")
+            title = f'<a class="text-blue-400 underline" href="{href}">{title}</a>'
+        tag_counts = " / ".join(str(row[f"tag_{tag}"]) for tag in
+                                ("thesis", "point", "example", "conclusion", "unknown"))
+
+        parts.append("<tr>")
+        for heading, field, numeric in _TABLE_COLUMNS:
+            if heading == "Title":
+                value = title
+            elif field is None and numeric:
+                value = _format(tokens[i])
+            elif field is None:
+                value = tag_counts
+            else:
+                value = _format(row[field])
+            cell_class = _NUMBER_CLASS if numeric else _CELL_CLASS
+            if heading == "Created":
+                cell_class += " whitespace-nowrap"
+            parts.append(f'<td class="{cell_class}">{value}</td>')
+        parts.append("</tr>")
+
+    parts.append("</tbody>\n</table>\n</div>\n</div>\n</body>\n</html>\n")
+    body = "\n".join(parts)
+
+    # Style exactly the classes the page uses
+    classes = {name for value in re.findall(r'class="([^"]*)"', body) for name in value.split()}
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Runs Dashboard</title>
+    <style>
+{compile_stylesheet(classes)}
+    </style>
+</head>
+{body}"""
+
+
+def save_dashboard(index: RunIndex, output_root: str) -> str:
+    """
+    Write the dashboard page into the output directory.
+
+    Args:
+        index: The run index
+        output_root: The directory containing the runs
+
+    Returns:
+        str: Path of the dashboard file
+    """
+    path = os.path.join(output_root, DASHBOARD_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_dashboard(index))
+    return path
@@ -0,0 +1,271 @@
+"""
+Incremental index of processing runs in the output directory.
+
+Every ``--auto-output`` run writes its files to its own directory below
+``output/``. This module scans those directories and keeps one summary row
+per run in a columnar table, stored as ``runs_index.json`` in the output
+directory together with a manifest of each run's file sizes and
+modification times. Reindexing only reads the runs whose files changed, so
+it stays fast with thousands of runs.
+"""
+import datetime
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.document import StructuralTag
+from src.models.serialization import SerializationError, load_document
+
+INDEX_VERSION = 1
+
+# File name of the index in the output directory
+INDEX_FILENAME = "runs_index.json"
+
+# File name of the per-run timing and token usage record
+RUN_INFO_FILENAME = "run_info.json"
+
+# Processed document files in order of preference; binary loads fastest
+PROCESSED_FILENAMES = (
+    "processed_document.samd",
+    "processed_document.json",
+    "processed_document.ndjson",
+)
+
+# Timestamp suffix added to run directory names
+_TIMESTAMP_PATTERN = re.compile(r'_(\d{8}_\d{6})$')
+
+# Columns of the summary table
+COLUMNS = (
+    "run", "title", "source", "created",
+    "paragraphs", "original_words", "summary_words", "reduction_pct",
+    *(f"tag_{tag.name.lower()}" for tag in StructuralTag),
+    "total_seconds", "processing_seconds", "synthesis_seconds",
+    "prompt_tokens", "completion_tokens", "api_calls",
+    "has_comparison",
+)
+
+
+def write_run_info(output_dir: str, info: Dict[str, Any]) -> str:
+    """
+    Save timings, token usage and options of a run in its output directory.
+
+    Args:
+        output_dir: The run's output directory
+        info: JSON-serializable run information
+
+    Returns:
+        str: Path of the written file
+    """
+    path = os.path.join(output_dir, RUN_INFO_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    return path
+
+
+def _signature(run_path: str) -> List[List[Any]]:
+    """
+    Describe the state of a run directory by its files' sizes and mtimes.
+
+    Args:
+        run_path: Path of the run directory
+
+    Returns:
+        List[List[Any]]: Sorted [name, size, mtime_ns] entries
+    """
+    entries = []
+    with os.scandir(run_path) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return sorted(entries)
+
+
+def _created(run_name: str, run_path: str) -> str:
+    """Get a run's creation time from its directory name, or its mtime."""
+    match = _TIMESTAMP_PATTERN.search(run_name)
+    if match:
+        created = datetime.datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    else:
+        created = datetime.datetime.fromtimestamp(os.path.getmtime(run_path))
+    return created.isoformat(timespec="seconds")
+
+
+def read_run(run_name: str, run_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the summary row of one run.
+
+    Args:
+        run_name: Name of the run directory
+        run_path: Path of the run directory
+
+    Returns:
+        Optional[Dict[str, Any]]: The row, or None if the directory holds no
+        readable processed document
+    """
+    loaded = None
+    for filename in PROCESSED_FILENAMES:
+        path = os.path.join(run_path, filename)
+        if os.path.exists(path):
+            try:
+                loaded = load_document(path)
+                break
+            except (SerializationError, OSError):
+                continue
+    if loaded is None:
+        return None
+
+    document = loaded.document
+    synthesis = loaded.synthesis
+    summary_path = os.path.join(run_path, "summary.txt")
+    if not synthesis and os.path.exists(summary_path):
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            synthesis = f.read()
+
+    # Word and tag statistics
+    original_words = sum(len(p.text.split()) for p in document.paragraphs)
+    summary_words = len(synthesis.split()) if synthesis else 0
+    row: Dict[str, Any] = {column: None for column in COLUMNS}
+    row.update({
+        "run": run_name,
+        "title": document.metadata.get('title', 'Untitled'),
+        "source": document.metadata.get('filename') or document.metadata.get('source_path'),
+        "created": _created(run_name, run_path),
+        "paragraphs": len(document.paragraphs),
+        "original_words": original_words,
+        "summary_words": summary_words,
+        "reduction_pct": round((1 - summary_words / original_words) * 100, 1)
+        if synthesis and original_words else None,
+        "has_comparison": os.path.exists(os.path.join(run_path, "comparison.html")),
+    })
+    for tag in StructuralTag:
+        row[f"tag_{tag.name.lower()}"] = 0
+    for p in document.paragraphs:
+        row[f"tag_{p.structural_tag.name.lower()}"] += 1
+
+    # Timings and token usage, recorded by newer runs only
+    info_path = os.path.join(run_path, RUN_INFO_FILENAME)
+    if os.path.exists(info_path):
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (ValueError, OSError):
+            info = {}
+        timings = info.get("timings", {})
+        usage = info.get("token_usage", {})
+        row.update({
+            "total_seconds": timings.get("total"),
+            "processing_seconds": timings.get("processing"),
+            "synthesis_seconds": timings.get("synthesis"),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "api_calls": usage.get("calls"),
+        })
+
+    return row
+
+
+class RunIndex:
+    """Columnar summary table of all runs with a manifest for reindexing."""
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None,
+                 manifest: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            columns: Column name to values, one value per run
+            manifest: Run name to the signature its row was built from
+        """
+        self.columns = columns or {column: [] for column in COLUMNS}
+        self.manifest = manifest or {}
+
+    def __len__(self) -> int:
+        return len(self.columns["run"])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Get the table as one dictionary per run."""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*(self.columns[n] for n in names))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a JSON-serializable dictionary."""
+        return {"version": INDEX_VERSION, "manifest": self.manifest, "columns": self.columns}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunIndex":
+        """
+        Create an index from a dictionary produced by ``to_dict``.
+
+        Raises:
+            ValueError: If the index was written by an unsupported version or
+                has different columns
+        """
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported run index version: {data.get('version')}")
+        if tuple(data["columns"]) != COLUMNS:
+            raise ValueError("Run index columns have changed")
+        return cls(data["columns"], data["manifest"])
+
+    @classmethod
+    def load(cls, path: str) -> "RunIndex":
+        """Load an index saved with ``save``."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str) -> None:
+        """Save the index as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+
+def update_index(output_root: str) -> Tuple[RunIndex, int]:
+    """
+    Bring the index of an output directory up to date.
+
+    Runs whose files are unchanged since the last indexing keep their rows;
+    new and modified runs are read again and deleted runs are dropped.
+
+    Args:
+        output_root: The directory containing one subdirectory per run
+
+    Returns:
+        Tuple[RunIndex, int]: The updated and saved index, and the number of
+        runs that had to be read
+    """
+    index_path = os.path.join(output_root, INDEX_FILENAME)
+    previous = RunIndex()
+    if os.path.exists(index_path):
+        try:
+            previous = RunIndex.load(index_path)
+        except (ValueError, KeyError, OSError):
+            pass  # Rebuild unreadable or outdated indexes from scratch
+
+    previous_rows = {row["run"]: row for row in previous.rows()}
+    rows: List[Dict[str, Any]] = []
+    manifest: Dict[str, Any] = {}
+    read = 0
+
+    with os.scandir(output_root) as it:
+        # Hidden directories, such as the artifact store, hold no runs
+        run_dirs = sorted((entry.name, entry.path) for entry in it
+                          if entry.is_dir() and not entry.name.startswith("."))
+
+    for run_name, run_path in run_dirs:
+        signature = _signature(run_path)
+        if previous.manifest.get(run_name) == signature:
+            # Unchanged runs keep their row, or stay skipped if they had none
+            row = previous_rows.get(run_name)
+        else:
+            row = read_run(run_name, run_path)
+            read += 1
+        manifest[run_name] = signature
+        if row is not None:
+            rows.append(row)
+
+    # Newest runs first
+    rows.sort(key=lambda row: (row["created"], row["run"]), reverse=True)
+    index = RunIndex({column: [row[column] for row in rows] for column in COLUMNS}, manifest)
+    index.save(index_path)
+    return index, read
@@ -0,0 +1 @@
+"""Retrieval utilities for query-focused synthesis."""
@@ -0,0 +1,255 @@
+"""
+Inverted index over document paragraphs with BM25 scoring.
+
+The index covers each paragraph's text, its gist and gist sentences, and
+the image tags of those sentences. Field matches are weighted so that a
+query term found in a gist counts more than one found only in an image
+tag. Indexes can be saved next to ``processed_document.json`` and loaded
+back, so repeated queries against a processed document are instant.
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from src.models.document import Document
+from src.utils.file_utils import atomic_write
+from src.utils.text_utils import tokenize
+
+INDEX_VERSION = 2
+
+# File name of the index saved next to a processed document
+INDEX_FILENAME = "search_index.json"
+
+# Relative weight of term occurrences per indexed field
+FIELD_WEIGHTS = {
+    "text": 1.0,
+    "gist": 2.0,
+    "image_tag": 0.5,
+}
+
+
+class InvertedIndex:
+    """BM25-scored inverted index mapping terms to paragraphs."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation parameter
+            b: BM25 document length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.paragraph_ids: List[str] = []
+        self.fingerprint = ""
+        self.doc_lengths: List[float] = []
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+
+    @classmethod
+    def build(cls, document: Document, k1: float = 1.5, b: float = 0.75) -> "InvertedIndex":
+        """
+        Build an index over all paragraphs of a document.
+
+        Args:
+            document: The document to index
+            k1: BM25 term frequency saturation parameter
+            b: BM25 document length normalization parameter
+
+        Returns:
+            InvertedIndex: The populated index
+        """
+        index = cls(k1=k1, b=b)
+        index.fingerprint = document_fingerprint(document)
+
+        for i, p in enumerate(document.paragraphs):
+            # Weighted term frequencies across all fields of the paragraph
+            fields = [
+                ("text", p.text),
+                ("gist", p.gist),
+            ]
+            # Gist sentences usually repeat the gist, so only their image tags are added
+            fields.extend(("image_tag", s.image_tag) for s in p.gist_sentences)
+
+            frequencies: Dict[str, float] = {}
+            length = 0.0
+            for field_name, value in fields:
+                weight = FIELD_WEIGHTS[field_name]
+                for token in tokenize(value):
+                    frequencies[token] = frequencies.get(token, 0.0) + weight
+                    length += weight
+
+            index.paragraph_ids.append(p.id)
+            index.doc_lengths.append(length)
+            for token, frequency in frequencies.items():
+                index.postings.setdefault(token, []).append((i, frequency))
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self.paragraph_ids)
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Find the paragraphs most relevant to a query.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+
+        Returns:
+            List[Tuple[int, float]]: Paragraph indices and BM25 scores, best first
+        """
+        if not self.paragraph_ids:
+            return []
+
+        count = len(self.paragraph_ids)
+        avg_length = sum(self.doc_lengths) / count or 1.0
+        scores: Dict[int, float] = {}
+
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[i] / avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def matches(self, document: Document) -> bool:
+        """Check whether the index was built from the given document's paragraphs and their content."""
+        return (self.paragraph_ids == [p.id for p in document.paragraphs]
+                and self.fingerprint == document_fingerprint(document))
+
+    def to_dict(self) -> Dict:
+        """Convert the index to a JSON-serializable dictionary."""
+        return {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "paragraph_ids": self.paragraph_ids,
+            "fingerprint": self.fingerprint,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InvertedIndex":
+        """
+        Create an index from a dictionary produced by ``to_dict``.
+
+        Raises:
+            ValueError: If the index was written by an unsupported version
+        """
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+
+        index = cls(k1=data["k1"], b=data["b"])
+        index.paragraph_ids = data["paragraph_ids"]
+        index.fingerprint = data["fingerprint"]
+        index.doc_lengths = data["doc_lengths"]
+        index.postings = {
+            term: [(i, frequency) for i, frequency in postings]
+            for term, postings in data["postings"].items()
+        }
+        return index
+
+    def save(self, path: str) -> None:
+        """Save the index as JSON, replacing any earlier file rather than writing into it."""
+        with atomic_write(path) as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        """Load an index saved with ``save``."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def document_fingerprint(document: Document) -> str:
+    """
+    Hash the indexed content of a document.
+
+    Paragraph ids only number the paragraphs, so the fingerprint covers
+    the text, gist and image tags of each paragraph instead.
+
+    Args:
+        document: The document
+
+    Returns:
+        str: Hex SHA-256 digest of the indexed fields of all paragraphs
+    """
+    digest = hashlib.sha256()
+    for p in document.paragraphs:
+        fields = [p.text, p.gist] + [s.image_tag for s in p.gist_sentences]
+        digest.update(json.dumps(fields).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def index_path_for(processed_path: str) -> str:
+    """
+    Get the path of the search index stored next to a processed document.
+
+    Args:
+        processed_path: Path to the processed document
+
+    Returns:
+        str: Path of the index file in the same directory
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(processed_path)), INDEX_FILENAME)
+
+
+def load_or_build_index(document: Document, processed_path: Optional[str] = None) -> InvertedIndex:
+    """
+    Load the saved index for a document, rebuilding and saving it when stale.
+
+    Args:
+        document: The processed document
+        processed_path: Optional path of the processed document on disk,
+            next to which the index is stored
+
+    Returns:
+        InvertedIndex: An index matching the document's paragraphs
+    """
+    index_path = index_path_for(processed_path) if processed_path else None
+
+    if index_path and os.path.exists(index_path):
+        try:
+            index = InvertedIndex.load(index_path)
+            if index.matches(document):
+                return index
+        except (ValueError, KeyError, OSError):
+            pass  # Rebuild unreadable or outdated indexes below
+
+    index = InvertedIndex.build(document)
+    if index_path:
+        index.save(index_path)
+    return index
+
+
+def focus_document(document: Document, index: InvertedIndex, query: str, top_k: int = 5) -> Document:
+    """
+    Create a document containing only the paragraphs most relevant to a query.
+
+    Selected paragraphs keep their original order so the transcript still
+    follows the structure of the source.
+
+    Args:
+        document: The processed document
+        index: Index built over the document
+        query: Free-text query
+        top_k: Maximum number of paragraphs to keep
+
+    Returns:
+        Document: A document with the selected paragraphs and the query in its metadata
+    """
+    selected = sorted(i for i, _ in index.search(query, top_k))
+    metadata = dict(document.metadata)
+    metadata['query'] = query
+    return Document(metadata=metadata, paragraphs=[document.paragraphs[i] for i in selected])
@@ -0,0 +1 @@
+"""Content-addressed storage for the files of processing runs."""
@@ -0,0 +1,438 @@
+"""
+Content-addressed store for the files of ``--auto-output`` runs.
+
+Reruns of the same document produce the same input copy and often the same
+processed documents and pages, so the store keeps every distinct content
+once, under ``output/.store/objects/`` and named after its SHA-256 digest.
+Run directories reference the store in two ways:
+
+* Files the run directory must offer in place, such as the processed
+  document read by the dashboard and the comparison page opened in a
+  browser, are hard links to an uncompressed blob. The blob is made
+  read-only so no run can change the content of another through a link.
+* The copy of the input file, which nothing reads in place, is only kept as
+  a gzip-compressed blob. ``restore`` writes it back into a run directory.
+
+Every run directory lists its stored files and their digests in
+``artifacts.json``. ``collect_garbage`` deletes the blobs no run lists any
+more, such as after run directories were deleted, except for recent blobs
+that a run still being written may be about to list.
+
+Usage:
+    python -m src.storage.artifact_store gc [--dry-run] [--output-root DIR]
+    python -m src.storage.artifact_store restore RUN_DIR
+    python -m src.storage.artifact_store migrate [--output-root DIR]
+    python -m src.storage.artifact_store stats [--output-root DIR]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from src.utils.file_utils import OUTPUT_ROOT
+
+# Directory of the store inside the output directory
+STORE_DIRNAME = ".store"
+
+# File listing the stored files of a run, in its run directory
+MANIFEST_FILENAME = "artifacts.json"
+
+MANIFEST_VERSION = 1
+
+# How files of a run are stored
+LINKED = "linked"
+COMPRESSED = "compressed"
+
+# Blobs younger than this are kept by garbage collection, in seconds
+GC_GRACE_SECONDS = 3600.0
+
+# Run files that differ between runs anyway and are left as they are
+_UNSTORED_FILENAMES = {MANIFEST_FILENAME, "run_info.json"}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        str: The hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _make_read_only(path: str) -> None:
+    """Remove the write permissions of a file."""
+    mode = os.stat(path).st_mode
+    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+class ArtifactStore:
+    """Blobs in a directory, named after the SHA-256 digest of their content."""
+
+    def __init__(self, output_root: str):
+        """
+        Initialize the store of an output directory.
+
+        Args:
+            output_root: The directory containing one subdirectory per run
+        """
+        self.output_root = output_root
+        self.root = os.path.join(output_root, STORE_DIRNAME)
+        self.objects = os.path.join(self.root, "objects")
+
+    def blob_path(self, digest: str, compressed: bool = False) -> str:
+        """
+        Get the path of a blob.
+
+        Args:
+            digest: SHA-256 digest of the content
+            compressed: Whether to get the gzip-compressed form
+
+        Returns:
+            str: Path of the blob, whether or not it exists
+        """
+        name = f"{digest}.gz" if compressed else digest
+        return os.path.join(self.objects, digest[:2], name)
+
+    def _temp_path(self, path: str) -> str:
+        """Get a unique temporary path next to a path, for atomic renames."""
+        return f"{path}.{uuid.uuid4().hex}.tmp"
+
+    def _touch(self, path: str) -> bool:
+        """
+        Refresh the mtime of an existing blob, so garbage collection keeps it.
+
+        Linked blobs are never touched, since that would change the mtime of
+        their links in other runs; collecting them early costs a run nothing
+        because its link keeps the content.
+        """
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def put_compressed(self, path: str) -> Tuple[str, int]:
+        """
+        Store a gzip-compressed copy of a file.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            Tuple[str, int]: The digest and size of the file's content
+        """
+        digest = file_digest(path)
+        blob = self.blob_path(digest, compressed=True)
+        if not self._touch(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            temp = self._temp_path(blob)
+            with open(path, 'rb') as source, gzip.open(temp, 'wb') as target:
+                shutil.copyfileobj(source, target, _CHUNK_SIZE)
+            _make_read_only(temp)
+            os.replace(temp, blob)
+        return digest, os.path.getsize(path)
+
+    def link(self, path: str) -> Tuple[str, int]:
+        """
+        Store a file and replace it with a hard link to its blob.
+
+        The first file with a given content becomes the blob itself, so
+        storing it copies nothing. If hard links are not possible, such as
+        across file systems, the file is left as it is.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            Tuple[str, int]: The digest and size of the file's content
+        """
+        digest = file_digest(path)
+        size = os.path.getsize(path)
+        blob = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            if os.path.exists(blob):
+                # Swap the file for a link to the existing blob in one rename
+                temp = self._temp_path(path)
+                os.link(blob, temp)
+                os.replace(temp, path)
+            else:
+                try:
+                    os.link(path, blob)
+                except FileExistsError:
+                    # Another run stored the same content in the meantime
+                    return self.link(path)
+                _make_read_only(blob)
+        except OSError:
+            pass  # Keep the plain file where hard links are not supported
+        return digest, size
+
+    def open_blob(self, digest: str) -> Any:
+        """
+        Open the content of a blob for reading, in either form.
+
+        Args:
+            digest: SHA-256 digest of the content
+
+        Returns:
+            A binary file object with the uncompressed content
+
+        Raises:
+            FileNotFoundError: If the store has no blob with this digest
+        """
+        if os.path.exists(self.blob_path(digest)):
+            return open(self.blob_path(digest), 'rb')
+        return gzip.open(self.blob_path(digest, compressed=True), 'rb')
+
+    def blobs(self) -> Iterator[Tuple[str, str]]:
+        """
+        List all blobs.
+
+        Yields:
+            Tuple[str, str]: The digest and the path of every blob, in
+            either form
+        """
+        if not os.path.isdir(self.objects):
+            return
+        for prefix in sorted(os.listdir(self.objects)):
+            directory = os.path.join(self.objects, prefix)
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".tmp"):
+                    yield name.split(".")[0], os.path.join(directory, name)
+
+    # Runs
+
+    def store_run(self, run_dir: str, input_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Move the files of a finished run into the store.
+
+        Every file in the run directory and its subdirectories is replaced
+        by a link to its blob, except the run information that differs
+        between runs anyway. The input file is stored compressed under its
+        file name without a copy in the run directory.
+
+        Args:
+            run_dir: The run's output directory
+            input_path: Optional input file of the run
+
+        Returns:
+            Dict[str, Any]: The manifest saved in the run directory
+        """
+        files: Dict[str, Dict[str, Any]] = {}
+        if input_path:
+            digest, size = self.put_compressed(input_path)
+            files[os.path.basename(input_path)] = {"digest": digest, "size": size, "stored": COMPRESSED}
+        for relative in _run_files(run_dir):
+            if relative in files:
+                continue  # A copy of the input file already stored compressed
+            digest, size = self.link(os.path.join(run_dir, relative))
+            files[relative] = {"digest": digest, "size": size, "stored": LINKED}
+
+        manifest = {"version": MANIFEST_VERSION, "files": files}
+        with open(os.path.join(run_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def migrate(self) -> int:
+        """
+        Move the files of runs without a manifest into the store.
+
+        This covers runs written before the store existed or with
+        ``--no-store``. A copy of the input file, found by the name recorded
+        in the run information, is stored compressed and removed.
+
+        Returns:
+            int: Number of runs migrated
+        """
+        migrated = 0
+        for run_dir in _run_dirs(self.output_root):
+            if os.path.exists(os.path.join(run_dir, MANIFEST_FILENAME)):
+                continue
+            input_copy = _input_copy(run_dir)
+            self.store_run(run_dir, input_copy)
+            if input_copy:
+                os.remove(input_copy)
+            migrated += 1
+        return migrated
+
+    def restore(self, run_dir: str) -> int:
+        """
+        Write the compressed files of a run back into its directory.
+
+        Args:
+            run_dir: The run's output directory
+
+        Returns:
+            int: Number of files written
+        """
+        restored = 0
+        for relative, entry in read_manifest(run_dir).items():
+            path = os.path.join(run_dir, relative)
+            if entry["stored"] != COMPRESSED or os.path.exists(path):
+                continue
+            with self.open_blob(entry["digest"]) as source, open(path, 'wb') as target:
+                shutil.copyfileobj(source, target, _CHUNK_SIZE)
+            restored += 1
+        return restored
+
+    def referenced(self) -> Set[str]:
+        """Get the digests listed by the manifests of all runs."""
+        digests = set()
+        for run_dir in _run_dirs(self.output_root):
+            digests.update(entry["digest"] for entry in read_manifest(run_dir).values())
+        return digests
+
+    def collect_garbage(self, grace_seconds: float = GC_GRACE_SECONDS,
+                        dry_run: bool = False) -> Dict[str, int]:
+        """
+        Delete the blobs that no run references.
+
+        Deleting a linked blob never affects a run directory that still
+        holds a link to it, because the content stays until its last link
+        is gone.
+
+        Args:
+            grace_seconds: Keep blobs stored or reused within this many
+                seconds, which runs still being written may reference
+            dry_run: Only count what would be deleted
+
+        Returns:
+            Dict[str, int]: Numbers of kept and deleted blobs, and bytes freed
+        """
+        referenced = self.referenced()
+        cutoff = time.time() - grace_seconds
+        result = {"kept": 0, "deleted": 0, "freed_bytes": 0}
+        for digest, path in list(self.blobs()):
+            info = os.stat(path)
+            if digest in referenced or info.st_mtime > cutoff:
+                result["kept"] += 1
+                continue
+            result["deleted"] += 1
+            # Linked blobs only free their space with their last link
+            if info.st_nlink <= 1:
+                result["freed_bytes"] += info.st_size
+            if not dry_run:
+                os.remove(path)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Measure how much space the store saves.
+
+        Returns:
+            Dict[str, int]: Numbers of runs and blobs, the bytes the runs'
+            stored files would take as plain copies, and the bytes the
+            blobs take
+        """
+        logical = 0
+        runs = 0
+        for run_dir in _run_dirs(self.output_root):
+            files = read_manifest(run_dir)
+            if files:
+                runs += 1
+                logical += sum(entry["size"] for entry in files.values())
+        blobs = list(self.blobs())
+        stored = sum(os.path.getsize(path) for _, path in blobs)
+        return {"runs": runs, "blobs": len(blobs), "logical_bytes": logical, "stored_bytes": stored}
+
+
+def read_manifest(run_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the stored files of a run.
+
+    Args:
+        run_dir: The run's output directory
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Digest, size and storage of every stored
+        file by its path relative to the run directory, empty if the run
+        has no readable manifest
+    """
+    try:
+        with open(os.path.join(run_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _run_dirs(output_root: str) -> Iterable[str]:
+    """List the run directories of an output directory."""
+    if not os.path.isdir(output_root):
+        return []
+    with os.scandir(output_root) as it:
+        return sorted(entry.path for entry in it if entry.is_dir() and not entry.name.startswith("."))
+
+
+def _input_copy(run_dir: str) -> Optional[str]:
+    """Find the copy of the input file in a run directory, from its run information."""
+    try:
+        with open(os.path.join(run_dir, "run_info.json"), 'r', encoding='utf-8') as f:
+            input_path = json.load(f).get("input")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not input_path:
+        return None
+    path = os.path.join(run_dir, os.path.basename(input_path))
+    return path if os.path.isfile(path) else None
+
+
+def _run_files(run_dir: str) -> Iterator[str]:
+    """List the files of a run directory to store, relative to it."""
+    for directory, _, filenames in os.walk(run_dir):
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            relative = os.path.relpath(path, run_dir)
+            if relative not in _UNSTORED_FILENAMES and not os.path.islink(path):
+                yield relative
+
+
+def main():
+    """Collect garbage, restore a run or show the space saved."""
+    parser = argparse.ArgumentParser(description="Manage the content-addressed store of run outputs")
+    parser.add_argument("--output-root", default=OUTPUT_ROOT, help="The output directory with the runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gc = commands.add_parser("gc", help="Delete blobs no run references")
+    gc.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+    gc.add_argument("--grace", type=float, default=GC_GRACE_SECONDS, metavar="SECONDS",
+                    help="Keep blobs stored or reused within this many seconds")
+    restore = commands.add_parser("restore", help="Write the compressed files of a run back into it")
+    restore.add_argument("run_dir", help="The run's output directory")
+    commands.add_parser("migrate", help="Move the files of runs without a manifest into the store")
+    commands.add_parser("stats", help="Show how much space the store saves")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.output_root)
+    if args.command == "gc":
+        result = store.collect_garbage(args.grace, args.dry_run)
+        verb = "Would delete" if args.dry_run else "Deleted"
+        print(f"{verb} {result['deleted']} blobs ({result['freed_bytes'] / 2**20:.1f} MB), "
+              f"kept {result['kept']}")
+    elif args.command == "restore":
+        store = ArtifactStore(os.path.dirname(os.path.abspath(args.run_dir)))
+        print(f"Restored {store.restore(args.run_dir)} files in {args.run_dir}")
+    elif args.command == "migrate":
+        print(f"Migrated {store.migrate()} runs into {store.root}")
+    else:
+        result = store.stats()
+        print(f"{result['runs']} runs, {result['blobs']} blobs: "
+              f"{result['logical_bytes'] / 2**20:.1f} MB stored in {result['stored_bytes'] / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Alignment of summary sentences with the source paragraphs supporting them.
+
+Each paragraph's text and gist are reduced to a set of word and word-pair
+shingles and stored in an inverted index. A summary sentence is scored only
+against the paragraphs that share at least one of its shingles, by the
+IDF-weighted share of the sentence's shingles each paragraph contains, so
+alignment cost grows with the number of matching postings rather than with
+sentences times paragraphs.
+"""
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set
+
+from src.models.document import Document
+from src.synthesizers.extractive import STOPWORDS
+from src.utils.text_utils import split_into_sentences, tokenize
+from src.utils.tracing import span
+
+# Transcript bullet prefixes that are not part of a summary sentence
+_BULLET_PATTERN = re.compile(r'^(?:[*-]\s+)?(?:✓\s+|🔄 Counterpoint:\s+)?')
+
+# Underlines of "Section Name\n---" style headings
+_UNDERLINE_PATTERN = re.compile(r'^[-=]+$')
+
+# Shingles found in more than this share of paragraphs of a long document are
+# skipped; they carry little evidence and would make every sentence touch
+# every paragraph
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_POSTINGS_LIMIT = 20
+
+
+@dataclass
+class SentenceAlignment:
+    """A summary sentence and the source paragraphs that best support it."""
+    sentence: str
+    paragraph_ids: List[str] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the alignment to a JSON-serializable dictionary."""
+        return {
+            "sentence": self.sentence,
+            "paragraph_ids": self.paragraph_ids,
+            "scores": self.scores,
+        }
+
+
+def _shingles(text: str) -> Set[str]:
+    """
+    Build the shingle set of a text: its content words and adjacent content word pairs.
+
+    Args:
+        text: The text to shingle
+
+    Returns:
+        Set[str]: Unigram and bigram shingles
+    """
+    words = [word for word in tokenize(text) if word not in STOPWORDS]
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return shingles
+
+
+def summary_sentences(summary: str) -> List[str]:
+    """
+    Extract the sentences of a summary, skipping headings and bullet markers.
+
+    Args:
+        summary: The synthesized summary
+
+    Returns:
+        List[str]: Summary sentences in order
+    """
+    lines = summary.split("\n")
+    sentences = []
+    for i, line in enumerate(lines):
+        line = line.strip()
+        next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
+        if not line or line.startswith("#") or _UNDERLINE_PATTERN.match(line):
+            continue
+        if _UNDERLINE_PATTERN.match(next_line):
+            continue  # Heading text above an underline
+        sentences.extend(split_into_sentences(_BULLET_PATTERN.sub("", line)))
+    return sentences
+
+
+class AlignmentIndex:
+    """Inverted shingle index over the paragraphs of a document."""
+
+    def __init__(self, document: Document):
+        """
+        Build the index.
+
+        Args:
+            document: The document whose paragraphs support the summary
+        """
+        self.paragraph_ids = [p.id for p in document.paragraphs]
+        self.postings: Dict[str, List[int]] = {}
+
+        for i, p in enumerate(document.paragraphs):
+            for shingle in _shingles(f"{p.text}\n{p.gist or ''}"):
+                self.postings.setdefault(shingle, []).append(i)
+
+        count = len(self.paragraph_ids)
+        self.idf = {
+            shingle: math.log(1 + count / len(paragraphs))
+            for shingle, paragraphs in self.postings.items()
+        }
+        self._max_postings = max(MIN_POSTINGS_LIMIT, int(count * MAX_DOCUMENT_FREQUENCY))
+
+    def align(self, sentence: str, top_k: int = 2, min_score: float = 0.2) -> SentenceAlignment:
+        """
+        Find the paragraphs that best support a sentence.
+
+        Args:
+            sentence: The summary sentence
+            top_k: Maximum number of supporting paragraphs
+            min_score: Minimum weighted share of the sentence's shingles a
+                paragraph must contain
+
+        Returns:
+            SentenceAlignment: Supporting paragraph ids and scores, best first
+        """
+        shingles = _shingles(sentence)
+        # Shingles absent from the document still count against every paragraph
+        total = sum(self.idf.get(s, math.log(1 + len(self.paragraph_ids))) for s in shingles)
+        if not total:
+            return SentenceAlignment(sentence)
+
+        scores: Dict[int, float] = {}
+        for shingle in shingles:
+            paragraphs = self.postings.get(shingle)
+            if not paragraphs or len(paragraphs) > self._max_postings:
+                continue
+            weight = self.idf[shingle] / total
+            for i in paragraphs:
+                scores[i] = scores.get(i, 0.0) + weight
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        best = [(i, score) for i, score in best if score >= min_score]
+        return SentenceAlignment(
+            sentence=sentence,
+            paragraph_ids=[self.paragraph_ids[i] for i, _ in best],
+            scores=[round(score, 3) for _, score in best]
+        )
+
+
+def align_summary(document: Document,
+                  summary: str,
+                  top_k: int = 2,
+                  min_score: float = 0.2) -> List[SentenceAlignment]:
+    """
+    Map every summary sentence to its best-supporting source paragraphs.
+
+    Args:
+        document: The source document
+        summary: The synthesized summary
+        top_k: Maximum number of supporting paragraphs per sentence
+        min_score: Minimum support score for a paragraph to be listed
+
+    Returns:
+        List[SentenceAlignment]: One alignment per summary sentence, in order;
+        sentences without sufficient support have no paragraph ids
+    """
+    with span("align_summary", paragraphs=len(document.paragraphs)):
+        index = AlignmentIndex(document)
+        return [index.align(sentence, top_k, min_score) for sentence in summary_sentences(summary)]
@@ -4,12 +4,18 @@ Basic synthesis module for generating readable summaries from document structure
 This module creates a programmatic summary from a processed document and then
 refines it with AI to improve readability and cohesion.
 """
-from typing import List
+from typing import Optional, Sequence
 
-from src.models.document import Document, Paragraph
+from src.models.document import Document
+from src.processors.routing import FIXED, ModelRouter
+from src.synthesizers.transcript import TranscriptBuilder, TranscriptSection
+from src.utils.metrics import REFINE, record_tokens, track_llm_call
+from src.utils.tracing import span
 
 
-def generate_transcript(document: Document) -> str:
+def generate_transcript(document: Document,
+                        sections: Optional[Sequence[TranscriptSection]] = None,
+                        exclusive: bool = False) -> str:
     """
     Generate a programmatic transcript from the document structure.
     
@@ -18,90 +24,22 @@ def generate_transcript(document: Document) -> str:
     
     Args:
         document: The processed document with gists and tags
+        sections: Optional section templates, defaults to the standard
+            thesis, key points, evidence and conclusion layout
+        exclusive: Whether each paragraph may appear in only one section
         
     Returns:
         str: A structured transcript of the document
     """
-    if not document.paragraphs:
-        return "No content to summarize."
-    
-    transcript_parts = []
-    
-    # Add document title/metadata
-    title = document.metadata.get('title', 'Untitled Document')
-    transcript_parts.append(f"# {title}\n")
-    
-    # Find thesis (abstract/introduction) paragraphs
-    thesis_paragraphs = []
-    for p in document.paragraphs:
-        # Skip very short paragraphs and titles
-        if len(p.text.split()) < 5:
-            continue
-            
-        # Check for thesis paragraphs (by tag or keywords)
-        if (p.structural_tag.name == "THESIS" or
-            "abstract" in p.text.lower() or
-            "introduction" in p.text.lower()):
-            thesis_paragraphs.append(p)
-    
-    # If we found thesis paragraphs, add them
-    if thesis_paragraphs:
-        transcript_parts.append("## Main Thesis")
-        for p in thesis_paragraphs[:2]:  # Limit to first two thesis paragraphs
-            transcript_parts.append(p.gist)
-        transcript_parts.append("")
-    
-    # Add main points
-    main_points = []
-    for p in document.paragraphs:
-        # Skip very short paragraphs and already used thesis paragraphs
-        if len(p.text.split()) < 5 or p in thesis_paragraphs:
-            continue
-            
-        # Check for point paragraphs
-        if p.structural_tag.name == "POINT" and p.argument_role.name != "UNKNOWN":
-            main_points.append(p)
-    
-    if main_points:
-        transcript_parts.append("## Key Points")
-        for i, p in enumerate(main_points, 1):
-            if p.argument_role.name == "COUNTERPOINT":
-                transcript_parts.append(f"* 🔄 Counterpoint: {p.gist}")
-            elif p.argument_role.name == "SUPPORTING":
-                transcript_parts.append(f"* ✓ {p.gist}")
-            else:
-                transcript_parts.append(f"* {p.gist}")
-        transcript_parts.append("")
-    
-    # Add examples and evidence
-    examples = []
-    for p in document.paragraphs:
-        if p.structural_tag.name == "EXAMPLE" or "example" in p.text.lower():
-            examples.append(p)
-    
-    if examples:
-        transcript_parts.append("## Supporting Evidence")
-        for p in examples:
-            transcript_parts.append(f"* {p.gist}")
-        transcript_parts.append("")
-    
-    # Add conclusion
-    conclusions = []
-    for p in document.paragraphs:
-        if (p.structural_tag.name == "CONCLUSION" or 
-            "conclusion" in p.text.lower() or
-            "in summary" in p.text.lower()):
-            conclusions.append(p)
-    
-    if conclusions:
-        transcript_parts.append("## Conclusion")
-        for p in conclusions:
-            transcript_parts.append(p.gist)
-    
-    return "\n".join(transcript_parts)
+    with span("generate_transcript", paragraphs=len(document.paragraphs)):
+        return TranscriptBuilder(sections, exclusive=exclusive).build(document)
 
 
-def refine_transcript(transcript: str, api_client=None) -> str:
+def refine_transcript(transcript: str,
+                      api_client=None,
+                      focus: Optional[str] = None,
+                      max_tokens: int = 1000,
+                      router: Optional[ModelRouter] = None) -> str:
     """
     Refine the transcript using AI to improve readability.
     
@@ -110,6 +48,9 @@ def refine_transcript(transcript: str, api_client=None) -> str:
     Args:
         transcript: The programmatically generated transcript
         api_client: An optional OpenAI client for refinement
+        focus: Optional query the summary should concentrate on
+        max_tokens: Maximum number of tokens in the refined summary
+        router: Optional router picking the model, defaults to the standard model
         
     Returns:
         str: A more readable and cohesive summary
@@ -117,6 +58,11 @@ def refine_transcript(transcript: str, api_client=None) -> str:
     if not api_client:
         return transcript
     
+    # Ask for a query-focused summary when the transcript was selected by a query
+    focus_instruction = ""
+    if focus:
+        focus_instruction = f"Focus the summary on what the document says about: {focus}"
+    
     try:
         # Create a prompt for coherent summary
         prompt = f"""
@@ -133,17 +79,22 @@ def refine_transcript(transcript: str, api_client=None) -> str:
         organization, just make it more readable.
         
         Keep your summary concise but complete.
+        {focus_instruction}
         """
         
-        response = api_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert at creating coherent summaries while preserving key information."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
+        route = (router or ModelRouter(FIXED)).route_refinement(transcript, max_tokens)
+        with span("refine_transcript", max_tokens=max_tokens, model=route.model), \
+                track_llm_call(REFINE, route.tier):
+            response = api_client.chat.completions.create(
+                model=route.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert at creating coherent summaries while preserving key information."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=route.max_tokens,
+                temperature=0.7
+            )
+        record_tokens(REFINE, response)
         
         refined_summary = response.choices[0].message.content.strip()
         return refined_summary
@@ -0,0 +1,162 @@
+"""
+Token-budgeted transcript packing for refinement.
+
+The transcript sent to ``refine_transcript`` grows with the document. This
+module fits it to a prompt budget by cutting the least important gists
+first: examples before points, points before the thesis and conclusion.
+Multi-sentence gists are first compressed to their first sentence; if that
+is not enough, items are dropped. Every cut is recorded so the output can
+show what the summary was not based on.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.models.document import ArgumentRole, Document
+from src.synthesizers.transcript import TranscriptBuilder
+from src.utils.text_utils import estimate_tokens, split_into_sentences
+
+# Structural importance per tag; lower values are cut last
+TAG_PRIORITY = {
+    "THESIS": 0,
+    "CONCLUSION": 0,
+    "POINT": 1,
+    "EXAMPLE": 2,
+    "UNKNOWN": 3,
+}
+
+
+@dataclass
+class _BudgetItem:
+    """A transcript line candidate with the gist currently used for it."""
+    section: str
+    paragraph_id: str
+    structural_tag: str
+    argument_role: ArgumentRole
+    gist: Optional[str]
+    order: int
+
+
+@dataclass
+class BudgetResult:
+    """A transcript fitted to a token budget with a record of all cuts."""
+    transcript: str
+    budget_tokens: int
+    transcript_tokens: int
+    cuts: List[Dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result summary to a JSON-serializable dictionary."""
+        return {
+            "budget_tokens": self.budget_tokens,
+            "transcript_tokens": self.transcript_tokens,
+            "cuts": self.cuts,
+        }
+
+
+def _compress(gist: str) -> Optional[str]:
+    """
+    Shorten a gist to its first sentence.
+
+    Args:
+        gist: The gist text
+
+    Returns:
+        Optional[str]: The first sentence, or None if the gist is a single sentence
+    """
+    sentences = split_into_sentences(gist)
+    return sentences[0] if len(sentences) > 1 else None
+
+
+def pack_transcript(document: Document,
+                    budget_tokens: int,
+                    builder: Optional[TranscriptBuilder] = None) -> BudgetResult:
+    """
+    Build a transcript that fits within a token budget.
+
+    Items are cut in order of increasing structural importance and, within
+    the same importance, from the end of the document backwards.
+
+    Args:
+        document: The processed document with gists and tags
+        budget_tokens: Maximum number of transcript tokens
+        builder: Optional transcript builder, defaults to the standard layout
+
+    Returns:
+        BudgetResult: The packed transcript, its size and the recorded cuts
+    """
+    builder = builder or TranscriptBuilder()
+    if not document.paragraphs:
+        transcript = "No content to summarize."
+        return BudgetResult(transcript, budget_tokens, estimate_tokens(transcript))
+
+    title = document.metadata.get('title', 'Untitled Document')
+    members = builder.classify(document.paragraphs)
+
+    # Only the items that would actually be rendered are candidates
+    items: Dict[str, List[_BudgetItem]] = {}
+    order = 0
+    for key in builder.order:
+        section = builder.section(key)
+        items[key] = []
+        for p in members.get(key, [])[:section.limit]:
+            items[key].append(_BudgetItem(
+                section=key,
+                paragraph_id=p.id,
+                structural_tag=p.structural_tag.name,
+                argument_role=p.argument_role,
+                gist=p.gist,
+                order=order
+            ))
+            order += 1
+
+    def render() -> str:
+        return builder.render(title, {key: [i for i in section_items if i.gist is not None]
+                                      for key, section_items in items.items()})
+
+    transcript = render()
+    total_chars = len(transcript)
+    cuts: List[Dict[str, str]] = []
+
+    # Cheapest losses first: lowest importance, latest in the document
+    tiers: Dict[int, List[_BudgetItem]] = {}
+    for section_items in items.values():
+        for item in section_items:
+            tiers.setdefault(TAG_PRIORITY.get(item.structural_tag, 3), []).append(item)
+    budget_chars = budget_tokens * 4
+
+    # Within each tier, first compress multi-sentence gists, then drop whole items
+    for priority in sorted(tiers, reverse=True):
+        tier = sorted(tiers[priority], key=lambda item: -item.order)
+        for action in ("compressed", "dropped"):
+            for item in tier:
+                if total_chars <= budget_chars:
+                    break
+                if item.gist is None:
+                    continue
+
+                section = builder.section(item.section)
+                old_length = len(builder.format_item(section, item))
+                if action == "compressed":
+                    shorter = _compress(item.gist)
+                    if shorter is None:
+                        continue
+                    item.gist = shorter
+                    total_chars -= old_length - len(builder.format_item(section, item))
+                else:
+                    item.gist = None
+                    total_chars -= old_length + 1
+
+                cuts.append({
+                    "paragraph_id": item.paragraph_id,
+                    "section": item.section,
+                    "structural_tag": item.structural_tag,
+                    "action": action,
+                })
+
+    transcript = render()
+    return BudgetResult(
+        transcript=transcript,
+        budget_tokens=budget_tokens,
+        transcript_tokens=estimate_tokens(transcript),
+        cuts=cuts
+    )
@@ -2,157 +2,45 @@
 Comparison module for creating side-by-side views of original text and summaries.
 
 This module provides functionality to generate HTML comparisons that make it
-easy to review how the summary relates to the original text.
+easy to review how the summary relates to the original text. Pages are
+written section by section straight to a file handle, with the JSON view
+encoded one paragraph at a time, so rendering large documents needs
+memory proportional to a single section rather than the whole page.
+
+For long documents a lazy page can be written instead, which keeps the
+original sections and the JSON data in a sidecar directory and loads them
+only when they scroll into view or the JSON view is opened.
 """
+import glob
+import io
+import json
+import math
 import os
 import re
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TextIO
 import html
 
 from src.models.document import Document
+from src.models.serialization import iter_output_json
+from src.synthesizers.stylesheet import compile_stylesheet
+from src.utils.file_utils import atomic_write
+from src.utils.tracing import span
 
+# Pattern for section headers like "## Section Name" or "Section Name\n--"
+_SECTION_PATTERN = re.compile(r'(?:^|\n)(?:#{1,6}\s+([^\n]+)|([^\n]+)\n[-=]+)')
 
-def _split_into_sections(text: str) -> List[Tuple[str, str]]:
-    """
-    Split text into sections based on headers.
-    
-    Args:
-        text: The text to split
-        
-    Returns:
-        List[Tuple[str, str]]: List of (section_title, section_content) tuples
-    """
-    # Look for patterns like "## Section Name" or "Section Name\n--"
-    section_pattern = r'(?:^|\n)(?:#{1,6}\s+([^\n]+)|([^\n]+)\n[-=]+)'
-
-    # Find all section headers
-    matches = list(re.finditer(section_pattern, text))
-    sections = []
-
-    # Process each section
-    for i, match in enumerate(matches):
-        # Get the section title (from either capture group)
-        title = match.group(1) if match.group(1) else match.group(2)
-
-        # Get the start of the section content
-        start = match.end()
-
-        # Get the end of the section (start of next section or end of text)
-        end = matches[i + 1].start() if i < len(matches) - 1 else len(text)
-
-        # Get the section content
-        content = text[start:end].strip()
-
-        sections.append((title, content))
-
-    # If no sections found or first section doesn't start at beginning,
-    # add an "Introduction" section for the initial content
-    if not sections or matches[0].start() > 0:
-        intro_content = text[:matches[0].start()].strip(
-        ) if matches else text.strip()
-        if intro_content:
-            sections.insert(0, ("Introduction", intro_content))
-
-    return sections
-
-
-def create_comparison_html(document: Document, synthesis: str) -> str:
-    """
-    Create an HTML comparison between the original document and the synthesis.
-    
-    Args:
-        document: The processed document
-        synthesis: The synthesized summary
-        
-    Returns:
-        str: HTML content with side-by-side comparison
-    """
-    # Get the original text
-    original_text = "\n\n".join(p.text for p in document.paragraphs)
-
-    # Split both texts into sections
-    original_sections = _split_into_sections(original_text)
-    synthesis_sections = _split_into_sections(synthesis)
-
-    # Prepare JSON for debugging view
-    import json
-    doc_dict = {
-        "metadata":
-        document.metadata,
-        "paragraphs": [{
-            "id":
-            p.id,
-            "text":
-            p.text,
-            "structural_tag":
-            p.structural_tag.name,
-            "argument_role":
-            p.argument_role.name,
-            "gist":
-            p.gist,
-            "word_count":
-            len(p.text.split()),
-            "gist_sentences": [{
-                "text": s.text,
-                "image_tag": s.image_tag
-            }
-                               for s in p.gist_sentences] if hasattr(
-                                   p, 'gist_sentences') else []
-        } for p in document.paragraphs],
-        "synthesis":
-        synthesis
-    }
-    json_data = json.dumps(doc_dict, indent=2)
-
-    # Calculate statistics
-    original_words = len(original_text.split())
-    synthesis_words = len(synthesis.split())
-    reduction_pct = round((1 - synthesis_words / original_words) *
-                          100, 1) if original_words > 0 else 0
-
-    # Start building HTML with Tailwind CSS
-    html_parts = [
-        """
+# Page header up to the start of the original document column
+_PAGE_HEAD = Template('''
     <!DOCTYPE html>
     <html lang="en" class="dark">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Document Comparison</title>
-        <script src="https://cdn.tailwindcss.com"></script>
-        <script>
-            tailwind.config = {
-                darkMode: 'class',
-                theme: {
-                    extend: {
-                        colors: {
-                            primary: '#3b82f6',
-                            secondary: '#10b981',
-                            dark: {
-                                100: '#374151',
-                                200: '#1f2937',
-                                300: '#111827',
-                            }
-                        }
-                    }
-                }
-            }
-        </script>
-        <style type="text/tailwind">
-            @layer components {
-                .btn {
-                    @apply px-4 py-2 rounded font-medium focus:outline-none focus:ring-2 focus:ring-opacity-50 transition-colors;
-                }
-                .btn-primary {
-                    @apply bg-primary text-white hover:bg-blue-600 focus:ring-blue-500;
-                }
-                .btn-secondary {
-                    @apply bg-gray-700 text-white hover:bg-gray-800 focus:ring-gray-600;
-                }
-                pre.json {
-                    @apply p-4 rounded-lg bg-gray-800 text-gray-100 overflow-x-auto text-sm;
-                }
-            }
+        <style>
+$stylesheet
         </style>
         <script>
             function toggleView() {
@@ -170,7 +58,34 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
                     toggleBtn.textContent = 'View Comparison';
                 }
             }
-        </script>
+
+            function highlightSources(link) {
+                document.querySelectorAll('[data-paragraph].$highlight_class').forEach(function (element) {
+                    element.classList.remove('$highlight_class');
+                });
+                var first = null;
+                var missing = [];
+                link.dataset.sources.split(' ').forEach(function (id) {
+                    var elements = document.querySelectorAll('[data-paragraph="' + id + '"]');
+                    elements.forEach(function (element) {
+                        element.classList.add('$highlight_class');
+                        first = first || element;
+                    });
+                    if (!elements.length) {
+                        missing.push(id);
+                    }
+                });
+                if (first) {
+                    first.scrollIntoView({ block: 'center' });
+                }
+                // Paragraphs of lazy pages may not be loaded yet
+                window.pendingHighlight = missing.length ? link : null;
+                if (missing.length && window.revealParagraph) {
+                    window.revealParagraph(missing[0]);
+                }
+                return false;
+            }
+        </script>$head_scripts
     </head>
     <body class="bg-gray-900 text-gray-100 min-h-screen flex flex-col">
         <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-10 flex-grow">
@@ -186,31 +101,25 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
                 <div class="grid grid-cols-1 md:grid-cols-2 gap-4 mb-4">
                     <div>
                         <h2 class="text-xl font-semibold text-white mb-2">Document Info</h2>
-                        <p class="text-gray-300"><span class="font-medium text-gray-200">Title:</span> """
-        + html.escape(document.metadata.get('title', 'Untitled')) + """</p>
-                        <p class="text-gray-300"><span class="font-medium text-gray-200">Source:</span> """
-        + html.escape(document.metadata.get('source_path', 'Unknown')) +
-        """</p>
+                        <p class="text-gray-300"><span class="font-medium text-gray-200">Title:</span> $title</p>
+                        <p class="text-gray-300"><span class="font-medium text-gray-200">Source:</span> $source</p>
                     </div>
                     <div>
                         <h2 class="text-xl font-semibold text-white mb-2">Statistics</h2>
                         <div class="grid grid-cols-3 gap-2">
                             <div class="bg-gray-700 rounded p-3">
                                 <p class="text-sm text-gray-300">Original</p>
-                                <p class="text-xl font-bold text-white">""" +
-        str(original_words) + """</p>
+                                <p class="text-xl font-bold text-white">$original_words</p>
                                 <p class="text-xs text-gray-400">words</p>
                             </div>
                             <div class="bg-gray-700 rounded p-3">
                                 <p class="text-sm text-gray-300">Summary</p>
-                                <p class="text-xl font-bold text-white">""" +
-        str(synthesis_words) + """</p>
+                                <p class="text-xl font-bold text-white">$synthesis_words</p>
                                 <p class="text-xs text-gray-400">words</p>
                             </div>
                             <div class="bg-indigo-800 rounded p-3">
                                 <p class="text-sm text-gray-300">Reduction</p>
-                                <p class="text-xl font-bold text-white">""" +
-        str(reduction_pct) + """%</p>
+                                <p class="text-xl font-bold text-white">$reduction_pct%</p>
                                 <p class="text-xs text-gray-400">saved</p>
                             </div>
                         </div>
@@ -226,22 +135,10 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
                         <h2 class="text-xl font-bold text-white">Original Document</h2>
                     </div>
                     <div class="p-5 overflow-y-auto" style="max-height: 70vh;">
-    """
-    ]
+    ''')
 
-    # Add original sections
-    for title, content in original_sections:
-        html_parts.append(f'<div class="mb-8 pb-6 border-b border-gray-700">')
-        html_parts.append(
-            f'<h3 class="text-lg font-semibold text-blue-400 mb-3">{html.escape(title)}</h3>'
-        )
-        html_parts.append(
-            f'<div class="text-gray-300 whitespace-pre-line">{html.escape(content)}</div>'
-        )
-        html_parts.append(f'</div>')
-
-    # Add divider and start synthesis column
-    html_parts.append("""
+# Closes the original column and opens the synthesis column
+_SYNTHESIS_COLUMN_START = '''
                     </div>
                 </div>
                 
@@ -251,21 +148,10 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
                         <h2 class="text-xl font-bold text-white">Synthesized Summary</h2>
                     </div>
                     <div class="p-5 overflow-y-auto" style="max-height: 70vh;">
-    """)
+    '''
 
-    # Add synthesis sections
-    for title, content in synthesis_sections:
-        html_parts.append(f'<div class="mb-8 pb-6 border-b border-gray-700">')
-        html_parts.append(
-            f'<h3 class="text-lg font-semibold text-green-400 mb-3">{html.escape(title)}</h3>'
-        )
-        html_parts.append(
-            f'<div class="text-gray-300 whitespace-pre-line">{html.escape(content)}</div>'
-        )
-        html_parts.append(f'</div>')
-
-    # Add JSON view (hidden by default)
-    html_parts.append("""
+# Closes the comparison view and opens the JSON view
+_JSON_VIEW_START = '''
                     </div>
                 </div>
             </div>
@@ -277,8 +163,103 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
                         <h2 class="text-xl font-bold text-white">JSON Data</h2>
                     </div>
                     <div class="p-5 overflow-y-auto" style="max-height: 80vh;">
-                        <pre class="json">""" + html.escape(json_data) +
-                      """</pre>
+                        <pre class="json">'''
+
+# Markup classes of the sections in both columns
+_SECTION_CLASS = "mb-8 pb-6 border-b border-gray-700"
+_SECTION_CONTENT_CLASS = "text-gray-300 whitespace-pre-line"
+_ORIGINAL_TITLE_COLOR = "text-blue-400"
+_SYNTHESIS_TITLE_COLOR = "text-green-400"
+
+# Summary sentences linked to their sources, and the highlight of those sources
+_ALIGNED_CLASS = "underline decoration-dotted hover:text-white"
+_HIGHLIGHT_CLASS = "bg-indigo-800"
+
+# Number of original sections stored per sidecar chunk of a lazy page
+SECTIONS_PER_CHUNK = 20
+
+# Loads sidecar chunks as they approach the viewport and the JSON data on demand.
+# Sidecar files are scripts calling back into the page so that the page also
+# works from file:// URLs, where browsers block fetching local files.
+_LAZY_SCRIPT = Template('''
+        <script>
+            (function () {
+                var dataDir = $data_dir;
+                var showView = toggleView;
+                var jsonRequested = false;
+
+                function loadScript(name) {
+                    var script = document.createElement('script');
+                    script.src = dataDir + '/' + name;
+                    document.head.appendChild(script);
+                }
+
+                window.loadComparisonChunk = function (name, sections) {
+                    var placeholder = document.querySelector('[data-chunk="' + name + '"]');
+                    sections.forEach(function (section) {
+                        var container = document.createElement('div');
+                        container.className = 'mb-8 pb-6 border-b border-gray-700';
+                        var heading = document.createElement('h3');
+                        heading.className = 'text-lg font-semibold text-blue-400 mb-3';
+                        heading.textContent = section[0];
+                        var content = document.createElement('div');
+                        content.className = 'text-gray-300 whitespace-pre-line';
+                        section[1].forEach(function (piece) {
+                            var span = document.createElement('span');
+                            span.dataset.paragraph = piece[0];
+                            if (piece[2]) {
+                                span.id = 'src-' + piece[0];
+                            }
+                            span.textContent = piece[1];
+                            content.appendChild(span);
+                        });
+                        container.appendChild(heading);
+                        container.appendChild(content);
+                        placeholder.appendChild(container);
+                    });
+                    placeholder.style.minHeight = '';
+                    if (window.pendingHighlight) {
+                        highlightSources(window.pendingHighlight);
+                    }
+                };
+
+                window.revealParagraph = function (id) {
+                    var placeholder = document.querySelector('[data-paragraph-ids~="' + id + '"]');
+                    if (placeholder) {
+                        placeholder.scrollIntoView({ block: 'center' });
+                    }
+                };
+
+                window.loadComparisonDocument = function (data) {
+                    document.getElementById('json-data').textContent = JSON.stringify(data, null, 2);
+                };
+
+                window.toggleView = function () {
+                    if (!jsonRequested) {
+                        jsonRequested = true;
+                        loadScript('document.js');
+                    }
+                    showView();
+                };
+
+                document.addEventListener('DOMContentLoaded', function () {
+                    var observer = new IntersectionObserver(function (entries) {
+                        entries.forEach(function (entry) {
+                            if (entry.isIntersecting) {
+                                observer.unobserve(entry.target);
+                                loadScript(entry.target.dataset.chunk);
+                            }
+                        });
+                    }, { rootMargin: '400px' });
+                    document.querySelectorAll('[data-chunk]').forEach(function (placeholder) {
+                        observer.observe(placeholder);
+                    });
+                });
+            })();
+        </script>''')
+
+# Closes the JSON view and the page
+_PAGE_TAIL = '''</pre>
                     </div>
                 </div>
             </div>
@@ -293,26 +274,480 @@ def create_comparison_html(document: Document, synthesis: str) -> str:
         </footer>
     </body>
     </html>
-    """)
+    '''
+
+
+def _split_into_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split text into sections based on headers.
+    
+    Args:
+        text: The text to split
+        
+    Returns:
+        List[Tuple[str, str]]: List of (section_title, section_content) tuples
+    """
+    # Find all section headers
+    matches = list(_SECTION_PATTERN.finditer(text))
+    sections = []
+
+    # Process each section
+    for i, match in enumerate(matches):
+        # Get the section title (from either capture group)
+        title = match.group(1) if match.group(1) else match.group(2)
+
+        # Get the start of the section content
+        start = match.end()
+
+        # Get the end of the section (start of next section or end of text)
+        end = matches[i + 1].start() if i < len(matches) - 1 else len(text)
+
+        # Get the section content
+        content = text[start:end].strip()
+
+        sections.append((title, content))
+
+    # If no sections found or first section doesn't start at beginning,
+    # add an "Introduction" section for the initial content
+    if not sections or matches[0].start() > 0:
+        intro_content = text[:matches[0].start()].strip(
+        ) if matches else text.strip()
+        if intro_content:
+            sections.insert(0, ("Introduction", intro_content))
+
+    return sections
+
+
+def _strip_pieces(pieces: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    """
+    Strip surrounding whitespace from section content split into pieces.
+
+    Args:
+        pieces: (paragraph_index, text) pieces of the section content
+
+    Returns:
+        List[Tuple[int, str]]: Non-empty pieces whose joined text is stripped,
+        with adjacent pieces of the same paragraph merged
+    """
+    merged: List[Tuple[int, str]] = []
+    for index, text in pieces:
+        if merged and merged[-1][0] == index:
+            merged[-1] = (index, merged[-1][1] + text)
+        elif text:
+            merged.append((index, text))
+    pieces = merged
+    while pieces and not pieces[0][1].strip():
+        pieces.pop(0)
+    while pieces and not pieces[-1][1].strip():
+        pieces.pop()
+    if pieces:
+        pieces[0] = (pieces[0][0], pieces[0][1].lstrip())
+        pieces[-1] = (pieces[-1][0], pieces[-1][1].rstrip())
+    return pieces
+
+
+def _iter_section_pieces(texts: Iterable[str]) -> Iterator[Tuple[str, List[Tuple[int, str]]]]:
+    """
+    Split paragraphs into sections without joining them into one string.
+
+    Produces the same sections as ``_split_into_sections`` applied to the
+    paragraphs joined by blank lines, but only buffers one section at a time.
+    Section content is returned in pieces labelled with the index of the
+    paragraph each piece comes from.
+
+    Args:
+        texts: Paragraph texts in document order
+
+    Returns:
+        Iterator[Tuple[str, List[Tuple[int, str]]]]: (section_title, content_pieces) tuples
+    """
+    title = None
+    content_parts: List[Tuple[int, str]] = []
+    # Last line of the previous paragraph, which may start a header that
+    # spans the paragraph break (a bare "#" line followed by a blank line)
+    carry = ""
+    carry_at_start = True
+
+    for index, text in enumerate(texts):
+        # Paragraphs are separated by a blank line, as in the joined text
+        chunk = carry + (text if index == 0 else "\n\n" + text)
+        boundary = len(carry)
 
-    return "\n".join(html_parts)
+        def pieces(start: int, end: int) -> List[Tuple[int, str]]:
+            # Label the slice, splitting it where the carried line ends
+            result = []
+            if start < boundary:
+                result.append((index - 1, chunk[start:min(end, boundary)]))
+            if end > boundary:
+                result.append((index, chunk[max(start, boundary):end]))
+            return result
+
+        position = 0
+        for match in _SECTION_PATTERN.finditer(chunk):
+            content_parts.extend(pieces(position, match.start()))
+            content = _strip_pieces(content_parts)
+            # Initial content before the first header becomes the introduction
+            if title is not None or content:
+                yield (title if title is not None else "Introduction", content)
+            title = match.group(1) if match.group(1) else match.group(2)
+            content_parts = []
+            position = match.end()
+
+        cut = chunk.rfind("\n", position)
+        if cut >= 0:
+            content_parts.extend(pieces(position, cut))
+            carry = chunk[cut:]
+            carry_at_start = False
+        elif carry_at_start and position == 0:
+            # Still at the start of the text, where "^" may match
+            carry = chunk
+        else:
+            content_parts.extend(pieces(position, len(chunk)))
+            carry = ""
+            carry_at_start = False
+
+    if carry:
+        content_parts.append((index, carry))
+    content = _strip_pieces(content_parts)
+    if title is not None or content:
+        yield (title if title is not None else "Introduction", content)
+
+
+def _iter_paragraph_sections(texts: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Split paragraphs into sections without joining them into one string.
+
+    Args:
+        texts: Paragraph texts in document order
+
+    Returns:
+        Iterator[Tuple[str, str]]: (section_title, section_content) tuples
+    """
+    for title, pieces in _iter_section_pieces(texts):
+        yield title, "".join(text for _, text in pieces)
+
+
+def _template_classes() -> List[str]:
+    """
+    Collect the class names used by the page templates.
+
+    Returns:
+        List[str]: Class names found in the templates and section markup
+    """
+    templates = [
+        _PAGE_HEAD.template, _SYNTHESIS_COLUMN_START, _JSON_VIEW_START, _PAGE_TAIL,
+        _LAZY_SCRIPT.template
+    ]
+    classes = {"text-lg", "font-semibold", "mb-3", _ORIGINAL_TITLE_COLOR, _SYNTHESIS_TITLE_COLOR}
+    classes.update(_SECTION_CLASS.split())
+    classes.update(_SECTION_CONTENT_CLASS.split())
+    classes.update(_ALIGNED_CLASS.split())
+    classes.add(_HIGHLIGHT_CLASS)
+    for template in templates:
+        for value in re.findall(r'class(?:Name)?\s*=\s*["\']([^"\'$]*)["\']', template):
+            classes.update(value.split())
+    return sorted(classes)
+
+
+@lru_cache(maxsize=None)
+def page_stylesheet() -> str:
+    """Get the stylesheet covering the page templates, compiled once."""
+    return compile_stylesheet(_template_classes())
+
+
+def _write_section(out: TextIO, title: str, content: str, title_color: str) -> None:
+    """Write one section of a comparison column."""
+    out.write(f'\n<div class="{_SECTION_CLASS}">')
+    out.write(f'\n<h3 class="text-lg font-semibold {title_color} mb-3">{html.escape(title)}</h3>')
+    out.write(f'\n<div class="{_SECTION_CONTENT_CLASS}">{content}</div>')
+    out.write('\n</div>')
+
+
+def _source_spans(pieces: List[Tuple[int, str]], document: Document, anchored: int) -> Tuple[str, int]:
+    """
+    Render section content pieces as spans marking their source paragraph.
+
+    The first piece of every paragraph carries the ``src-<id>`` anchor that
+    aligned summary sentences link to.
+
+    Args:
+        pieces: (paragraph_index, text) pieces of the section content
+        document: The document the pieces come from
+        anchored: Index of the last paragraph that already has an anchor
+
+    Returns:
+        Tuple[str, int]: The HTML and the index of the last anchored paragraph
+    """
+    parts = []
+    for index, text in pieces:
+        paragraph_id = html.escape(document.paragraphs[index].id)
+        anchor = f' id="src-{paragraph_id}"' if index > anchored else ""
+        anchored = max(anchored, index)
+        parts.append(f'<span{anchor} data-paragraph="{paragraph_id}">{html.escape(text)}</span>')
+    return "".join(parts), anchored
+
+
+def _linked_sentences(content: str, alignment: List[Dict[str, Any]], start: int) -> Tuple[str, int]:
+    """
+    Render section content with aligned sentences linked to their sources.
+
+    Sentences are looked up in order, so the alignment is consumed across
+    the summary's sections. A sentence that cannot be found, such as a line
+    the section splitting took as a heading, is skipped once a later one is
+    found, so it does not hold up the links after it.
+
+    Args:
+        content: Section content of the summary
+        alignment: Sentence alignments in summary order
+        start: Index of the first alignment not yet found in earlier sections
+
+    Returns:
+        Tuple[str, int]: The HTML and the index of the next alignment to find
+    """
+    parts = []
+    position = 0
+    while start < len(alignment):
+        # Find the next alignment present in the rest of the content
+        for candidate in range(start, len(alignment)):
+            entry = alignment[candidate]
+            # Sentence splitting normalizes whitespace, so match any whitespace run
+            pattern = r'\s+'.join(re.escape(word) for word in entry["sentence"].split())
+            match = re.compile(pattern).search(content, position) if pattern else None
+            if match:
+                start = candidate
+                break
+        if not match:
+            break
+
+        parts.append(html.escape(content[position:match.start()]))
+        sentence = html.escape(match.group(0))
+        if entry["paragraph_ids"]:
+            sources = html.escape(" ".join(entry["paragraph_ids"]))
+            first = html.escape(entry["paragraph_ids"][0])
+            sentence = (f'<a href="#src-{first}" class="{_ALIGNED_CLASS}" data-sources="{sources}" '
+                        f'title="Source: {sources}" onclick="return highlightSources(this)">{sentence}</a>')
+        parts.append(sentence)
+        position = match.end()
+        start += 1
+
+    parts.append(html.escape(content[position:]))
+    return "".join(parts), start
+
+
+def _write_synthesis_sections(out: TextIO, synthesis: str,
+                              alignment: Optional[List[Dict[str, Any]]]) -> None:
+    """Write the synthesis column, linking aligned sentences to their sources."""
+    next_sentence = 0
+    for title, content in _split_into_sections(synthesis):
+        if alignment:
+            content_html, next_sentence = _linked_sentences(content, alignment, next_sentence)
+        else:
+            content_html = html.escape(content)
+        _write_section(out, title, content_html, _SYNTHESIS_TITLE_COLOR)
+
+
+def _write_page_head(document: Document, synthesis: str, out: TextIO,
+                     head_scripts: str = "") -> None:
+    """
+    Write the page header with document info and statistics.
+
+    Args:
+        document: The processed document
+        synthesis: The synthesized summary
+        out: Text stream to write the HTML to
+        head_scripts: Additional script elements for the page head
+    """
+    # Calculate statistics
+    original_words = sum(len(p.text.split()) for p in document.paragraphs)
+    synthesis_words = len(synthesis.split())
+    reduction_pct = round((1 - synthesis_words / original_words) *
+                          100, 1) if original_words > 0 else 0
+
+    out.write(_PAGE_HEAD.substitute(
+        stylesheet=page_stylesheet(),
+        highlight_class=_HIGHLIGHT_CLASS,
+        head_scripts=head_scripts,
+        title=html.escape(document.metadata.get('title', 'Untitled')),
+        source=html.escape(document.metadata.get('source_path', 'Unknown')),
+        original_words=original_words,
+        synthesis_words=synthesis_words,
+        reduction_pct=reduction_pct
+    ))
+
+
+def write_comparison_html(document: Document, synthesis: str, out: TextIO,
+                          alignment: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Write an HTML comparison between the document and the synthesis to a stream.
+    
+    Args:
+        document: The processed document
+        synthesis: The synthesized summary
+        out: Text stream to write the HTML to
+        alignment: Optional sentence alignments from ``align_summary``, as
+            dictionaries; aligned sentences link to their source paragraphs
+    """
+    _write_page_head(document, synthesis, out)
+
+    # Add original sections, marking the paragraph each part comes from
+    anchored = -1
+    for title, pieces in _iter_section_pieces(p.text for p in document.paragraphs):
+        content_html, anchored = _source_spans(pieces, document, anchored)
+        _write_section(out, title, content_html, _ORIGINAL_TITLE_COLOR)
+
+    # Add divider and start synthesis column
+    out.write("\n" + _SYNTHESIS_COLUMN_START)
+
+    # Add synthesis sections
+    _write_synthesis_sections(out, synthesis, alignment)
+
+    # Add JSON view (hidden by default), escaped chunk by chunk
+    out.write("\n" + _JSON_VIEW_START)
+    for chunk in iter_output_json(document, synthesis, include_empty_synthesis=True):
+        out.write(html.escape(chunk))
+    out.write(_PAGE_TAIL)
+
+
+def create_comparison_html(document: Document, synthesis: str,
+                           alignment: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Create an HTML comparison between the original document and the synthesis.
+    
+    Args:
+        document: The processed document
+        synthesis: The synthesized summary
+        alignment: Optional sentence alignments linking the summary to its sources
+        
+    Returns:
+        str: HTML content with side-by-side comparison
+    """
+    buffer = io.StringIO()
+    write_comparison_html(document, synthesis, buffer, alignment)
+    return buffer.getvalue()
 
 
 def save_comparison(document: Document, synthesis: str,
-                    output_path: str) -> None:
+                    output_path: str,
+                    alignment: Optional[List[Dict[str, Any]]] = None) -> None:
     """
     Generate and save an HTML comparison between original text and summary.
     
+    The page is streamed to the file as it is rendered.
+    
     Args:
         document: The processed document
         synthesis: The synthesized summary
         output_path: Path where to save the HTML file
+        alignment: Optional sentence alignments linking the summary to its sources
     """
-    html_content = create_comparison_html(document, synthesis)
-
     # Ensure directory exists
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
 
     # Save HTML file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with span("render_comparison", paragraphs=len(document.paragraphs)), \
+            atomic_write(output_path) as f:
+        write_comparison_html(document, synthesis, f, alignment)
+
+
+def _write_script_callback(path: str, callback: str, args: Iterable[str]) -> None:
+    """Write a sidecar script that passes JSON arguments to a page callback."""
+    with atomic_write(path) as f:
+        f.write(f"{callback}(")
+        for chunk in args:
+            f.write(chunk)
+        f.write(");\n")
+
+
+def save_lazy_comparison(document: Document, synthesis: str, output_path: str,
+                         alignment: Optional[List[Dict[str, Any]]] = None,
+                         sections_per_chunk: int = SECTIONS_PER_CHUNK) -> str:
+    """
+    Save a comparison page that loads its content on demand.
+
+    The page contains the statistics, the synthesis and an empty placeholder
+    per chunk of original sections. The sections and the JSON data are
+    written to a sidecar directory named after the page (``comparison.html``
+    uses ``comparison_data/``) and loaded when a placeholder approaches the
+    viewport or the JSON view is opened, so the page itself stays small and
+    opens quickly regardless of document size.
+
+    Args:
+        document: The processed document
+        synthesis: The synthesized summary
+        output_path: Path where to save the HTML file
+        alignment: Optional sentence alignments linking the summary to its sources
+        sections_per_chunk: Number of original sections per sidecar file
+
+    Returns:
+        str: Path of the sidecar directory
+    """
+    with span("render_lazy_comparison", paragraphs=len(document.paragraphs)):
+        return _save_lazy_comparison(document, synthesis, output_path, alignment, sections_per_chunk)
+
+
+def _save_lazy_comparison(document: Document, synthesis: str, output_path: str,
+                          alignment: Optional[List[Dict[str, Any]]],
+                          sections_per_chunk: int) -> str:
+    """Write a lazy comparison page and its sidecar files."""
+    data_dir = os.path.splitext(os.path.abspath(output_path))[0] + "_data"
+    os.makedirs(data_dir, exist_ok=True)
+
+    # Remove chunks left over from an earlier, longer document
+    for stale in glob.glob(os.path.join(data_dir, "sections-*.js")):
+        os.remove(stale)
+
+    def write_chunk(index: int, sections: List[Tuple[str, List[Tuple[int, str]]]]) -> None:
+        nonlocal anchored
+        name = f"sections-{index:04d}.js"
+
+        # Pieces are sent as [paragraph_id, text, has_anchor]
+        data = []
+        paragraph_ids = []
+        for title, pieces in sections:
+            section_pieces = []
+            for i, text in pieces:
+                paragraph_id = document.paragraphs[i].id
+                section_pieces.append([paragraph_id, text, i > anchored])
+                if i > anchored:
+                    paragraph_ids.append(html.escape(paragraph_id))
+                    anchored = i
+            data.append([title, section_pieces])
+        _write_script_callback(os.path.join(data_dir, name), "loadComparisonChunk",
+                               [json.dumps(name), ", ", json.dumps(data)])
+
+        # Reserve roughly the rendered height so scrolling does not jump
+        height = sum(60 + 24 * math.ceil(sum(len(text) for _, text in pieces) / 90 + 1)
+                     for _, pieces in sections)
+        f.write(f'\n<div data-chunk="{name}" data-paragraph-ids="{" ".join(paragraph_ids)}" '
+                f'style="min-height: {height}px;"></div>')
+
+    head_scripts = _LAZY_SCRIPT.substitute(data_dir=json.dumps(os.path.basename(data_dir)))
+
+    with atomic_write(output_path) as f:
+        _write_page_head(document, synthesis, f, head_scripts)
+
+        # Write original sections to sidecar chunks, leaving placeholders in the page
+        anchored = -1
+        chunk: List[Tuple[str, List[Tuple[int, str]]]] = []
+        index = 0
+        for section in _iter_section_pieces(p.text for p in document.paragraphs):
+            chunk.append(section)
+            if len(chunk) == sections_per_chunk:
+                write_chunk(index, chunk)
+                chunk = []
+                index += 1
+        if chunk:
+            write_chunk(index, chunk)
+
+        # The synthesis is short and shown immediately
+        f.write("\n" + _SYNTHESIS_COLUMN_START)
+        _write_synthesis_sections(f, synthesis, alignment)
+
+        # The JSON view is filled in when first opened
+        f.write("\n" + _JSON_VIEW_START.replace('<pre class="json">', '<pre id="json-data" class="json">'))
+        f.write("Loading...")
+        f.write(_PAGE_TAIL)
+
+    _write_script_callback(os.path.join(data_dir, "document.js"), "loadComparisonDocument",
+                           iter_output_json(document, synthesis, include_empty_synthesis=True))
+    return data_dir
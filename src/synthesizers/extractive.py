@@ -0,0 +1,218 @@
+"""
+Offline extractive summarization using TextRank.
+
+This module summarizes a document without any API calls by selecting its
+most central sentences. Sentences are represented as TF-IDF vectors, linked
+by cosine similarity and ranked with PageRank, with a boost for sentences
+at the beginning and end of the document where theses and conclusions
+usually appear. It serves as a fast triage mode and as the fallback when
+AI processing is unavailable.
+"""
+import math
+from typing import Dict, List, Tuple
+
+from src.models.document import Document
+from src.utils.text_utils import get_position_context, split_into_sentences, tokenize
+
+# Common function words that carry no topical signal
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his i in into is it its
+of on or our she so that the their them there these they this to was we were which
+who will with you your not can more also than such
+""".split())
+
+# Score multipliers for the paragraph's position in the document
+POSITION_WEIGHTS = {
+    "beginning": 1.3,
+    "middle": 1.0,
+    "end": 1.2,
+}
+
+# Extra weight for the first sentence of a paragraph, which often states its topic
+LEAD_SENTENCE_WEIGHT = 1.1
+
+# Terms found in more than this share of the sentences are left out of the
+# similarity graph, but never terms found in fewer than MIN_POSTINGS_LIMIT
+MAX_DOCUMENT_FREQUENCY = 0.05
+MIN_POSTINGS_LIMIT = 100
+
+
+def _body_text(text: str) -> str:
+    """
+    Remove heading lines such as "Abstract" or "Conclusion" from a paragraph.
+
+    Args:
+        text: The paragraph text
+
+    Returns:
+        str: The paragraph without leading short lines lacking end punctuation
+    """
+    lines = text.split('\n')
+    while len(lines) > 1:
+        first = lines[0].strip()
+        if first.endswith(('.', '!', '?', ':', '"')) or len(first.split()) > 10:
+            break
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+def _sentence_vectors(sentences: List[str]) -> List[Dict[str, float]]:
+    """
+    Build unit-length TF-IDF vectors for the given sentences.
+
+    Args:
+        sentences: Sentences to vectorize
+
+    Returns:
+        List[Dict[str, float]]: Sparse vectors mapping term to weight
+    """
+    term_counts = []
+    document_frequency: Dict[str, int] = {}
+    for sentence in sentences:
+        counts: Dict[str, int] = {}
+        for token in tokenize(sentence):
+            if token not in STOPWORDS:
+                counts[token] = counts.get(token, 0) + 1
+        term_counts.append(counts)
+        for token in counts:
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+
+    count = len(sentences)
+    vectors = []
+    for counts in term_counts:
+        vector = {
+            token: (1 + math.log(tf)) * math.log((1 + count) / (1 + document_frequency[token]))
+            for token, tf in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({token: w / norm for token, w in vector.items()} if norm else {})
+    return vectors
+
+
+def _similarity_graph(vectors: List[Dict[str, float]]) -> List[Dict[int, float]]:
+    """
+    Compute cosine similarities between sentences sharing at least one term.
+
+    Dot products are accumulated through term postings, so sentence pairs
+    without common terms are never compared. Terms shared by a large share
+    of the sentences are skipped: every pair of their postings would be
+    compared, which makes the graph quadratic in the length of the
+    document, while their low IDF adds little to any similarity.
+
+    Args:
+        vectors: Unit-length sparse sentence vectors
+
+    Returns:
+        List[Dict[int, float]]: Weighted neighbours of every sentence
+    """
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+    for i, vector in enumerate(vectors):
+        for token, weight in vector.items():
+            postings.setdefault(token, []).append((i, weight))
+
+    max_postings = max(MIN_POSTINGS_LIMIT, int(len(vectors) * MAX_DOCUMENT_FREQUENCY))
+    graph: List[Dict[int, float]] = [{} for _ in vectors]
+    for entries in postings.values():
+        if len(entries) > max_postings:
+            continue
+        for a in range(len(entries)):
+            i, weight_i = entries[a]
+            edges = graph[i]
+            for b in range(a + 1, len(entries)):
+                j, weight_j = entries[b]
+                product = weight_i * weight_j
+                edges[j] = edges.get(j, 0.0) + product
+                graph[j][i] = graph[j].get(i, 0.0) + product
+    return graph
+
+
+def _pagerank(graph: List[Dict[int, float]],
+              damping: float = 0.85,
+              iterations: int = 50,
+              tolerance: float = 1e-6) -> List[float]:
+    """
+    Rank graph nodes with weighted PageRank.
+
+    Args:
+        graph: Weighted adjacency lists
+        damping: Probability of following an edge
+        iterations: Maximum number of power iterations
+        tolerance: Stop once scores change less than this in total
+
+    Returns:
+        List[float]: Score of every node
+    """
+    count = len(graph)
+    if not count:
+        return []
+
+    out_weights = [sum(edges.values()) for edges in graph]
+    scores = [1.0 / count] * count
+    for _ in range(iterations):
+        updated = [(1 - damping) / count] * count
+        for i, edges in enumerate(graph):
+            if not out_weights[i]:
+                continue
+            share = damping * scores[i] / out_weights[i]
+            for j, weight in edges.items():
+                updated[j] += share * weight
+        delta = sum(abs(a - b) for a, b in zip(updated, scores))
+        scores = updated
+        if delta < tolerance:
+            break
+    return scores
+
+
+def extractive_summary(document: Document, ratio: float = 0.2, max_sentences: int = 12) -> str:
+    """
+    Summarize a document by extracting its highest-ranked sentences.
+
+    Args:
+        document: The document to summarize, processed or not
+        ratio: Fraction of the document's sentences to keep
+        max_sentences: Upper bound on the number of extracted sentences
+
+    Returns:
+        str: The summary, with the selected sentences in document order
+    """
+    title = document.metadata.get('title', 'Untitled Document')
+
+    # Collect candidate sentences together with their paragraph index
+    sentences: List[str] = []
+    origins: List[Tuple[int, int]] = []
+    total = len(document.paragraphs)
+    for p_index, p in enumerate(document.paragraphs):
+        text = _body_text(p.text)
+        # Skip very short paragraphs and titles
+        if len(text.split()) < 5 or text.strip() == title:
+            continue
+        for s_index, sentence in enumerate(split_into_sentences(text)):
+            sentences.append(sentence)
+            origins.append((p_index, s_index))
+
+    if not sentences:
+        return "No content to summarize."
+
+    scores = _pagerank(_similarity_graph(_sentence_vectors(sentences)))
+
+    # Apply position cues
+    for i, (p_index, s_index) in enumerate(origins):
+        scores[i] *= POSITION_WEIGHTS[get_position_context(p_index, total)]
+        if s_index == 0:
+            scores[i] *= LEAD_SENTENCE_WEIGHT
+
+    keep = max(1, min(max_sentences, math.ceil(len(sentences) * ratio)))
+    selected = sorted(sorted(range(len(sentences)), key=lambda i: -scores[i])[:keep])
+
+    # Group the selected sentences by source paragraph
+    summary_parts = [f"# {title}"]
+    current_paragraph = None
+    for i in selected:
+        p_index = origins[i][0]
+        if p_index != current_paragraph:
+            summary_parts.append(sentences[i])
+            current_paragraph = p_index
+        else:
+            summary_parts[-1] += f" {sentences[i]}"
+
+    return "\n\n".join(summary_parts)
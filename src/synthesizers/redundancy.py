@@ -0,0 +1,224 @@
+"""
+Near-duplicate pruning of transcript gists before refinement.
+
+Long documents often restate the same point, and the same paragraph can
+appear in more than one transcript section, so the transcript sent for
+refinement repeats many gists. This module finds near-duplicate gist lines
+with MinHash signatures and locality-sensitive hashing, keeps the first
+line of each cluster annotated with how often the point was made, and
+reports the tokens saved. A paragraph repeated in several sections makes
+its point only once, so identical gists count as one statement.
+"""
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.utils.text_utils import estimate_tokens, tokenize
+
+# Transcript item prefixes produced by the transcript engine
+_ITEM_PATTERN = re.compile(r'^(\* (?:✓ |🔄 Counterpoint: )?)?(.*)$')
+
+# Large prime for the universal hash family
+_PRIME = (1 << 61) - 1
+
+
+@dataclass
+class PruneResult:
+    """Outcome of pruning redundant gists from a transcript."""
+    transcript: str
+    clusters: List[List[str]] = field(default_factory=list)
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    @property
+    def lines_removed(self) -> int:
+        return sum(len(cluster) - 1 for cluster in self.clusters)
+
+
+def _shingles(text: str) -> Set[str]:
+    """
+    Build the shingle set of a gist: its words and word pairs.
+
+    Args:
+        text: The gist text
+
+    Returns:
+        Set[str]: Unigram and bigram shingles
+    """
+    words = tokenize(text)
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return shingles
+
+
+class MinHasher:
+    """Computes MinHash signatures and LSH band keys for shingle sets."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """
+        Initialize the hash family.
+
+        Args:
+            num_perm: Number of hash functions in a signature
+            bands: Number of LSH bands, must divide ``num_perm``
+            seed: Seed for the hash coefficients
+
+        Raises:
+            ValueError: If ``bands`` does not divide ``num_perm``
+        """
+        if num_perm % bands:
+            raise ValueError("The number of bands must divide the number of permutations")
+
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Deterministic coefficients from a simple linear congruential sequence
+        state = seed
+        self._coefficients = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (state >> 3) % (_PRIME - 1) + 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (state >> 3) % _PRIME
+            self._coefficients.append((a, b))
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set."""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles] or [0]
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in self._coefficients
+        )
+
+    def band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Split a signature into hashable LSH band keys."""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+
+def _find(parents: List[int], i: int) -> int:
+    """Find the cluster root of an item with path halving."""
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def prune_redundant_gists(transcript: str,
+                          threshold: float = 0.6,
+                          hasher: Optional[MinHasher] = None) -> PruneResult:
+    """
+    Remove near-duplicate gist lines from a transcript.
+
+    Headings and blank lines are kept. Of every cluster of similar gists the
+    first occurrence is kept and annotated with the number of distinct gists
+    in the cluster, if more than one; sections left without items are
+    dropped.
+
+    Args:
+        transcript: Transcript produced by ``generate_transcript``
+        threshold: Minimum Jaccard similarity of shingle sets to treat two
+            gists as duplicates
+        hasher: Optional MinHash configuration
+
+    Returns:
+        PruneResult: The pruned transcript, duplicate clusters and token counts
+    """
+    hasher = hasher or MinHasher()
+    lines = transcript.split("\n")
+
+    # Collect gist lines with their shingles
+    items: List[int] = []
+    gists: List[str] = []
+    shingle_sets: List[Set[str]] = []
+    for i, line in enumerate(lines):
+        if not line.strip() or line.startswith("#"):
+            continue
+        gist = _ITEM_PATTERN.match(line).group(2).strip()
+        shingles = _shingles(gist)
+        if shingles:
+            items.append(i)
+            gists.append(gist)
+            shingle_sets.append(shingles)
+
+    # Candidate pairs share at least one LSH band; verify with exact Jaccard
+    parents = list(range(len(items)))
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for k, shingles in enumerate(shingle_sets):
+        for key in hasher.band_keys(hasher.signature(shingles)):
+            buckets.setdefault(key, []).append(k)
+
+    checked: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pair = (members[a], members[b])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                x, y = shingle_sets[pair[0]], shingle_sets[pair[1]]
+                if len(x & y) / len(x | y) >= threshold:
+                    root_a, root_b = _find(parents, pair[0]), _find(parents, pair[1])
+                    if root_a != root_b:
+                        parents[max(root_a, root_b)] = min(root_a, root_b)
+
+    # Group items by cluster root; the root is always the earliest line
+    groups: Dict[int, List[int]] = {}
+    for k in range(len(items)):
+        groups.setdefault(_find(parents, k), []).append(k)
+
+    removed: Set[int] = set()
+    clusters = []
+    for root, members in groups.items():
+        if len(members) < 2:
+            continue
+        clusters.append([lines[items[k]] for k in members])
+        removed.update(items[k] for k in members[1:])
+        # Count the same paragraph in several sections once
+        statements = len({gists[k] for k in members})
+        if statements > 1:
+            lines[items[root]] = f"{lines[items[root]]} (stated {statements} times)"
+
+    kept = [line for i, line in enumerate(lines) if i not in removed]
+    pruned = "\n".join(_drop_empty_sections(kept))
+
+    return PruneResult(
+        transcript=pruned,
+        clusters=clusters,
+        tokens_before=estimate_tokens(transcript),
+        tokens_after=estimate_tokens(pruned)
+    )
+
+
+def _drop_empty_sections(lines: List[str]) -> List[str]:
+    """
+    Remove "## " section headings that no longer have any items.
+
+    Args:
+        lines: Transcript lines
+
+    Returns:
+        List[str]: Lines without empty sections
+    """
+    result: List[str] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("## "):
+            # Look ahead for content before the next heading
+            j = i + 1
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            if j >= len(lines) or lines[j].startswith("#"):
+                i = j
+                continue
+        result.append(line)
+        i += 1
+    return result
@@ -0,0 +1,238 @@
+"""
+Precompiled stylesheet for the HTML comparison pages.
+
+The comparison pages use Tailwind utility class names. Instead of loading
+the Tailwind compiler from a CDN and building the styles in the browser,
+this module maps each class the pages use to its CSS declarations and
+compiles a small stylesheet that is inlined into the page, so pages open
+without any network access.
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Minimal reset that the utility classes rely on
+BASE_CSS = """*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }
+html { line-height: 1.5; -webkit-text-size-adjust: 100%; font-family: ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif; }
+body { margin: 0; line-height: inherit; }
+h1, h2, h3, p, pre { margin: 0; }
+h1, h2, h3 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+pre { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace; }
+button { font-family: inherit; font-size: 100%; line-height: inherit; color: inherit; margin: 0; background-color: transparent; background-image: none; cursor: pointer; }"""
+
+# CSS declarations of every supported utility class, in cascade order
+UTILITIES: Dict[str, str] = {
+    # Layout
+    "flex": "display: flex",
+    "grid": "display: grid",
+    "hidden": "display: none",
+    "flex-col": "flex-direction: column",
+    "flex-grow": "flex-grow: 1",
+    "grid-cols-1": "grid-template-columns: repeat(1, minmax(0, 1fr))",
+    "grid-cols-2": "grid-template-columns: repeat(2, minmax(0, 1fr))",
+    "grid-cols-3": "grid-template-columns: repeat(3, minmax(0, 1fr))",
+    "gap-2": "gap: 0.5rem",
+    "gap-4": "gap: 1rem",
+    "gap-6": "gap: 1.5rem",
+    "items-center": "align-items: center",
+    "justify-between": "justify-content: space-between",
+    "overflow-hidden": "overflow: hidden",
+    "overflow-x-auto": "overflow-x: auto",
+    "overflow-y-auto": "overflow-y: auto",
+    # Sizing
+    "w-full": "width: 100%",
+    "max-w-7xl": "max-width: 80rem",
+    "min-h-screen": "min-height: 100vh",
+    # Spacing
+    "mx-auto": "margin-left: auto; margin-right: auto",
+    "mt-auto": "margin-top: auto",
+    "mb-2": "margin-bottom: 0.5rem",
+    "mb-3": "margin-bottom: 0.75rem",
+    "mb-4": "margin-bottom: 1rem",
+    "mb-8": "margin-bottom: 2rem",
+    "p-3": "padding: 0.75rem",
+    "p-4": "padding: 1rem",
+    "p-5": "padding: 1.25rem",
+    "p-6": "padding: 1.5rem",
+    "px-3": "padding-left: 0.75rem; padding-right: 0.75rem",
+    "px-4": "padding-left: 1rem; padding-right: 1rem",
+    "px-6": "padding-left: 1.5rem; padding-right: 1.5rem",
+    "px-8": "padding-left: 2rem; padding-right: 2rem",
+    "py-2": "padding-top: 0.5rem; padding-bottom: 0.5rem",
+    "py-4": "padding-top: 1rem; padding-bottom: 1rem",
+    "py-10": "padding-top: 2.5rem; padding-bottom: 2.5rem",
+    "pb-6": "padding-bottom: 1.5rem",
+    # Borders and effects
+    "rounded": "border-radius: 0.25rem",
+    "rounded-lg": "border-radius: 0.5rem",
+    "border-b": "border-bottom-width: 1px",
+    "border-gray-600": "border-color: #4b5563",
+    "border-gray-700": "border-color: #374151",
+    "shadow-lg": "box-shadow: 0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "outline-none": "outline: 2px solid transparent; outline-offset: 2px",
+    "ring-2": "box-shadow: 0 0 0 2px var(--tw-ring-color)",
+    "ring-opacity-50": "--tw-ring-opacity: 0.5",
+    "ring-blue-500": "--tw-ring-color: rgb(59 130 246 / var(--tw-ring-opacity, 1))",
+    "ring-gray-600": "--tw-ring-color: rgb(75 85 99 / var(--tw-ring-opacity, 1))",
+    "transition-colors": "transition-property: color, background-color, border-color, fill, stroke; "
+                         "transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); "
+                         "transition-duration: 150ms",
+    # Backgrounds
+    "bg-primary": "background-color: #3b82f6",
+    "bg-blue-600": "background-color: #2563eb",
+    "bg-gray-700": "background-color: #374151",
+    "bg-gray-800": "background-color: #1f2937",
+    "bg-gray-900": "background-color: #111827",
+    "bg-indigo-800": "background-color: #3730a3",
+    # Typography
+    "font-medium": "font-weight: 500",
+    "font-semibold": "font-weight: 600",
+    "font-bold": "font-weight: 700",
+    "text-xs": "font-size: 0.75rem; line-height: 1rem",
+    "text-sm": "font-size: 0.875rem; line-height: 1.25rem",
+    "text-lg": "font-size: 1.125rem; line-height: 1.75rem",
+    "text-xl": "font-size: 1.25rem; line-height: 1.75rem",
+    "text-3xl": "font-size: 1.875rem; line-height: 2.25rem",
+    "text-left": "text-align: left",
+    "text-center": "text-align: center",
+    "text-right": "text-align: right",
+    "text-white": "color: #ffffff",
+    "text-gray-100": "color: #f3f4f6",
+    "text-gray-200": "color: #e5e7eb",
+    "text-gray-300": "color: #d1d5db",
+    "text-gray-400": "color: #9ca3af",
+    "text-blue-400": "color: #60a5fa",
+    "text-green-400": "color: #4ade80",
+    "underline": "text-decoration-line: underline",
+    "decoration-dotted": "text-decoration-style: dotted",
+    "whitespace-nowrap": "white-space: nowrap",
+    "whitespace-pre-line": "white-space: pre-line",
+}
+
+# Minimum viewport widths of the responsive prefixes
+BREAKPOINTS: Dict[str, str] = {
+    "sm": "640px",
+    "md": "768px",
+    "lg": "1024px",
+}
+
+# Pseudo-classes of the state prefixes
+STATES: Dict[str, str] = {
+    "hover": ":hover",
+    "focus": ":focus",
+}
+
+# Component selectors and the utilities they are composed of
+COMPONENTS: Dict[str, Tuple[str, ...]] = {
+    ".btn": ("px-4", "py-2", "rounded", "font-medium", "focus:outline-none", "focus:ring-2",
+             "focus:ring-opacity-50", "transition-colors"),
+    ".btn-primary": ("bg-primary", "text-white", "hover:bg-blue-600", "focus:ring-blue-500"),
+    ".btn-secondary": ("bg-gray-700", "text-white", "hover:bg-gray-800", "focus:ring-gray-600"),
+    "pre.json": ("p-4", "rounded-lg", "bg-gray-800", "text-gray-100", "overflow-x-auto", "text-sm"),
+}
+
+# Class names appearing in each component selector
+_SELECTOR_CLASSES = {selector: frozenset(re.findall(r'\.([\w-]+)', selector)) for selector in COMPONENTS}
+_COMPONENT_CLASSES = frozenset().union(*_SELECTOR_CLASSES.values())
+
+# Classes used only as markers, which need no rules of their own
+MARKER_CLASSES = frozenset({"dark"})
+
+
+def _split_variant(class_name: str) -> Tuple[str, str]:
+    """
+    Split a class name into its variant prefix and utility.
+
+    Args:
+        class_name: A class name such as ``lg:grid-cols-2``
+
+    Returns:
+        Tuple[str, str]: The prefix (empty if none) and the utility name
+
+    Raises:
+        ValueError: If the prefix or utility is not supported
+    """
+    prefix, _, utility = class_name.rpartition(":")
+    if prefix and prefix not in BREAKPOINTS and prefix not in STATES:
+        raise ValueError(f"Unsupported class prefix: {class_name}")
+    if utility not in UTILITIES:
+        raise ValueError(f"Unsupported utility class: {class_name}")
+    return prefix, utility
+
+
+def is_supported(class_name: str) -> bool:
+    """Check whether a class name is covered by the stylesheet."""
+    if class_name in MARKER_CLASSES or class_name in _COMPONENT_CLASSES:
+        return True
+    try:
+        _split_variant(class_name)
+    except ValueError:
+        return False
+    return True
+
+
+def _rule(selector: str, declarations: Iterable[str]) -> str:
+    """Format a CSS rule."""
+    return f"{selector} {{ {'; '.join(declarations)}; }}"
+
+
+def compile_stylesheet(class_names: Iterable[str]) -> str:
+    """
+    Compile the CSS for a set of class names.
+
+    Rules follow the Tailwind cascade: base styles, then components, then
+    utilities in the order of ``UTILITIES``, then state variants and finally
+    responsive variants from the smallest breakpoint up.
+
+    Args:
+        class_names: Class names used by the page
+
+    Returns:
+        str: The stylesheet
+
+    Raises:
+        ValueError: If a class is not supported
+    """
+    names = set(class_names)
+    unsupported = sorted(name for name in names if not is_supported(name))
+    if unsupported:
+        raise ValueError(f"Unsupported classes: {', '.join(unsupported)}")
+
+    order = {utility: i for i, utility in enumerate(UTILITIES)}
+    rules: List[str] = [BASE_CSS]
+
+    # Components used by the page, with state variants as separate rules
+    for selector, utilities in COMPONENTS.items():
+        if names.isdisjoint(_SELECTOR_CLASSES[selector]):
+            continue
+        by_state: Dict[str, List[str]] = {}
+        for class_name in utilities:
+            prefix, utility = _split_variant(class_name)
+            by_state.setdefault(STATES.get(prefix, ""), []).append(UTILITIES[utility])
+        for pseudo, declarations in by_state.items():
+            rules.append(_rule(selector + pseudo, declarations))
+
+    # Utilities grouped by variant, each group in cascade order
+    groups: Dict[str, List[Tuple[int, str]]] = {}
+    for name in names:
+        if name in MARKER_CLASSES or name in _COMPONENT_CLASSES:
+            continue
+        prefix, utility = _split_variant(name)
+        groups.setdefault(prefix, []).append((order[utility], name))
+
+    def class_rules(prefix: str) -> List[str]:
+        result = []
+        for _, name in sorted(groups.get(prefix, [])):
+            selector = "." + name.replace(":", "\\:") + STATES.get(prefix, "")
+            result.append(_rule(selector, [UTILITIES[name.rpartition(":")[2]]]))
+        return result
+
+    rules.extend(class_rules(""))
+    for state in STATES:
+        rules.extend(class_rules(state))
+    for breakpoint, width in BREAKPOINTS.items():
+        media_rules = class_rules(breakpoint)
+        if media_rules:
+            rules.append(f"@media (min-width: {width}) {{\n" + "\n".join(media_rules) + "\n}")
+
+    return "\n".join(rules)
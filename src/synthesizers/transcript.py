@@ -0,0 +1,227 @@
+"""
+Transcript engine for building structured summaries from processed documents.
+
+Paragraphs are classified into transcript sections in a single pass. Each
+paragraph's text is lowercased and counted once, keyword matches are
+computed once per paragraph for all sections, and section membership is
+tracked by paragraph index, so building a transcript is linear in the
+number of paragraphs.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.models.document import Document, Paragraph
+
+
+@dataclass
+class TranscriptSection:
+    """
+    Template describing one section of a transcript.
+
+    A paragraph belongs to the section when it has at least ``min_words``
+    words, is not a member of any section listed in ``exclude``, and either
+    carries one of the structural ``tags`` or contains one of the
+    ``keywords``. Each member is rendered with the format from
+    ``role_formats`` for its argument role, falling back to ``item_format``.
+    """
+    key: str
+    heading: str
+    tags: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    min_words: int = 0
+    require_known_role: bool = False
+    exclude: Tuple[str, ...] = ()
+    limit: Optional[int] = None
+    item_format: str = "{gist}"
+    role_formats: Dict[str, str] = field(default_factory=dict)
+    trailing_blank: bool = True
+
+
+# Sections reproducing the original transcript layout
+DEFAULT_SECTIONS = (
+    TranscriptSection(
+        key="thesis",
+        heading="Main Thesis",
+        tags=("THESIS",),
+        keywords=("abstract", "introduction"),
+        min_words=5,
+        limit=2
+    ),
+    TranscriptSection(
+        key="points",
+        heading="Key Points",
+        tags=("POINT",),
+        min_words=5,
+        require_known_role=True,
+        exclude=("thesis",),
+        item_format="* {gist}",
+        role_formats={
+            "COUNTERPOINT": "* 🔄 Counterpoint: {gist}",
+            "SUPPORTING": "* ✓ {gist}"
+        }
+    ),
+    TranscriptSection(
+        key="examples",
+        heading="Supporting Evidence",
+        tags=("EXAMPLE",),
+        keywords=("example",),
+        item_format="* {gist}"
+    ),
+    TranscriptSection(
+        key="conclusions",
+        heading="Conclusion",
+        tags=("CONCLUSION",),
+        keywords=("conclusion", "in summary"),
+        trailing_blank=False
+    ),
+)
+
+
+class TranscriptBuilder:
+    """
+    Builds transcripts from configurable section templates.
+
+    By default a paragraph may appear in several sections, matching the
+    original transcript. With ``exclusive=True`` each paragraph is placed
+    only in the first matching section.
+    """
+
+    def __init__(self,
+                 sections: Optional[Sequence[TranscriptSection]] = None,
+                 order: Optional[Sequence[str]] = None,
+                 exclusive: bool = False):
+        """
+        Initialize the builder.
+
+        Args:
+            sections: Section templates in classification priority order,
+                defaults to ``DEFAULT_SECTIONS``
+            order: Optional section keys giving the output order, defaults
+                to the order of ``sections``
+            exclusive: Whether each paragraph may appear in only one section
+
+        Raises:
+            ValueError: If a section excludes an unknown or later section,
+                or ``order`` names an unknown section
+        """
+        self.sections = list(sections if sections is not None else DEFAULT_SECTIONS)
+        self.exclusive = exclusive
+
+        keys = [s.key for s in self.sections]
+        for i, section in enumerate(self.sections):
+            for excluded in section.exclude:
+                if excluded not in keys[:i]:
+                    raise ValueError(
+                        f"Section '{section.key}' can only exclude earlier sections, not '{excluded}'"
+                    )
+
+        self.order = list(order) if order is not None else keys
+        unknown = set(self.order) - set(keys)
+        if unknown:
+            raise ValueError(f"Unknown transcript sections in order: {sorted(unknown)}")
+
+        # Every keyword is checked once per paragraph, whichever sections use it
+        self._keywords = sorted({kw for s in self.sections for kw in s.keywords})
+
+    def classify(self, paragraphs: Sequence[Paragraph]) -> Dict[str, List[Paragraph]]:
+        """
+        Assign paragraphs to sections in a single pass.
+
+        Args:
+            paragraphs: The document paragraphs in order
+
+        Returns:
+            Dict[str, List[Paragraph]]: Members of each section in document order
+        """
+        members: Dict[str, List[Paragraph]] = {s.key: [] for s in self.sections}
+        keywords = self._keywords
+
+        for p in paragraphs:
+            word_count = len(p.text.split())
+            lower = p.text.lower()
+            found = {kw for kw in keywords if kw in lower}
+            tag = p.structural_tag.name
+            known_role = p.argument_role.name != "UNKNOWN"
+
+            # Sections this paragraph has joined so far, for exclusions
+            joined = set()
+            for section in self.sections:
+                if word_count < section.min_words:
+                    continue
+                if section.require_known_role and not known_role:
+                    continue
+                if section.exclude and joined.intersection(section.exclude):
+                    continue
+                if tag in section.tags or found.intersection(section.keywords):
+                    members[section.key].append(p)
+                    joined.add(section.key)
+                    if self.exclusive:
+                        break
+
+        return members
+
+    def section(self, key: str) -> TranscriptSection:
+        """Get the section template with the given key."""
+        for section in self.sections:
+            if section.key == key:
+                return section
+        raise KeyError(key)
+
+    @staticmethod
+    def format_item(section: TranscriptSection, paragraph: Paragraph) -> str:
+        """
+        Format one section member as a transcript line.
+
+        Args:
+            section: The section template
+            paragraph: The member paragraph
+
+        Returns:
+            str: The transcript line for the paragraph's gist
+        """
+        item_format = section.role_formats.get(paragraph.argument_role.name, section.item_format)
+        return item_format.format(gist=paragraph.gist)
+
+    def render(self, title: str, members: Dict[str, List[Paragraph]]) -> str:
+        """
+        Render classified paragraphs as a transcript.
+
+        Args:
+            title: Document title for the transcript heading
+            members: Section members as returned by ``classify``
+
+        Returns:
+            str: The transcript text
+        """
+        sections = {s.key: s for s in self.sections}
+        transcript_parts = [f"# {title}\n"]
+
+        for key in self.order:
+            section = sections[key]
+            paragraphs = members.get(key)
+            if not paragraphs:
+                continue
+
+            transcript_parts.append(f"## {section.heading}")
+            for p in paragraphs[:section.limit]:
+                transcript_parts.append(self.format_item(section, p))
+            if section.trailing_blank:
+                transcript_parts.append("")
+
+        return "\n".join(transcript_parts)
+
+    def build(self, document: Document) -> str:
+        """
+        Build the transcript for a document.
+
+        Args:
+            document: The processed document with gists and tags
+
+        Returns:
+            str: A structured transcript of the document
+        """
+        if not document.paragraphs:
+            return "No content to summarize."
+
+        title = document.metadata.get('title', 'Untitled Document')
+        return self.render(title, self.classify(document.paragraphs))
@@ -0,0 +1,38 @@
+"""Utility functions and locations for writing output files."""
+import os
+import uuid
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+# Directory containing one subdirectory per --auto-output run, at the repository root
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_ROOT = os.path.join(_REPOSITORY_ROOT, "output")
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> Iterator[IO]:
+    """
+    Open a file for writing that replaces the file at a path once complete.
+
+    The content is written to a temporary file next to the path and renamed
+    over it, so readers never see a partial file. Since the rename replaces
+    the directory entry rather than writing into the existing file, a file
+    that is a hard link to a shared artifact store blob is unlinked from it
+    instead of overwriting the content every other run links to.
+
+    Args:
+        path: Destination file path
+        mode: ``'w'`` for text or ``'wb'`` for binary content
+        encoding: Text encoding, ignored in binary mode
+
+    Yields:
+        IO: The open temporary file
+    """
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
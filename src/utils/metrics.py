@@ -0,0 +1,396 @@
+"""
+Metrics for the LLM calls made while processing documents.
+
+A small registry of labelled counters, gauges and histograms, modelled on
+the Prometheus client library but without the dependency. Every chat call
+is tracked with ``track_llm_call``, which records its latency, outcome and
+the number of calls in flight; the registry is rendered in the Prometheus
+text exposition format and can be written to a file after a run (for the
+node exporter's textfile collector, for example) or served over HTTP while
+a run is in progress.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.file_utils import atomic_write
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from fast cache-like replies to slow refinements
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Label values used by the call sites
+ANALYZE = "analyze_paragraph"
+IMAGE_TAG = "image_tag"
+REFINE = "refine_transcript"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set as ``{name="value",...}``, or nothing if empty."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base class of the metric types: a name, help text and labelled values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text shown in the exposition
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """
+        Get the label values of a sample in label name order.
+
+        Raises:
+            ValueError: If the labels do not match the metric's label names
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Get the samples as (name, label names, label values, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labelnames, values, value in self.samples():
+            lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the counter with no samples."""
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Increase the counter.
+
+        Raises:
+            ValueError: If the amount is negative
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        """Get the current value of a labelled counter."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Get one sample per label set."""
+        with self._lock:
+            return [(self.name, self.labelnames, key, value)
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Counts of observed values in cumulative buckets, with their sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize the histogram with no observations.
+
+        Args:
+            name: Metric name
+            documentation: Help text shown in the exposition
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, in increasing order
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: per-bucket counts (not cumulative), then the sum
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation."""
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations of a label set."""
+        counts, _ = self._values.get(self._key(labels), ([], 0.0))
+        return sum(counts)
+
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Get the cumulative bucket, sum and count samples of every label set."""
+        result = []
+        bucket_labels = self.labelnames + ("le",)
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    result.append((f"{self.name}_bucket", bucket_labels,
+                                   key + (_format_value(bound),), cumulative))
+                result.append((f"{self.name}_sum", self.labelnames, key, total))
+                result.append((f"{self.name}_count", self.labelnames, key, cumulative))
+        return result
+
+
+class Registry:
+    """A named collection of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        """
+        Add a metric to the registry.
+
+        Returns:
+            The metric, so it can be registered where it is defined
+
+        Raises:
+            ValueError: If a metric with the same name is already registered
+        """
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        return "".join(metric.render() + "\n" for metric in self.metrics.values())
+
+    def write(self, path: str) -> None:
+        """
+        Write the metrics to a file, replacing it atomically so that a
+        collector never reads a partly written file.
+
+        Args:
+            path: Path of the metrics file
+        """
+        with atomic_write(path) as f:
+            f.write(self.render())
+
+
+# The registry the LLM call metrics are recorded in
+REGISTRY = Registry()
+
+LLM_CALLS = REGISTRY.register(Counter(
+    "llm_calls_total", "Chat completion calls by call type and outcome.", ("call", "outcome")))
+LLM_LATENCY = REGISTRY.register(Histogram(
+    "llm_call_duration_seconds", "Latency of chat completion calls.", ("call",)))
+LLM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "llm_calls_in_flight", "Chat completion calls currently waiting for a response.", ("call",)))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "llm_retries_total", "Chat completion calls repeated after a failed attempt.", ("call",)))
+LLM_PARSE_FAILURES = REGISTRY.register(Counter(
+    "llm_parse_failures_total",
+    "Responses that needed the fallback parser (fallback) or could not be parsed (error).",
+    ("call", "kind")))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total", "Tokens reported by chat completion responses.", ("call", "kind")))
+LLM_ROUTES = REGISTRY.register(Counter(
+    "llm_route_decisions_total", "Model routing decisions by call type, route and reason.",
+    ("call", "route", "reason")))
+LLM_ROUTE_ESCALATIONS = REGISTRY.register(Counter(
+    "llm_route_escalations_total", "Calls retried on a larger route after an unparseable response.",
+    ("call", "from_route", "to_route")))
+LLM_ROUTE_LATENCY = REGISTRY.register(Histogram(
+    "llm_route_duration_seconds", "Latency of chat completion calls by route.", ("call", "route")))
+
+
+@contextmanager
+def track_llm_call(call: str, route: Optional[str] = None) -> Iterator[None]:
+    """
+    Record the latency and outcome of the chat call made in the enclosed block.
+
+    Args:
+        call: Call type label, such as ``ANALYZE``
+        route: Optional model route of the call, to record its latency per route
+    """
+    LLM_IN_FLIGHT.inc(call=call)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        LLM_LATENCY.observe(elapsed, call=call)
+        if route:
+            LLM_ROUTE_LATENCY.observe(elapsed, call=call, route=route)
+        LLM_IN_FLIGHT.dec(call=call)
+        LLM_CALLS.inc(call=call, outcome=outcome)
+
+
+def record_tokens(call: str, response: Any) -> None:
+    """
+    Add the token usage reported by a chat response to the token counters.
+
+    Args:
+        call: Call type label
+        response: The chat completion response
+    """
+    usage = getattr(response, "usage", None)
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if isinstance(tokens, int):
+            LLM_TOKENS.inc(tokens, call=call, kind=kind)
+
+
+def record_retry(call: str) -> None:
+    """Count a chat call that is repeated after a failed attempt."""
+    LLM_RETRIES.inc(call=call)
+
+
+def record_parse_failure(call: str, kind: str) -> None:
+    """
+    Count a response that could not be parsed directly.
+
+    Args:
+        call: Call type label
+        kind: ``fallback`` if a fallback parser was needed, ``error`` if
+            the response could not be parsed at all
+    """
+    LLM_PARSE_FAILURES.inc(call=call, kind=kind)
+
+
+def record_route(call: str, route: str, reason: str) -> None:
+    """
+    Count a model routing decision.
+
+    Args:
+        call: Call type label
+        route: The chosen route
+        reason: Why the route was chosen
+    """
+    LLM_ROUTES.inc(call=call, route=route, reason=reason)
+
+
+def record_route_escalation(call: str, from_route: str, to_route: str) -> None:
+    """Count a call retried on a larger route after its response could not be parsed."""
+    LLM_ROUTE_ESCALATIONS.inc(call=call, from_route=from_route, to_route=to_route)
+    record_retry(call)
+
+
+def route_latencies() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Summarize the calls and their mean latency per call type and route.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: ``calls`` and ``mean_seconds``
+        by call type and route
+    """
+    summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+    totals: Dict[Tuple[str, str], float] = {}
+    for name, _, values, value in LLM_ROUTE_LATENCY.samples():
+        if name.endswith("_sum"):
+            totals[tuple(values)] = value
+        elif name.endswith("_count") and value:
+            call, route = values
+            summary.setdefault(call, {})[route] = {
+                "calls": int(value), "mean_seconds": round(totals[(call, route)] / value, 3)
+            }
+    return summary
+
+
+def serve_metrics(port: int, registry: Registry = REGISTRY,
+                  host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the metrics at ``/metrics`` from a background thread.
+
+    Args:
+        port: Port to listen on; 0 picks a free port
+        registry: The registry to serve
+        host: Address to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server; call ``shutdown`` to stop it
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the run output
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
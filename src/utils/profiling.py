@@ -0,0 +1,280 @@
+"""
+Per-stage CPU and memory profiling of a run.
+
+A ``StageProfiler`` listens to the pipeline stage spans of the active tracer
+and profiles each stage separately. Stages may nest; a stage's profile only
+covers the time spent outside the stages nested in it, so the enclosing
+``run`` stage collects everything between the pipeline stages.
+
+In ``cpu`` mode every stage gets a cProfile profile, and a sampling thread
+records the call stacks of the main thread for flame graphs. In ``memory``
+mode tracemalloc snapshots taken at the start and end of every stage give
+its top allocation sites, its net allocations and its peak traced memory;
+these include the stages nested in it, and allocation stacks for flame
+graphs are only kept for the innermost stages so nothing is counted twice.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.tracing import STAGE, OpenSpan
+
+# Supported profiling modes
+MODES = ("cpu", "memory")
+
+# Frames kept per allocation traceback in memory mode
+TRACEBACK_FRAMES = 25
+
+
+def _frame_label(filename: str, lineno: int, function: str) -> str:
+    """Label a stack frame for collapsed stacks."""
+    return f"{function} ({os.path.basename(filename)}:{lineno})"
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float, labels: List[str], stacks: Counter):
+        """
+        Initialize the sampler.
+
+        Args:
+            thread_id: Identifier of the thread to sample
+            interval: Seconds between samples
+            labels: Stack of stage names each sample is prefixed with; it is
+                read, not copied, so it follows the stages as they change
+            stacks: Counter the samples are added to, per collapsed stack
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.labels = labels
+        self.stacks = stacks
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Record one sample per interval until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(list(self.labels) + frames[::-1])] += 1
+
+
+class StageProfiler:
+    """Profiles every pipeline stage of a run; add it to a tracer's listeners."""
+
+    def __init__(self, mode: str, top: int = 20, interval: float = 0.005):
+        """
+        Initialize the profiler.
+
+        Args:
+            mode: ``cpu`` or ``memory``
+            top: Number of functions or allocation sites listed per stage
+            interval: Seconds between call stack samples in cpu mode
+
+        Raises:
+            ValueError: If the mode is not supported
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unsupported profiling mode: {mode}")
+        self.mode = mode
+        self.top = top
+        self.interval = interval
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.memory: Dict[str, Dict[str, Any]] = {}
+        # Sampled call stacks (cpu) or allocated bytes per call stack (memory)
+        self.stacks: Counter = Counter()
+        self._stack: List[str] = []
+        self._snapshots: List[tracemalloc.Snapshot] = []
+        self._peaks: List[int] = []
+        self._has_nested: List[bool] = []
+        self._sampler: Optional[StackSampler] = None
+
+    # Tracer listener interface
+
+    def span_started(self, span: OpenSpan) -> None:
+        """Start profiling a stage, pausing the stage it is nested in."""
+        if span.category != STAGE:
+            return
+        if self.mode == "cpu":
+            if self._stack:
+                self.profiles[self._stack[-1]].disable()
+            elif self._sampler is None:
+                self._sampler = StackSampler(threading.get_ident(), self.interval, self._stack, self.stacks)
+                self._sampler.start()
+            self._stack.append(span.name)
+            self.profiles.setdefault(span.name, cProfile.Profile()).enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEBACK_FRAMES)
+            # The peak is reset per stage, so carry it over to the enclosing ones
+            peak = tracemalloc.get_traced_memory()[1]
+            self._peaks = [max(p, peak) for p in self._peaks]
+            tracemalloc.reset_peak()
+            self._has_nested = [True] * len(self._has_nested) + [False]
+            self._stack.append(span.name)
+            self._snapshots.append(tracemalloc.take_snapshot())
+            self._peaks.append(0)
+
+    def span_ended(self, span: OpenSpan) -> None:
+        """Finish profiling a stage and resume the stage it is nested in."""
+        if span.category != STAGE or not self._stack or self._stack[-1] != span.name:
+            return
+        if self.mode == "cpu":
+            self.profiles[span.name].disable()
+            self._stack.pop()
+            if self._stack:
+                self.profiles[self._stack[-1]].enable()
+        else:
+            self._end_memory_stage(span.name)
+
+    def _end_memory_stage(self, name: str) -> None:
+        """Record the allocations of a finished stage."""
+        peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+        self._peaks = [max(p, peak) for p in self._peaks]
+        start = self._snapshots.pop()
+        end = tracemalloc.take_snapshot()
+        # Leave out the bookkeeping of tracemalloc, tracing and this profiler;
+        # filtering statistics is much faster than filtering the traces
+        excluded = {tracemalloc.__file__, sys.modules[OpenSpan.__module__].__file__, __file__}
+        diffs = [diff for diff in end.compare_to(start, "traceback")
+                 if diff.traceback[-1].filename not in excluded]
+
+        # Growth per allocating line, from the most recent frame of each traceback
+        by_line: Dict[Tuple[str, int], List[int]] = {}
+        for diff in diffs:
+            frame = diff.traceback[-1]
+            totals = by_line.setdefault((frame.filename, frame.lineno), [0, 0])
+            totals[0] += diff.size_diff
+            totals[1] += diff.count_diff
+
+        if not self._has_nested.pop():
+            labels = ";".join(self._stack)
+            for diff in diffs:
+                if diff.size_diff > 0:
+                    frames = [f"{os.path.basename(f.filename)}:{f.lineno}" for f in diff.traceback]
+                    self.stacks[";".join([labels] + frames)] += diff.size_diff
+        self._stack.pop()
+
+        top = sorted(((f"{filename}:{lineno}", size, count)
+                      for (filename, lineno), (size, count) in by_line.items() if size > 0),
+                     key=lambda item: -item[1])
+        stats = self.memory.setdefault(name, {"net_bytes": 0, "peak_bytes": 0, "top": []})
+        stats["net_bytes"] += sum(diff.size_diff for diff in diffs)
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+        stats["top"] = sorted(stats["top"] + top[:self.top], key=lambda item: -item[1])[:self.top]
+        if not self._stack:
+            tracemalloc.stop()
+
+    def stop(self) -> None:
+        """Stop any profiling still running, such as after an error."""
+        if self._sampler:
+            self._sampler.stop()
+            self._sampler = None
+        for profile in self.profiles.values():
+            profile.disable()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._stack.clear()
+        self._snapshots.clear()
+        self._peaks.clear()
+        self._has_nested.clear()
+
+    # Reports
+
+    def cpu_summary(self) -> str:
+        """Format the top functions of every stage by cumulative time."""
+        sections = []
+        for name, profile in self.profiles.items():
+            out = io.StringIO()
+            stats = pstats.Stats(profile, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            sections.append(f"=== Stage: {name} ({stats.total_tt:.3f} s profiled)\n{out.getvalue().strip()}")
+        return "\n\n".join(sections) + "\n"
+
+    def memory_summary(self) -> str:
+        """Format the net, peak and top allocation sites of every stage."""
+        sections = []
+        for name, stats in self.memory.items():
+            lines = [f"=== Stage: {name}",
+                     f"net allocated: {stats['net_bytes'] / 1024:,.1f} KiB, "
+                     f"peak traced: {stats['peak_bytes'] / 1024:,.1f} KiB",
+                     f"{'size KiB':>12}{'blocks':>10}  location"]
+            for location, size, count in stats["top"]:
+                lines.append(f"{size / 1024:>12,.1f}{count:>10}  {location}")
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections) + "\n"
+
+    def save(self, directory: str, prefix: str = "profile") -> List[str]:
+        """
+        Save the profiles into a directory.
+
+        In cpu mode this writes ``<prefix>.prof`` with the stats of all
+        stages combined (for snakeviz or ``python -m pstats``), one
+        ``<prefix>_<stage>.prof`` per stage, ``<prefix>.collapsed`` with
+        sampled call stacks and ``<prefix>.txt`` with the top functions per
+        stage. In memory mode it writes ``<prefix>_memory.txt`` and
+        ``<prefix>_memory.collapsed`` with allocated bytes per call stack.
+        Collapsed stacks are in the format of flamegraph.pl, inferno and
+        speedscope, prefixed with the stage names.
+
+        Args:
+            directory: Directory to save the files in
+            prefix: File name prefix
+
+        Returns:
+            List[str]: Paths of the saved files
+        """
+        self.stop()
+        paths: List[Tuple[str, Any]] = []
+        if self.mode == "cpu":
+            combined = None
+            for name, profile in self.profiles.items():
+                stage_path = os.path.join(directory, f"{prefix}_{name}.prof")
+                profile.dump_stats(stage_path)
+                paths.append((stage_path, None))
+                if combined is None:
+                    combined = pstats.Stats(profile)
+                else:
+                    combined.add(profile)
+            if combined is not None:
+                combined_path = os.path.join(directory, f"{prefix}.prof")
+                combined.dump_stats(combined_path)
+                paths.insert(0, (combined_path, None))
+            paths.append((os.path.join(directory, f"{prefix}.collapsed"), _collapsed(self.stacks)))
+            paths.append((os.path.join(directory, f"{prefix}.txt"), self.cpu_summary()))
+        else:
+            paths.append((os.path.join(directory, f"{prefix}_memory.collapsed"),
+                          _collapsed(self.stacks)))
+            paths.append((os.path.join(directory, f"{prefix}_memory.txt"), self.memory_summary()))
+
+        for path, content in paths:
+            if content is not None:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+        return [path for path, _ in paths]
+
+
+def _collapsed(stacks: Counter) -> str:
+    """Format stack counts as collapsed stacks, one ``frame;frame count`` line each."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
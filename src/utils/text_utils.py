@@ -89,4 +89,103 @@ def split_into_sentences(text: str) -> List[str]:
         else:
             final_sentences.append(sentence)
             
-    return final_sentences
\ No newline at end of file
+    return final_sentences
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens for indexing and matching.
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        List[str]: Lowercase alphanumeric tokens in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def get_position_context(index: int, total_paragraphs: int) -> str:
+    """
+    Determine the position context of a paragraph within the document.
+    
+    Args:
+        index: The index of the paragraph
+        total_paragraphs: The total number of paragraphs in the document
+        
+    Returns:
+        str: A description of the paragraph's position ("beginning", "middle", "end")
+    """
+    if index < 2:
+        return "beginning"
+    elif index >= total_paragraphs - 2:
+        return "end"
+    else:
+        return "middle"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+    
+    Uses the common approximation of four characters per token for
+    English text, which is close enough for budgeting prompts.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, round(len(text) / 4))
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most a number of tokens, on sentence boundaries.
+    
+    Consecutive sentences are grouped while they fit the bound. A sentence
+    longer than the bound on its own, as in OCR output without punctuation,
+    is split between words, and a word longer than the bound between
+    characters.
+    
+    Args:
+        text: Text to split
+        max_tokens: Maximum estimated tokens of a chunk
+        
+    Returns:
+        List[str]: Chunks in order, a single chunk if the text fits the bound
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    
+    # Break sentences over the bound into pieces that fit
+    pieces: List[str] = []
+    for sentence in split_into_sentences(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        for word in sentence.split():
+            if estimate_tokens(word) <= max_tokens:
+                pieces.append(word)
+            else:
+                step = max_tokens * 4
+                pieces.extend(word[i:i + step] for i in range(0, len(word), step))
+    
+    # Group the pieces into chunks up to the bound
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append(current)
+            candidate = piece
+        current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
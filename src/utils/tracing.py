@@ -0,0 +1,218 @@
+"""
+Span-based tracing of pipeline stages.
+
+Code marks the work it does with ``span("name")`` blocks, or with
+``begin_span``/``end_span`` where a block does not fit. While a tracer is
+active, every span is recorded with its start time, duration and thread;
+otherwise spans cost almost nothing. Recorded spans can be exported in the
+Chrome trace event format, which chrome://tracing and Perfetto open
+directly, and summarized per span name. Listeners added to a tracer are
+told when each span starts and ends, so tools such as profilers can follow
+the pipeline stages.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# Category of the top-level pipeline stages
+STAGE = "stage"
+
+
+@dataclass
+class SpanRecord:
+    """A finished span."""
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class OpenSpan:
+    """A span that has been started but not yet ended."""
+    name: str
+    category: str
+    start: float
+    args: Dict[str, Any]
+
+
+class Tracer:
+    """Records spans from any thread."""
+
+    def __init__(self):
+        """Initialize an empty tracer; span times are relative to its creation."""
+        self.spans: List[SpanRecord] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._threads: Dict[int, int] = {}
+        # Objects with span_started(span) and span_ended(span) methods
+        self.listeners: List[Any] = []
+
+    def begin(self, name: str, category: str = "task", **args: Any) -> OpenSpan:
+        """Start a span that is finished with ``end``."""
+        span = OpenSpan(name, category, time.perf_counter(), args)
+        for listener in self.listeners:
+            listener.span_started(span)
+        # Start the clock again so listeners do not count toward the span
+        span.start = time.perf_counter()
+        return span
+
+    def end(self, span: OpenSpan) -> SpanRecord:
+        """Finish a span started with ``begin`` and record it."""
+        now = time.perf_counter()
+        for listener in reversed(self.listeners):
+            listener.span_ended(span)
+        ident = threading.get_ident()
+        with self._lock:
+            thread = self._threads.setdefault(ident, len(self._threads))
+            record = SpanRecord(span.name, span.category, span.start - self._origin,
+                                now - span.start, thread, span.args)
+            self.spans.append(record)
+        return record
+
+    @contextmanager
+    def span(self, name: str, category: str = "task", **args: Any) -> Iterator[OpenSpan]:
+        """Record the enclosed block as a span."""
+        open_span = self.begin(name, category, **args)
+        try:
+            yield open_span
+        finally:
+            self.end(open_span)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert the recorded spans to the Chrome trace event format.
+
+        Returns:
+            Dict[str, Any]: A trace with one complete ("X") event per span
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread,
+             "args": {"name": "main" if thread == 0 else f"worker-{thread}"}}
+            for thread in sorted(set(self._threads.values()))
+        ]
+        for record in sorted(self.spans, key=lambda r: (r.start, -r.duration)):
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": round(record.start * 1e6, 3),
+                "dur": round(record.duration * 1e6, 3),
+                "pid": pid,
+                "tid": record.thread,
+                "args": record.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded spans per name.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Count, total, mean and maximum
+            seconds of each span name, in order of first occurrence
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for record in sorted(self.spans, key=lambda r: r.start):
+            stats = result.setdefault(record.name, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += record.duration
+            stats["max"] = max(stats["max"], record.duration)
+        for stats in result.values():
+            stats["mean"] = stats["total"] / stats["count"]
+        return result
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Get the total seconds spent in each top-level stage."""
+        timings: Dict[str, float] = {}
+        for record in self.spans:
+            if record.category == STAGE:
+                timings[record.name] = timings.get(record.name, 0.0) + record.duration
+        return timings
+
+    def format_summary(self) -> str:
+        """Format the per-span summary as a text table."""
+        lines = [f"{'span':<24}{'count':>7}{'total s':>11}{'mean ms':>11}{'max ms':>11}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<24}{stats['count']:>7}{stats['total']:>11.3f}"
+                         f"{stats['mean'] * 1000:>11.1f}{stats['max'] * 1000:>11.1f}")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> str:
+        """
+        Save the Chrome trace and a per-span timing summary next to it.
+
+        Args:
+            path: Path of the trace file
+
+        Returns:
+            str: Path of the summary file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+        summary_path = os.path.splitext(path)[0] + "_summary.json"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        return summary_path
+
+
+# The tracer spans are recorded to, if any
+_active: Optional[Tracer] = None
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans with a new tracer."""
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """Stop recording spans and return the tracer that recorded them."""
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the active tracer, if tracing is on."""
+    return _active
+
+
+def span(name: str, category: str = "task", **args: Any):
+    """
+    Record the enclosed block as a span if tracing is on.
+
+    Args:
+        name: Span name, shared by all spans of the same kind of work
+        category: Span category, ``STAGE`` for top-level pipeline stages
+        **args: Details shown with the span in trace viewers
+
+    Returns:
+        A context manager
+    """
+    tracer = _active
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, category, **args)
+
+
+def begin_span(name: str, category: str = "task", **args: Any) -> Optional[OpenSpan]:
+    """Start a span if tracing is on; finish it with ``end_span``."""
+    tracer = _active
+    return tracer.begin(name, category, **args) if tracer else None
+
+
+def end_span(open_span: Optional[OpenSpan]) -> None:
+    """Finish a span started with ``begin_span``."""
+    tracer = _active
+    if tracer and open_span:
+        tracer.end(open_span)
@@ -0,0 +1,48 @@
+"""Tests for the summary alignment module."""
+import unittest
+
+from src.models.document import Document, Paragraph
+from src.synthesizers.alignment import AlignmentIndex, align_summary, summary_sentences
+
+
+class TestAlignment(unittest.TestCase):
+    """Test case for aligning summary sentences with source paragraphs."""
+
+    def setUp(self):
+        """Set up a document with clearly distinct paragraphs."""
+        self.document = Document(
+            metadata={"title": "Test Document"},
+            paragraphs=[
+                Paragraph(id="p-1", text="Solar panels convert sunlight into electricity for homes."),
+                Paragraph(id="p-2", text="Wind turbines generate power on windy coastal hills.",
+                          gist="Coastal wind farms produce energy."),
+                Paragraph(id="p-3", text="Battery storage keeps renewable power available at night."),
+            ]
+        )
+
+    def test_summary_sentences(self):
+        """Test that headings and bullet markers are not part of sentences."""
+        summary = "# Title\n\n## Key Points\n* ✓ First point. Second point.\nHeading\n---\nLast one."
+        self.assertEqual(summary_sentences(summary), ["First point.", "Second point.", "Last one."])
+
+    def test_align_summary(self):
+        """Test that sentences map to the paragraphs they were drawn from."""
+        summary = ("# Summary\n\n"
+                   "Batteries keep renewable power available at night. "
+                   "Coastal wind farms produce energy. "
+                   "Nothing here matches anything.")
+        alignment = align_summary(self.document, summary)
+
+        self.assertEqual([a.paragraph_ids[:1] for a in alignment], [["p-3"], ["p-2"], []])
+        self.assertEqual(alignment[1].to_dict()["sentence"], "Coastal wind farms produce energy.")
+        self.assertTrue(all(0 < score <= 1 for a in alignment for score in a.scores))
+
+    def test_scores_only_candidate_paragraphs(self):
+        """Test that paragraphs without shared shingles are never scored."""
+        index = AlignmentIndex(self.document)
+        result = index.align("Solar panels convert sunlight.", top_k=3, min_score=0.0)
+        self.assertEqual(result.paragraph_ids, ["p-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Tests for the content-addressed artifact store."""
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.models.document import Document, Paragraph
+from src.retrieval.inverted_index import INDEX_FILENAME, load_or_build_index
+from src.storage.artifact_store import COMPRESSED, LINKED, MANIFEST_FILENAME, ArtifactStore, read_manifest
+from src.utils.file_utils import atomic_write
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test case for storing, restoring and collecting run files."""
+
+    def setUp(self):
+        """Create an output directory and an input file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp_dir.name, "output")
+        os.makedirs(self.root)
+        self.input_path = os.path.join(self.tmp_dir.name, "essay.txt")
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            f.write("A paragraph of the essay.\n\n" * 200)
+        self.store = ArtifactStore(self.root)
+
+    def tearDown(self):
+        """Remove the output directory."""
+        self.tmp_dir.cleanup()
+
+    def make_run(self, name, summary="The summary.", extra=None):
+        """Write the files of a run and store them."""
+        run_dir = os.path.join(self.root, name)
+        os.makedirs(os.path.join(run_dir, "comparison_data"))
+        files = {"summary.txt": summary, "run_info.json": "{}",
+                 os.path.join("comparison_data", "sections-0.js"): "load();"}
+        files.update(extra or {})
+        for relative, content in files.items():
+            with open(os.path.join(run_dir, relative), 'w', encoding='utf-8') as f:
+                f.write(content)
+        self.store.store_run(run_dir, self.input_path)
+        return run_dir
+
+    def test_identical_files_are_stored_once(self):
+        """Test that reruns share blobs and keep their files readable in place."""
+        first = self.make_run("essay_1")
+        second = self.make_run("essay_2")
+        third = self.make_run("essay_3", summary="A different summary.")
+
+        manifest = read_manifest(second)
+        self.assertEqual(manifest["essay.txt"]["stored"], COMPRESSED)
+        self.assertEqual(manifest["summary.txt"]["stored"], LINKED)
+        self.assertNotIn("run_info.json", manifest)
+        self.assertFalse(os.path.exists(os.path.join(second, "essay.txt")))
+
+        # Runs with the same content link the same blob
+        self.assertTrue(os.path.samefile(os.path.join(first, "summary.txt"),
+                                         os.path.join(second, "summary.txt")))
+        self.assertFalse(os.path.samefile(os.path.join(first, "summary.txt"),
+                                          os.path.join(third, "summary.txt")))
+        with open(os.path.join(third, "summary.txt"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "A different summary.")
+
+        # Blobs: one input, two summaries, one script
+        self.assertEqual(len(list(self.store.blobs())), 4)
+        with gzip.open(self.store.blob_path(manifest["essay.txt"]["digest"], compressed=True)) as f:
+            self.assertEqual(f.read().decode("utf-8"), "A paragraph of the essay.\n\n" * 200)
+        stats = self.store.stats()
+        self.assertEqual(stats["runs"], 3)
+        self.assertLess(stats["stored_bytes"], stats["logical_bytes"] / 3)
+
+    def test_rewriting_a_stored_file(self):
+        """Test that rewriting a linked file in one run leaves the other runs' copies alone."""
+        first = self.make_run("essay_1", extra={INDEX_FILENAME: "{}"})
+        second = self.make_run("essay_2", extra={INDEX_FILENAME: "{}"})
+        self.assertTrue(os.path.samefile(os.path.join(first, INDEX_FILENAME),
+                                         os.path.join(second, INDEX_FILENAME)))
+
+        # A stale search index next to a reloaded document is rebuilt in place
+        document = Document(paragraphs=[Paragraph(id="p-1", text="Libraries teach adults.")])
+        load_or_build_index(document, os.path.join(first, "processed_document.json"))
+        with atomic_write(os.path.join(first, "summary.txt")) as f:
+            f.write("A rewritten summary.")
+
+        for name, content in ((INDEX_FILENAME, "{}"), ("summary.txt", "The summary.")):
+            self.assertFalse(os.path.samefile(os.path.join(first, name), os.path.join(second, name)))
+            with open(os.path.join(second, name), encoding='utf-8') as f:
+                self.assertEqual(f.read(), content)
+        with open(os.path.join(first, "summary.txt"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "A rewritten summary.")
+
+    def test_restore(self):
+        """Test that the compressed input copy can be written back into a run."""
+        run_dir = self.make_run("essay_1")
+        self.assertEqual(self.store.restore(run_dir), 1)
+        with open(os.path.join(run_dir, "essay.txt"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "A paragraph of the essay.\n\n" * 200)
+        self.assertEqual(self.store.restore(run_dir), 0)
+
+    def test_migrate(self):
+        """Test that runs written without the store are moved into it."""
+        run_dir = os.path.join(self.root, "essay_old")
+        os.makedirs(run_dir)
+        shutil.copy(self.input_path, run_dir)
+        with open(os.path.join(run_dir, "run_info.json"), 'w', encoding='utf-8') as f:
+            f.write('{"input": "data/essay.txt"}')
+        with open(os.path.join(run_dir, "summary.txt"), 'w', encoding='utf-8') as f:
+            f.write("The summary.")
+        self.make_run("essay_new")
+
+        self.assertEqual(self.store.migrate(), 1)
+        self.assertEqual(self.store.migrate(), 0)
+        self.assertFalse(os.path.exists(os.path.join(run_dir, "essay.txt")))
+        self.assertEqual(read_manifest(run_dir)["essay.txt"]["stored"], COMPRESSED)
+        self.assertTrue(os.path.samefile(os.path.join(run_dir, "summary.txt"),
+                                         os.path.join(self.root, "essay_new", "summary.txt")))
+
+    def test_collect_garbage(self):
+        """Test that only blobs of deleted runs are collected, after the grace period."""
+        first = self.make_run("essay_1", summary="Only in the first run.")
+        second = self.make_run("essay_2")
+        shutil.rmtree(first)
+
+        # Recent blobs survive, since a run being written may not have listed them yet
+        self.assertEqual(self.store.collect_garbage()["deleted"], 0)
+        self.assertEqual(self.store.collect_garbage(grace_seconds=-1, dry_run=True)["deleted"], 1)
+        self.assertEqual(len(list(self.store.blobs())), 4)
+
+        result = self.store.collect_garbage(grace_seconds=-1)
+        self.assertEqual((result["deleted"], result["kept"]), (1, 3))
+        self.assertEqual(self.store.referenced(),
+                         {entry["digest"] for entry in read_manifest(second).values()})
+
+        # Collecting a blob never touches the runs linking it
+        os.remove(os.path.join(second, MANIFEST_FILENAME))
+        self.store.collect_garbage(grace_seconds=-1)
+        self.assertEqual(list(self.store.blobs()), [])
+        with open(os.path.join(second, "summary.txt"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "The summary.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the benchmark corpus generator, fake LLM client and suite."""
+import unittest
+
+from benchmarks.corpus import CorpusSpec, generate_document, generate_text
+from benchmarks.fake_llm import FakeLLMClient
+from benchmarks.suite import compare, run_suite
+from src.models.document import StructuralTag
+from src.processors.text_processor import TextProcessor
+from src.synthesizers.basic_synthesis import refine_transcript
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test case for the benchmark tooling."""
+
+    def test_generate_text(self):
+        """Test that corpora are reproducible and follow the spec."""
+        spec = CorpusSpec(paragraphs=30, abbreviation_density=1.0, ellipsis_density=0.0, seed=3)
+        text = generate_text(spec)
+        self.assertEqual(text, generate_text(spec))
+        self.assertNotIn("...", text)
+
+        document = generate_document(spec)
+        self.assertEqual(len(document.paragraphs), 31)  # Title plus paragraphs
+
+        plain = generate_text(CorpusSpec(paragraphs=30, abbreviation_density=0.0, seed=3))
+        self.assertNotIn("e.g.", plain)
+        self.assertNotIn("Dr.", plain)
+
+    def test_processed_document(self):
+        """Test that annotated documents look processed."""
+        document = generate_document(CorpusSpec(paragraphs=10), processed=True)
+        self.assertEqual(document.paragraphs[0].structural_tag, StructuralTag.THESIS)
+        self.assertEqual(document.paragraphs[-1].structural_tag, StructuralTag.CONCLUSION)
+        self.assertTrue(all(p.gist for p in document.paragraphs))
+
+    def test_fake_llm_client(self):
+        """Test the whole processing pipeline against the fake client."""
+        document = generate_document(CorpusSpec(paragraphs=5))
+        processor = TextProcessor(api_key="test_key", request_delay=0)
+        processor.client = FakeLLMClient()
+        processor.process_document(document)
+
+        paragraphs = document.paragraphs
+        self.assertTrue(all(p.structural_tag != StructuralTag.UNKNOWN for p in paragraphs))
+        self.assertTrue(all(p.gist_sentences[0].image_tag for p in paragraphs))
+        self.assertEqual(processor.token_usage["calls"], processor.client.calls)
+        self.assertGreater(processor.token_usage["prompt_tokens"], 0)
+
+        summary = refine_transcript("# Summary\n\n* ✓ First point.", processor.client)
+        self.assertIn("First point.", summary)
+
+    def test_run_suite_and_compare(self):
+        """Test a suite run and its comparison with a baseline."""
+        results = run_suite("small", repeat=1, llm_latency=0,
+                            only=["split_into_sentences", "process_document"])
+        self.assertEqual(list(results["results"]), ["split_into_sentences", "process_document"])
+        self.assertGreater(results["results"]["process_document"]["throughput"], 0)
+
+        baseline = {"results": {
+            "split_into_sentences": {"median_s": results["results"]["split_into_sentences"]["median_s"] / 2},
+            "process_document": {"median_s": results["results"]["process_document"]["median_s"] * 2},
+        }}
+        rows = {row["name"]: row for row in compare(results, baseline, tolerance=0.25)}
+        self.assertTrue(rows["split_into_sentences"]["regression"])
+        self.assertFalse(rows["process_document"]["regression"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Tests for token-budgeted transcript packing."""
+import unittest
+
+from src.models.document import Document, Paragraph, StructuralTag, ArgumentRole
+from src.synthesizers.basic_synthesis import generate_transcript
+from src.synthesizers.budget import pack_transcript
+from src.utils.text_utils import estimate_tokens
+
+
+class TestTranscriptBudget(unittest.TestCase):
+    """Test case for transcript packing."""
+
+    def setUp(self):
+        """Set up a processed document with every structural tag."""
+        def paragraph(i, tag, gist):
+            return Paragraph(
+                id=f"p-{i}",
+                text=f"Paragraph number {i} has enough words to be included.",
+                structural_tag=tag,
+                argument_role=ArgumentRole.SUPPORTING,
+                gist=gist
+            )
+
+        self.document = Document(
+            metadata={"title": "Budget"},
+            paragraphs=[
+                paragraph(1, StructuralTag.THESIS, "The thesis is stated here."),
+                paragraph(2, StructuralTag.POINT, "The first point matters. It has a second sentence."),
+                paragraph(3, StructuralTag.EXAMPLE, "An example illustrates the first point in detail."),
+                paragraph(4, StructuralTag.EXAMPLE, "Another example adds more supporting detail."),
+                paragraph(5, StructuralTag.POINT, "The second point matters as well."),
+                paragraph(6, StructuralTag.CONCLUSION, "The conclusion wraps everything up.")
+            ]
+        )
+
+    def test_no_cuts_within_budget(self):
+        """Test that a generous budget leaves the transcript unchanged."""
+        result = pack_transcript(self.document, 10000)
+
+        self.assertEqual(result.transcript, generate_transcript(self.document))
+        self.assertEqual(result.cuts, [])
+
+    def test_cuts_least_important_first(self):
+        """Test that examples are cut before points, and thesis and conclusion are kept."""
+        full_tokens = estimate_tokens(generate_transcript(self.document))
+        result = pack_transcript(self.document, full_tokens - 15)
+
+        self.assertLessEqual(result.transcript_tokens, full_tokens - 15)
+        self.assertEqual([cut["structural_tag"] for cut in result.cuts], ["EXAMPLE", "EXAMPLE"])
+        self.assertEqual(result.cuts[0]["paragraph_id"], "p-4")
+        self.assertIn("The thesis is stated here.", result.transcript)
+        self.assertIn("The conclusion wraps everything up.", result.transcript)
+        self.assertNotIn("## Supporting Evidence", result.transcript)
+
+    def test_compresses_before_dropping(self):
+        """Test that multi-sentence gists are shortened before points are dropped."""
+        result = pack_transcript(self.document, 50)
+        actions = [(cut["paragraph_id"], cut["action"]) for cut in result.cuts]
+
+        self.assertIn(("p-2", "compressed"), actions)
+        self.assertLess(actions.index(("p-2", "compressed")), actions.index(("p-5", "dropped")))
+        self.assertEqual(result.to_dict()["budget_tokens"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for analyzing oversized paragraphs in chunks."""
+import threading
+import unittest
+
+from benchmarks.fake_llm import FakeLLMClient
+from src.models.document import Paragraph, StructuralTag
+from src.processors.text_processor import TextProcessor
+from src.utils.text_utils import estimate_tokens, split_into_chunks, split_into_sentences
+
+SENTENCE = "Public libraries across the region trained many adults to use online services."
+
+
+class RecordingClient(FakeLLMClient):
+    """A fake client that records the analysis prompts and the threads calling it."""
+
+    def __init__(self):
+        super().__init__(latency=0.02)
+        self.prompts = []
+        self.threads = set()
+        self._lock = threading.Lock()
+        self.chat.completions.create = self.create
+
+    def create(self, model, messages, **kwargs):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            if "document analysis" in messages[0]["content"]:
+                self.prompts.append(messages[-1]["content"])
+        return self.respond(messages, kwargs["max_tokens"])
+
+
+class TestChunking(unittest.TestCase):
+    """Test case for splitting paragraphs into token-bounded chunks and merging their analyses."""
+
+    def setUp(self):
+        """Create a processor that analyzes paragraphs over 100 tokens in chunks."""
+        self.processor = TextProcessor(api_key="test_key", request_delay=0, max_paragraph_tokens=100)
+        self.processor.client = RecordingClient()
+
+    def test_split_into_chunks(self):
+        """Test that chunks keep whole sentences, in order, within the bound."""
+        text = " ".join([SENTENCE] * 20)
+        chunks = split_into_chunks(text, 100)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(" ".join(chunks), text)
+        for chunk in chunks:
+            self.assertTrue(all(s == SENTENCE for s in split_into_sentences(chunk)))
+
+        self.assertEqual(split_into_chunks(SENTENCE, 100), [SENTENCE])
+
+    def test_split_without_sentence_boundaries(self):
+        """Test that text without punctuation is still split within the bound."""
+        text = " ".join(["scanned words run together without any stops"] * 60)
+        chunks = split_into_chunks(text, 100)
+        self.assertTrue(all(estimate_tokens(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(" ".join(chunks), text)
+
+        unbroken = "x" * 2000
+        self.assertEqual("".join(split_into_chunks(unbroken, 100)), unbroken)
+
+    def test_oversized_paragraph(self):
+        """Test that an oversized paragraph is analyzed in parallel chunks and merged."""
+        text = "For example, " + " ".join([SENTENCE] * 30)
+        paragraph = Paragraph(id="p-1", text=text)
+        self.processor.analyze_paragraph(paragraph, "middle", "Title")
+
+        chunks = split_into_chunks(text, 100)
+        prompts = self.processor.client.prompts
+        self.assertEqual(len(prompts), len(chunks))
+        self.assertTrue(all(text not in prompt for prompt in prompts))
+        self.assertTrue(any(f"part 1 of {len(chunks)}" in prompt for prompt in prompts))
+        self.assertGreater(len(self.processor.client.threads), 1)
+
+        # One merged result, with the gist sentences of every chunk
+        self.assertNotEqual(paragraph.structural_tag, StructuralTag.UNKNOWN)
+        self.assertGreaterEqual(len(paragraph.gist_sentences), len(chunks))
+        self.assertEqual(paragraph.gist, " ".join(s.text for s in paragraph.gist_sentences))
+        self.assertTrue(all(s.image_tag for s in paragraph.gist_sentences))
+        self.assertEqual(self.processor.token_usage["calls"],
+                         len(chunks) + len(paragraph.gist_sentences))
+
+    def test_short_paragraph_is_whole(self):
+        """Test that a paragraph within the bound is analyzed in a single call."""
+        paragraph = Paragraph(id="p-1", text=SENTENCE)
+        self.processor.analyze_paragraph(paragraph, "middle", "Title")
+        self.assertEqual(len(self.processor.client.prompts), 1)
+        self.assertNotIn("part 1", self.processor.client.prompts[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
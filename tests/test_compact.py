@@ -0,0 +1,82 @@
+"""Tests for the compact document representation."""
+import unittest
+
+from src.models.compact import CompactDocument, ParagraphView
+from src.models.document import (
+    Document, Paragraph, GistSentence, StructuralTag, ArgumentRole
+)
+from src.synthesizers.basic_synthesis import generate_transcript
+from src.synthesizers.comparison import create_comparison_html
+
+
+class TestCompactDocument(unittest.TestCase):
+    """Test case for CompactDocument functionality."""
+
+    def setUp(self):
+        """Set up a processed test document."""
+        self.document = Document(
+            metadata={"title": "Test Document"},
+            paragraphs=[
+                Paragraph(id="p-1", text="Test Document"),
+                Paragraph(
+                    id="p-2",
+                    text="This introduction states the main thesis of the test.",
+                    structural_tag=StructuralTag.THESIS,
+                    argument_role=ArgumentRole.SUPPORTING,
+                    gist="The test has a thesis.",
+                    gist_sentences=[GistSentence(text="The test has a thesis.", image_tag="A flag")]
+                ),
+                Paragraph(
+                    id="p-3",
+                    text="However, some people disagree with the whole idea entirely.",
+                    structural_tag=StructuralTag.POINT,
+                    argument_role=ArgumentRole.COUNTERPOINT,
+                    gist="Some disagree. They have reasons.",
+                    gist_sentences=[
+                        GistSentence(text="Some disagree.", image_tag="Crossed arms"),
+                        GistSentence(text="They have reasons.", image_tag="A list")
+                    ]
+                ),
+                Paragraph(
+                    id="p-4",
+                    text="In conclusion, the thesis holds up under scrutiny.",
+                    structural_tag=StructuralTag.CONCLUSION,
+                    argument_role=ArgumentRole.SUPPORTING,
+                    gist="The thesis holds."
+                )
+            ]
+        )
+
+    def test_round_trip(self):
+        """Test that converting to compact form and back preserves content."""
+        compact = CompactDocument.from_document(self.document)
+        self.assertEqual(compact.to_document(), self.document)
+
+    def test_views_look_like_paragraphs(self):
+        """Test that paragraph views expose the Paragraph attributes."""
+        compact = CompactDocument.from_document(self.document)
+        view = compact.paragraphs[2]
+
+        self.assertIsInstance(view, ParagraphView)
+        self.assertEqual(view.id, "p-3")
+        self.assertEqual(view.structural_tag, StructuralTag.POINT)
+        self.assertEqual(view.argument_role, ArgumentRole.COUNTERPOINT)
+        self.assertEqual([s.image_tag for s in view.gist_sentences], ["Crossed arms", "A list"])
+        self.assertEqual(view.word_count, 9)
+        self.assertEqual(compact.paragraphs[-1].id, "p-4")
+        self.assertEqual(len(compact.paragraphs[1:3]), 2)
+        self.assertEqual(compact.tag_counts(), {"THESIS": 1, "POINT": 1, "CONCLUSION": 1, "UNKNOWN": 1})
+
+    def test_synthesis_accepts_compact_document(self):
+        """Test that existing synthesis code produces identical output."""
+        compact = CompactDocument.from_document(self.document)
+
+        self.assertEqual(generate_transcript(compact), generate_transcript(self.document))
+        self.assertEqual(
+            create_comparison_html(compact, "Summary"),
+            create_comparison_html(self.document, "Summary")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
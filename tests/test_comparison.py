@@ -1,10 +1,22 @@
 """Tests for the comparison module."""
+import io
+import json
 import unittest
 import tempfile
 import os
 
 from src.models.document import Document, Paragraph
-from src.synthesizers.comparison import create_comparison_html, save_comparison
+from src.synthesizers.comparison import (
+    _iter_paragraph_sections,
+    _template_classes,
+    _split_into_sections,
+    create_comparison_html,
+    page_stylesheet,
+    save_comparison,
+    save_lazy_comparison,
+    write_comparison_html,
+)
+from src.synthesizers.stylesheet import is_supported
 
 
 class TestComparison(unittest.TestCase):
@@ -72,6 +84,95 @@ The document effectively demonstrates the structure of a typical academic paper.
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
 
+    def test_paragraph_sections_match_joined_text(self):
+        """Test that streamed sections equal those of the joined document text."""
+        texts = [p.text for p in self.test_document.paragraphs]
+        texts += ["Heading\n-------\nUnderlined section.", "#", "# Spans the break", "Tail text."]
+        self.assertEqual(list(_iter_paragraph_sections(texts)),
+                         _split_into_sections("\n\n".join(texts)))
+
+    def test_write_comparison_html_to_stream(self):
+        """Test that streaming produces the same page as building it in memory."""
+        stream = io.StringIO()
+        write_comparison_html(self.test_document, self.test_synthesis, stream)
+        self.assertEqual(stream.getvalue(),
+                         create_comparison_html(self.test_document, self.test_synthesis))
+        self.assertIn('&quot;synthesis&quot;', stream.getvalue())
+
+    def test_save_lazy_comparison(self):
+        """Test that a lazy page keeps its sections and JSON data in sidecar files."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            page_path = os.path.join(tmp_dir, "comparison.html")
+            data_dir = save_lazy_comparison(self.test_document, self.test_synthesis, page_path,
+                                            sections_per_chunk=2)
+
+            self.assertEqual(data_dir, os.path.join(tmp_dir, "comparison_data"))
+            with open(page_path, 'r', encoding='utf-8') as f:
+                page = f.read()
+            self.assertIn("Summary of Test Document", page)
+            self.assertNotIn("abstract with important information", page)
+
+            # Every placeholder has a chunk, and the chunks hold all original sections
+            names = sorted(n for n in os.listdir(data_dir) if n.startswith("sections-"))
+            self.assertEqual(len(names), 3)
+            sections = []
+            for name in names:
+                self.assertIn(f'data-chunk="{name}"', page)
+                with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                    payload = f.read()
+                prefix = f'loadComparisonChunk("{name}", '
+                self.assertTrue(payload.startswith(prefix))
+                for title, pieces in json.loads(payload[len(prefix):-3]):
+                    sections.append((title, "".join(piece[1] for piece in pieces)))
+            texts = "\n\n".join(p.text for p in self.test_document.paragraphs)
+            self.assertEqual(sections, _split_into_sections(texts))
+
+            with open(os.path.join(data_dir, "document.js"), 'r', encoding='utf-8') as f:
+                payload = f.read()
+            data = json.loads(payload[len("loadComparisonDocument("):-3])
+            self.assertEqual(data["synthesis"], self.test_synthesis)
+
+    def test_offline_stylesheet(self):
+        """Test that pages inline a stylesheet covering every template class."""
+        html = create_comparison_html(self.test_document, self.test_synthesis)
+
+        self.assertNotIn("cdn.tailwindcss.com", html)
+        self.assertNotIn("@apply", html)
+        self.assertIn(page_stylesheet(), html)
+        self.assertIs(page_stylesheet(), page_stylesheet())
+        self.assertEqual([c for c in _template_classes() if not is_supported(c)], [])
+        self.assertIn(".hidden { display: none; }", page_stylesheet())
+
+    def test_aligned_sentences_link_to_sources(self):
+        """Test that aligned summary sentences link to anchored source paragraphs."""
+        alignment = [
+            {"sentence": "This document contains an abstract, introduction, main points with examples, "
+                         "and a conclusion.", "paragraph_ids": ["p-2", "p-6"], "scores": [0.5, 0.3]},
+            {"sentence": "The document effectively demonstrates the structure of a typical academic paper.",
+             "paragraph_ids": [], "scores": []},
+        ]
+        html = create_comparison_html(self.test_document, self.test_synthesis, alignment)
+
+        self.assertIn('href="#src-p-2"', html)
+        self.assertIn('data-sources="p-2 p-6"', html)
+        self.assertEqual(html.count("highlightSources(this)"), 1)
+        for paragraph in self.test_document.paragraphs:
+            self.assertEqual(html.count(f'id="src-{paragraph.id}"'), 1)
+
+    def test_unmatched_sentence_does_not_stop_links(self):
+        """Test that a sentence missing from the rendered sections skips only its own link."""
+        synthesis = ("# Overview\n\nLibraries matter a lot.\n- Adults learned online skills.\n\n"
+                     "# Conclusion\n\nFunding should grow.")
+        alignment = [
+            {"sentence": sentence, "paragraph_ids": ["p-2"], "scores": [0.5]}
+            for sentence in ("Libraries matter a lot.", "Adults learned online skills.", "Funding should grow.")
+        ]
+        html = create_comparison_html(self.test_document, synthesis, alignment)
+
+        # The line above the bullet is taken as a heading, so only it is unlinked
+        self.assertEqual(html.count("highlightSources(this)"), 2)
+        self.assertRegex(html, r'highlightSources\(this\)">Funding should grow\.</a>')
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
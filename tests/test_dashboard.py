@@ -0,0 +1,34 @@
+"""Tests for the runs dashboard."""
+import unittest
+
+from src.reporting.dashboard import render_dashboard
+from src.reporting.run_index import COLUMNS, RunIndex
+
+
+class TestDashboard(unittest.TestCase):
+    """Test case for rendering the runs dashboard."""
+
+    def test_render_dashboard(self):
+        """Test that every run gets a row and aggregates are shown."""
+        rows = [
+            {"run": "a_20250102_090000", "title": "First <Doc>", "reduction_pct": 80.0,
+             "prompt_tokens": 100, "completion_tokens": 20, "has_comparison": True},
+            {"run": "b_20250101_090000", "title": "Second", "reduction_pct": 60.0,
+             "has_comparison": False},
+        ]
+        columns = {column: [row.get(column) for row in rows] for column in COLUMNS}
+        for tag in ("thesis", "point", "example", "conclusion", "unknown"):
+            columns[f"tag_{tag}"] = [1, 0]
+        page = render_dashboard(RunIndex(columns))
+
+        self.assertNotIn("cdn.tailwindcss.com", page)
+        self.assertIn('href="a_20250102_090000/comparison.html"', page)
+        self.assertIn("First &lt;Doc&gt;", page)
+        self.assertEqual(page.count("<tr>"), 3)
+        self.assertIn("70.0 %", page)
+        self.assertIn(">120<", page)
+        self.assertIn(".text-right {", page)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for processing under a deadline."""
+import unittest
+
+from benchmarks.corpus import CorpusSpec, generate_document
+from benchmarks.fake_llm import FakeLLMClient
+from src.models.document import GistSentence, Paragraph, StructuralTag
+from src.models.serialization import FORMAT_JSON, dumps, loads
+from src.processors.deadline import (
+    ANALYSIS_FIELDS, IMAGE_TAGS, Deadline, degraded_fields
+)
+from src.processors.text_processor import TextProcessor
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowClient(FakeLLMClient):
+    """A fake client whose calls each take one second of a fake clock."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.prompts = []
+        self.chat.completions.create = self.create
+
+    def create(self, model, messages, **kwargs):
+        self.clock.now += 1.0
+        self.prompts.append(messages[-1]["content"])
+        return self.respond(messages, kwargs["max_tokens"])
+
+
+class UnparseableClient(SlowClient):
+    """A slow fake client whose responses are never valid JSON."""
+
+    def create(self, model, messages, **kwargs):
+        response = super().create(model, messages, **kwargs)
+        response.choices[0].message.content = "Sorry, I cannot help with that."
+        return response
+
+
+def make_document():
+    """Create a document with a thesis and a conclusion cue in the middle."""
+    document = generate_document(CorpusSpec(paragraphs=10, seed=3))
+    document.paragraphs[6].text = "In conclusion, " + document.paragraphs[6].text
+    return document
+
+
+class TestDeadline(unittest.TestCase):
+    """Test case for prioritizing, degrading and completing deferred work."""
+
+    def setUp(self):
+        """Create a processor whose API calls advance a fake clock."""
+        self.clock = FakeClock()
+        self.processor = TextProcessor(api_key="test_key", request_delay=0)
+        self.processor.client = SlowClient(self.clock)
+
+    def test_deadline(self):
+        """Test that important paragraphs come first and the rest is degraded and marked."""
+        document = make_document()
+        self.processor.process_document(document, deadline=Deadline(6.5, self.clock))
+        self.assertLessEqual(self.clock.now, 7.0)
+
+        degraded = degraded_fields(document)
+        by_index = {i: degraded.get(p.id, []) for i, p in enumerate(document.paragraphs)}
+        # The first, last and cued conclusion paragraphs are analyzed by the model
+        for i in (1, 6, 10):
+            self.assertNotIn("gist", by_index[i])
+            self.assertIn(IMAGE_TAGS, by_index[i])
+        self.assertEqual(by_index[0], [])  # The title needs no analysis
+
+        # The others are analyzed locally, without image tags
+        local = [i for i, fields in by_index.items() if "gist" in fields]
+        self.assertTrue(local)
+        for i in local:
+            paragraph = document.paragraphs[i]
+            self.assertEqual(by_index[i], list(ANALYSIS_FIELDS) + [IMAGE_TAGS])
+            self.assertNotEqual(paragraph.structural_tag, StructuralTag.UNKNOWN)
+            self.assertTrue(paragraph.text.startswith(paragraph.gist))
+            self.assertEqual([s.image_tag for s in paragraph.gist_sentences], [""])
+
+    def test_complete_deferred_work(self):
+        """Test that processing a saved degraded document only does the deferred work."""
+        document = make_document()
+        self.processor.process_document(document, deadline=Deadline(4.5, self.clock))
+        finished = {p.id: p.gist for p in document.paragraphs
+                    if p.gist and "gist" not in degraded_fields(document).get(p.id, [])}
+        self.assertTrue(finished)
+
+        # The degraded fields survive saving and loading
+        document = loads(dumps(document, FORMAT_JSON)).document
+        deferred = degraded_fields(document)
+        analyses = sum(1 for fields in deferred.values() if "gist" in fields)
+        self.processor.client.prompts.clear()
+        self.processor.process_document(document)
+
+        # Only the deferred paragraphs are analyzed again
+        self.assertEqual(degraded_fields(document), {})
+        self.assertNotIn("degraded", document.metadata)
+        analysis_prompts = [p for p in self.processor.client.prompts if "Paragraph:" in p]
+        self.assertEqual(len(analysis_prompts), analyses)
+        for paragraph_id, gist in finished.items():
+            paragraph = next(p for p in document.paragraphs if p.id == paragraph_id)
+            self.assertEqual(paragraph.gist, gist)
+            self.assertTrue(all(s.image_tag for s in paragraph.gist_sentences))
+
+    def test_no_call_after_deadline(self):
+        """Test that no escalation or image tag call is made once a call ran past the deadline."""
+        self.processor.client = UnparseableClient(self.clock)
+        document = make_document()
+        self.processor.process_document(document, deadline=Deadline(0.5, self.clock))
+        self.assertEqual(len(self.processor.client.prompts), 1)
+        degraded = degraded_fields(document)
+        self.assertTrue(all("gist" in degraded[p.id] for p in document.paragraphs[1:]))
+
+        # The second image tag of a paragraph is deferred rather than requested
+        self.processor.client = SlowClient(self.clock)
+        paragraph = Paragraph(id="p-1", text="First. Second.",
+                              gist_sentences=[GistSentence(text="First."), GistSentence(text="Second.")])
+        self.processor._deadline = Deadline(0.5, self.clock)
+        self.processor.add_image_tags(paragraph)
+        self.assertEqual(len(self.processor.client.prompts), 1)
+        self.assertEqual(paragraph.gist_sentences[1].image_tag, "")
+
+    def test_without_deadline(self):
+        """Test that a document processed without a deadline records nothing degraded."""
+        document = make_document()
+        self.processor.process_document(document)
+        self.assertNotIn("degraded", document.metadata)
+        self.assertTrue(all(s.image_tag for p in document.paragraphs for s in p.gist_sentences))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for the offline extractive summarizer."""
+import os
+import time
+import unittest
+
+from benchmarks.corpus import CorpusSpec, generate_document
+from src.extractors.text_extractor import TextExtractor
+from src.models.document import Document, Paragraph
+from src.synthesizers.extractive import extractive_summary
+from src.utils.text_utils import get_position_context
+
+
+class TestExtractiveSummary(unittest.TestCase):
+    """Test case for extractive summarization."""
+
+    def test_summary_of_sample_document(self):
+        """Test summarizing a real document without any API calls."""
+        path = os.path.join(os.path.dirname(__file__), "..", "data", "short_sample.txt")
+        document = TextExtractor.extract_from_file(path)
+        original = " ".join(p.text for p in document.paragraphs)
+
+        summary = extractive_summary(document, ratio=0.2)
+        body = summary.split("\n\n")[1:]
+
+        self.assertTrue(summary.startswith("# The Importance of Digital Literacy"))
+        self.assertTrue(body)
+        self.assertLess(len(summary.split()), len(original.split()) / 2)
+        # Every extracted sentence comes verbatim from the original text
+        for part in body:
+            self.assertIn(part.split(". ")[0], original)
+
+    def test_respects_max_sentences(self):
+        """Test that the number of extracted sentences is bounded."""
+        paragraphs = [
+            Paragraph(id=f"p-{i}", text=f"Sentence number {i} talks about topic {i % 3} in detail.")
+            for i in range(40)
+        ]
+        summary = extractive_summary(Document(paragraphs=paragraphs), ratio=1.0, max_sentences=4)
+
+        self.assertEqual(summary.count("Sentence number"), 4)
+
+    def test_long_document(self):
+        """Test that a document of 1000 paragraphs is summarized within seconds."""
+        document = generate_document(CorpusSpec(paragraphs=1000, seed=1))
+        start = time.perf_counter()
+        summary = extractive_summary(document)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertTrue(summary)
+
+    def test_empty_document(self):
+        """Test summarizing a document without usable content."""
+        document = Document(paragraphs=[Paragraph(id="p-1", text="Title")])
+        self.assertEqual(extractive_summary(document), "No content to summarize.")
+
+    def test_position_context(self):
+        """Test paragraph position descriptions."""
+        self.assertEqual(
+            [get_position_context(i, 6) for i in range(6)],
+            ["beginning", "beginning", "middle", "middle", "end", "end"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for the inverted index module."""
+import os
+import tempfile
+import unittest
+
+from src.models.document import Document, Paragraph, GistSentence
+from src.retrieval.inverted_index import (
+    InvertedIndex, focus_document, index_path_for, load_or_build_index
+)
+
+
+class TestInvertedIndex(unittest.TestCase):
+    """Test case for InvertedIndex functionality."""
+
+    def setUp(self):
+        """Set up a processed test document."""
+        self.document = Document(
+            metadata={"title": "Sports"},
+            paragraphs=[
+                Paragraph(id="p-1", text="Basketball is played on a court with two hoops.",
+                          gist="Basketball uses hoops."),
+                Paragraph(id="p-2", text="Football teams score touchdowns in the end zone.",
+                          gist="Football scores touchdowns."),
+                Paragraph(id="p-3", text="The championship went to the team with the best defense.",
+                          gist="Defense wins championships.",
+                          gist_sentences=[GistSentence(text="Defense wins championships.",
+                                                       image_tag="A basketball trophy")]),
+                Paragraph(id="p-4", text="Basketball players train their defense every day.",
+                          gist="Basketball training focuses on defense.")
+            ]
+        )
+        self.index = InvertedIndex.build(self.document)
+
+    def test_search_ranks_relevant_paragraphs(self):
+        """Test BM25 ranking of query matches."""
+        results = self.index.search("basketball defense", top_k=2)
+
+        self.assertEqual([i for i, _ in results], [3, 2])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(self.index.search("cricket"), [])
+
+    def test_focus_document(self):
+        """Test that focused documents keep the original paragraph order."""
+        focused = focus_document(self.document, self.index, "basketball defense", top_k=2)
+
+        self.assertEqual([p.id for p in focused.paragraphs], ["p-3", "p-4"])
+        self.assertEqual(focused.metadata["query"], "basketball defense")
+        self.assertNotIn("query", self.document.metadata)
+
+    def test_persistence(self):
+        """Test saving the index next to a processed document and reloading it."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            processed_path = os.path.join(tmp_dir, "processed_document.json")
+            index = load_or_build_index(self.document, processed_path)
+            self.assertTrue(os.path.exists(index_path_for(processed_path)))
+
+            loaded = InvertedIndex.load(index_path_for(processed_path))
+            self.assertEqual(loaded.search("touchdowns"), index.search("touchdowns"))
+
+            # A changed document invalidates the saved index
+            self.document.paragraphs.pop()
+            rebuilt = load_or_build_index(self.document, processed_path)
+            self.assertEqual(len(rebuilt), 3)
+
+            # So does a document with the same paragraph ids but other content
+            self.document.paragraphs[0].text = "Quantum computers store qubits."
+            self.assertIn("qubits", load_or_build_index(self.document, processed_path).postings)
+            self.document.paragraphs[2].gist_sentences[0].image_tag = "A gold medal"
+            self.assertIn("medal", load_or_build_index(self.document, processed_path).postings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Memory budget tests for large documents.
+
+Peak memory of extraction, JSON export and comparison rendering is measured
+in fresh interpreters and checked against budgets in bytes per input byte.
+By default a small input keeps the tests quick; set MEMORY_BUDGET_MB to run
+them on large inputs, for example:
+
+    MEMORY_BUDGET_MB=100 python -m pytest tests/test_memory_budget.py -s
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+from benchmarks.memory import format_report, measure, write_input
+
+# Input size in MB
+SIZE_MB = float(os.getenv("MEMORY_BUDGET_MB", "1"))
+
+# Peak bytes per input byte allowed for each operation. Lower these when a
+# change reduces memory use, so the improvement cannot silently regress.
+BUDGETS = {
+    "extraction": 4.0,
+    "json_export": 0.25,
+    "comparison": 7.5,
+}
+
+# Resident memory that is not proportional to the input, such as allocator arenas
+RSS_SLACK_BYTES = 16 * 2**20
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Test case for the peak memory of the pipeline stages."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Write the synthetic input shared by all operations."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.input_path = os.path.join(cls.temp_dir.name, "input.txt")
+        write_input(cls.input_path, int(SIZE_MB * 2**20))
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        """Report the measurements and remove the input."""
+        if cls.results:
+            print(f"\n{format_report(cls.results)}", file=sys.stderr)
+        cls.temp_dir.cleanup()
+
+    def check_budget(self, operation):
+        """Measure an operation and check its peaks against its budget."""
+        result = measure(operation, self.input_path)
+        self.results.append(result)
+        budget = BUDGETS[operation]
+
+        self.assertLessEqual(
+            result["peak_traced_per_input_byte"], budget,
+            f"{operation} allocated {result['peak_traced_per_input_byte']} bytes per input byte "
+            f"at its peak, over the budget of {budget}")
+        self.assertLessEqual(
+            result["peak_rss_bytes"], budget * result["input_bytes"] + RSS_SLACK_BYTES,
+            f"{operation} grew the resident set by {result['peak_rss_per_input_byte']} bytes "
+            f"per input byte at its peak, over the budget of {budget}")
+
+    def test_extraction(self):
+        """Test the peak memory of extracting a document from a text file."""
+        self.check_budget("extraction")
+
+    def test_json_export(self):
+        """Test the peak memory of saving a processed document as JSON."""
+        self.check_budget("json_export")
+
+    def test_comparison(self):
+        """Test the peak memory of rendering the comparison page."""
+        self.check_budget("comparison")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Tests for the LLM call metrics module."""
+import os
+import tempfile
+import unittest
+import urllib.request
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.processors.text_processor import TextProcessor
+from src.utils.metrics import (
+    ANALYZE, LLM_CALLS, LLM_IN_FLIGHT, LLM_LATENCY, LLM_PARSE_FAILURES, LLM_TOKENS,
+    Counter, Gauge, Histogram, Registry, serve_metrics, track_llm_call
+)
+
+
+def _response(content, prompt_tokens=10, completion_tokens=5):
+    """Build a chat completion response with the given content and usage."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    )
+
+
+class TestMetrics(unittest.TestCase):
+    """Test case for the metric types and the LLM call tracking."""
+
+    def test_render(self):
+        """Test the Prometheus text format of each metric type."""
+        registry = Registry()
+        counter = registry.register(Counter("calls_total", "Calls.", ("call",)))
+        gauge = registry.register(Gauge("in_flight", "In flight."))
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("call",), buckets=(0.5, 1)))
+        counter.inc(call='say "hi"')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        histogram.observe(0.2, call="a")
+        histogram.observe(0.7, call="a")
+        histogram.observe(3, call="a")
+
+        self.assertEqual(registry.render(), "\n".join([
+            "# HELP calls_total Calls.",
+            "# TYPE calls_total counter",
+            'calls_total{call="say \\"hi\\""} 1',
+            "# HELP in_flight In flight.",
+            "# TYPE in_flight gauge",
+            "in_flight 1",
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{call="a",le="0.5"} 1',
+            'latency_seconds_bucket{call="a",le="1"} 2',
+            'latency_seconds_bucket{call="a",le="+Inf"} 3',
+            'latency_seconds_sum{call="a"} 3.9',
+            'latency_seconds_count{call="a"} 3',
+        ]) + "\n")
+
+        with self.assertRaises(ValueError):
+            counter.inc(-1, call="a")
+        with self.assertRaises(ValueError):
+            counter.inc(kind="a")
+        with self.assertRaises(ValueError):
+            registry.register(Counter("calls_total", "Again."))
+
+    def test_track_llm_call(self):
+        """Test that successful and failed calls are counted and timed."""
+        ok = LLM_CALLS.get(call="test", outcome="ok")
+        errors = LLM_CALLS.get(call="test", outcome="error")
+        with track_llm_call("test"):
+            self.assertEqual(LLM_IN_FLIGHT.get(call="test"), 1)
+        with self.assertRaises(RuntimeError):
+            with track_llm_call("test"):
+                raise RuntimeError("timeout")
+
+        self.assertEqual(LLM_IN_FLIGHT.get(call="test"), 0)
+        self.assertEqual(LLM_CALLS.get(call="test", outcome="ok"), ok + 1)
+        self.assertEqual(LLM_CALLS.get(call="test", outcome="error"), errors + 1)
+        self.assertGreaterEqual(LLM_LATENCY.count(call="test"), 2)
+
+    def test_text_processor_metrics(self):
+        """Test that paragraph analysis records tokens and parse failures."""
+        responses = [
+            # Bare JSON is found by the regex
+            _response('{"structural_tag": "POINT", "argument_role": "SUPPORTING", "gist": "A point."}'),
+            _response("A chart"),
+            # No braces at all: the fallback parser runs and fails
+            _response("I cannot analyze this."),
+        ]
+        with patch('src.processors.text_processor.OpenAI') as mock_openai:
+            mock_openai.return_value.chat.completions.create.side_effect = responses
+            processor = TextProcessor(api_key="test_key")
+
+            prompt_tokens = LLM_TOKENS.get(call=ANALYZE, kind="prompt")
+            fallbacks = LLM_PARSE_FAILURES.get(call=ANALYZE, kind="fallback")
+            errors = LLM_PARSE_FAILURES.get(call=ANALYZE, kind="error")
+            processor._analyze_paragraph("Some paragraph text here.", "beginning", "Title")
+            processor._analyze_paragraph("Another paragraph text here.", "end", "Title")
+
+        self.assertEqual(LLM_TOKENS.get(call=ANALYZE, kind="prompt"), prompt_tokens + 20)
+        self.assertEqual(LLM_PARSE_FAILURES.get(call=ANALYZE, kind="fallback"), fallbacks + 1)
+        self.assertEqual(LLM_PARSE_FAILURES.get(call=ANALYZE, kind="error"), errors + 1)
+        self.assertEqual(processor.token_usage["calls"], 3)
+
+    def test_write_and_serve(self):
+        """Test writing the metrics file and serving the metrics endpoint."""
+        registry = Registry()
+        registry.register(Counter("runs_total", "Runs.")).inc()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "llm.prom")
+            registry.write(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("runs_total 1\n", f.read())
+            self.assertEqual(os.listdir(temp_dir), ["llm.prom"])
+
+        server = serve_metrics(0, registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                self.assertIn("runs_total 1", response.read().decode("utf-8"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the stage profiling module."""
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from src.utils.profiling import StageProfiler
+from src.utils.tracing import STAGE, Tracer
+
+
+def _busy(seconds):
+    """Keep the CPU busy for a while."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _allocate(count):
+    """Allocate and keep a list of strings."""
+    return [f"item {i}" * 4 for i in range(count)]
+
+
+class TestProfiling(unittest.TestCase):
+    """Test case for profiling nested pipeline stages."""
+
+    def run_stages(self, profiler, work):
+        """Run an outer stage with two nested stages, the second doing the work."""
+        tracer = Tracer()
+        tracer.listeners.append(profiler)
+        with tracer.span("run", STAGE):
+            with tracer.span("extraction", STAGE):
+                pass
+            with tracer.span("not a stage"):
+                pass
+            with tracer.span("rendering", STAGE):
+                result = work()
+        return result
+
+    def test_cpu(self):
+        """Test that work is attributed to the stage it ran in."""
+        profiler = StageProfiler("cpu", interval=0.001)
+        self.run_stages(profiler, lambda: _busy(0.05))
+        self.assertEqual(list(profiler.profiles), ["run", "extraction", "rendering"])
+
+        def busy_calls(name):
+            stats = pstats.Stats(profiler.profiles[name]).stats
+            return sum(calls for (_, _, function), (calls, *_rest) in stats.items() if function == "_busy")
+
+        self.assertEqual(busy_calls("rendering"), 1)
+        self.assertEqual(busy_calls("run"), 0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = profiler.save(temp_dir)
+            self.assertEqual(sorted(os.listdir(temp_dir)), sorted(os.path.basename(p) for p in paths))
+            self.assertIn("profile.prof", os.listdir(temp_dir))
+            with open(os.path.join(temp_dir, "profile.collapsed"), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertTrue(any(line.startswith("run;rendering;") and "_busy" in line for line in lines))
+            with open(os.path.join(temp_dir, "profile.txt"), encoding="utf-8") as f:
+                self.assertIn("=== Stage: rendering", f.read())
+
+    def test_memory(self):
+        """Test the allocations and peaks recorded per stage."""
+        profiler = StageProfiler("memory", top=5)
+        kept = self.run_stages(profiler, lambda: _allocate(5000))
+        self.assertEqual(len(kept), 5000)
+
+        rendering, run = profiler.memory["rendering"], profiler.memory["run"]
+        self.assertGreater(rendering["net_bytes"], 100_000)
+        self.assertGreaterEqual(run["peak_bytes"], rendering["peak_bytes"])
+        self.assertIn("test_profiling.py", rendering["top"][0][0])
+        self.assertLessEqual(len(rendering["top"]), 5)
+
+        # Allocation stacks are only kept for the innermost stages
+        self.assertTrue(profiler.stacks)
+        self.assertFalse(any(stack.split(";")[:2] == ["run", "test_profiling.py"]
+                             for stack in profiler.stacks))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profiler.save(temp_dir)
+            self.assertEqual(sorted(os.listdir(temp_dir)), ["profile_memory.collapsed", "profile_memory.txt"])
+
+    def test_unsupported_mode(self):
+        """Test that unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            StageProfiler("disk")
+
+
+if __name__ == "__main__":
+    unittest.main()
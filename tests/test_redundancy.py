@@ -0,0 +1,70 @@
+"""Tests for the gist redundancy pruning module."""
+import unittest
+
+from src.synthesizers.redundancy import prune_redundant_gists
+
+
+class TestRedundancyPruning(unittest.TestCase):
+    """Test case for near-duplicate gist pruning."""
+
+    def test_prunes_near_duplicates(self):
+        """Test that repeated points collapse into one annotated line."""
+        transcript = "\n".join([
+            "# Title\n",
+            "## Main Thesis",
+            "Digital literacy is essential for economic success today.",
+            "",
+            "## Key Points",
+            "* ✓ Digital literacy is essential for economic success today.",
+            "* ✓ Many adults lack basic digital skills worldwide.",
+            "* Digital literacy is truly essential for economic success today.",
+            "",
+            "## Conclusion",
+            "Many adults lack basic digital skills worldwide."
+        ])
+
+        result = prune_redundant_gists(transcript)
+
+        self.assertEqual(len(result.clusters), 2)
+        self.assertEqual(result.lines_removed, 3)
+        # The thesis repeated as a key point counts once
+        self.assertIn("Digital literacy is essential for economic success today. (stated 2 times)",
+                      result.transcript)
+        self.assertIn("* ✓ Many adults lack basic digital skills worldwide.\n", result.transcript)
+        self.assertNotIn("worldwide. (stated", result.transcript)
+        # The conclusion section lost its only item and is dropped
+        self.assertNotIn("## Conclusion", result.transcript)
+        self.assertGreater(result.tokens_saved, 0)
+
+    def test_repeated_paragraph(self):
+        """Test that a paragraph repeated across sections is kept once without a count."""
+        transcript = "\n".join([
+            "# Title\n",
+            "## Key Points",
+            "* ✓ Many adults lack basic digital skills worldwide.",
+            "",
+            "## Supporting Arguments",
+            "* Many adults lack basic digital skills worldwide.",
+            "* Libraries run free courses for older residents."
+        ])
+
+        result = prune_redundant_gists(transcript)
+
+        self.assertEqual(result.lines_removed, 1)
+        self.assertEqual(result.transcript.count("Many adults lack"), 1)
+        self.assertNotIn("(stated", result.transcript)
+        self.assertIn("* Libraries run free courses for older residents.", result.transcript)
+
+    def test_keeps_distinct_gists(self):
+        """Test that unrelated gists are left untouched."""
+        transcript = "# Title\n\n## Key Points\n* First distinct claim here.\n* Another unrelated statement."
+
+        result = prune_redundant_gists(transcript)
+
+        self.assertEqual(result.transcript, transcript)
+        self.assertEqual(result.clusters, [])
+        self.assertEqual(result.tokens_saved, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
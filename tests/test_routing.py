@@ -0,0 +1,133 @@
+"""Tests for model routing."""
+import unittest
+
+from benchmarks.fake_llm import FakeLLMClient
+from src.models.document import ArgumentRole, StructuralTag
+from src.processors.routing import (
+    ADAPTIVE, FAST, FIXED, LARGE, STANDARD, ModelRouter, preclassify
+)
+from src.processors.text_processor import TextProcessor
+from src.synthesizers.basic_synthesis import refine_transcript
+from src.utils.metrics import (
+    ANALYZE, IMAGE_TAG, LLM_ROUTE_ESCALATIONS, LLM_ROUTES, REFINE, route_latencies
+)
+
+MODELS = {FAST: "small-model", STANDARD: "medium-model", LARGE: "big-model"}
+
+EXAMPLE = "For example, the library in one town trained two hundred adults to use online services."
+
+
+class FlakyClient(FakeLLMClient):
+    """Answers analysis requests to the small model with text that is not JSON."""
+
+    def __init__(self):
+        super().__init__()
+        self.models = []
+        self.chat.completions.create = self.create
+
+    def create(self, model, messages, **kwargs):
+        self.models.append((model, kwargs["max_tokens"]))
+        response = self.respond(messages, kwargs["max_tokens"])
+        if model == "small-model" and "document analysis" in messages[0]["content"]:
+            response.choices[0].message.content = "Sorry, I cannot help with that."
+        return response
+
+
+class TestRouting(unittest.TestCase):
+    """Test case for pre-classification, routing decisions and escalation."""
+
+    def setUp(self):
+        """Create an adaptive router with test model names."""
+        self.router = ModelRouter(ADAPTIVE, models=MODELS)
+
+    def test_preclassify(self):
+        """Test that cue phrases and position decide the guess and its confidence."""
+        guess = preclassify(EXAMPLE, "middle")
+        self.assertEqual(guess.structural_tag, StructuralTag.EXAMPLE)
+        self.assertGreaterEqual(guess.confidence, 0.5)
+
+        plain = preclassify("Broadband access shapes how citizens reach public services.", "middle")
+        self.assertEqual(plain.structural_tag, StructuralTag.POINT)
+        self.assertLess(plain.confidence, guess.confidence)
+
+        self.assertEqual(preclassify("In conclusion, access matters.", "end").structural_tag,
+                         StructuralTag.CONCLUSION)
+        mixed = preclassify("For example, critics say this. In conclusion, however, it works.", "middle")
+        self.assertEqual(mixed.argument_role, ArgumentRole.COUNTERPOINT)
+        self.assertLess(mixed.confidence, 0.25)
+
+    def test_route_analysis(self):
+        """Test the route of paragraphs by length, position and confidence."""
+        long_text = " ".join(["Evidence from many schools shows steady growth."] * 60)
+        self.assertEqual(self.router.route_analysis(EXAMPLE, "middle").tier, FAST)
+        self.assertEqual(self.router.route_analysis(EXAMPLE, "beginning").tier, STANDARD)
+        self.assertEqual(self.router.route_analysis("Access shapes services for citizens.", "middle").tier,
+                         STANDARD)
+        self.assertEqual(self.router.route_analysis(long_text, "middle").tier, LARGE)
+        self.assertGreater(self.router.route_analysis(long_text, "middle").max_tokens, 300)
+
+        fast = LLM_ROUTES.get(call=ANALYZE, route=FAST, reason="obvious")
+        self.router.route_analysis(EXAMPLE, "middle")
+        self.assertEqual(LLM_ROUTES.get(call=ANALYZE, route=FAST, reason="obvious"), fast + 1)
+
+        # Fixed routing keeps the standard model and the original limits
+        fixed = ModelRouter(FIXED, models=MODELS)
+        route = fixed.route_analysis(long_text, "middle")
+        self.assertEqual((route.model, route.max_tokens), ("medium-model", 300))
+        self.assertEqual(fixed.route_image_tag("A sentence.").max_tokens, 50)
+
+    def test_default_routing(self):
+        """Test that a default run issues the calls of fixed routing, also for chunks."""
+        # Plain English chunks of 400 tokens run to about 300 words
+        sentence = "The town library trained many of its adults to use the new online forms."
+        long_text = " ".join([sentence] * 80)
+
+        processor = TextProcessor(api_key="test_key", request_delay=0)
+        processor.client = FlakyClient()
+        processor._analyze_paragraph(long_text, "middle", "Title")
+        processor._analyze_paragraph(EXAMPLE, "middle", "Title")
+        self.assertEqual({model for model, _ in processor.client.models}, {"gpt-3.5-turbo"})
+        self.assertEqual({limit for _, limit in processor.client.models}, {300, 50})
+
+        # Chunks of a long paragraph are not routed to the large model for their length
+        processor = TextProcessor(api_key="test_key", request_delay=0, router=self.router)
+        processor.client = FlakyClient()
+        processor._analyze_paragraph(long_text, "middle", "Title")
+        self.assertNotIn("big-model", {model for model, _ in processor.client.models})
+
+    def test_escalation(self):
+        """Test that an unparseable response is retried on the next route."""
+        processor = TextProcessor(api_key="test_key", request_delay=0, router=self.router)
+        processor.client = FlakyClient()
+        escalations = LLM_ROUTE_ESCALATIONS.get(call=ANALYZE, from_route=FAST, to_route=STANDARD)
+
+        tag, role, gist, sentences = processor._analyze_paragraph(EXAMPLE, "middle", "Title")
+        self.assertNotEqual(tag, StructuralTag.UNKNOWN)
+        self.assertEqual([model for model, _ in processor.client.models[:2]], ["small-model", "medium-model"])
+        first_limit, second_limit = processor.client.models[0][1], processor.client.models[1][1]
+        self.assertEqual(second_limit, first_limit * 2)
+        # Image tags go to the small model
+        self.assertEqual(processor.client.models[2][0], "small-model")
+        self.assertEqual(LLM_ROUTE_ESCALATIONS.get(call=ANALYZE, from_route=FAST, to_route=STANDARD),
+                         escalations + 1)
+        self.assertGreaterEqual(route_latencies()[ANALYZE][FAST]["calls"], 1)
+
+        # The doubled limit is capped per call type
+        image_tag = self.router.route_image_tag("A sentence.")
+        self.assertEqual(self.router.escalate(IMAGE_TAG, image_tag).max_tokens, 100)
+        self.assertEqual(self.router.escalate(IMAGE_TAG, self.router.route(STANDARD, 100)).max_tokens, 100)
+        self.assertEqual(self.router.escalate(ANALYZE, self.router.route(STANDARD, 800)).max_tokens, 1000)
+        refinement = self.router.route_refinement("# Title\n\nA short transcript.", 200)
+        self.assertEqual(self.router.escalate(REFINE, refinement).max_tokens, 200)
+
+    def test_refinement_route(self):
+        """Test that long transcripts are refined with the large model."""
+        client = FlakyClient()
+        refine_transcript("# Title\n\nA short transcript.", client, router=self.router)
+        refine_transcript("# Title\n\n" + "A long transcript line. " * 3000, client, router=self.router)
+        refine_transcript("# Title\n\nA short transcript.", client, max_tokens=200)
+        self.assertEqual(client.models, [("medium-model", 1000), ("big-model", 1000), ("gpt-3.5-turbo", 200)])
+
+
+if __name__ == "__main__":
+    unittest.main()
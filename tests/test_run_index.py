@@ -0,0 +1,80 @@
+"""Tests for the run index module."""
+import os
+import tempfile
+import unittest
+
+from src.models.document import Document, Paragraph, StructuralTag
+from src.models.serialization import FORMAT_BINARY, FORMAT_JSON, save_document
+from src.reporting.run_index import INDEX_FILENAME, RunIndex, update_index, write_run_info
+
+
+class TestRunIndex(unittest.TestCase):
+    """Test case for indexing runs in an output directory."""
+
+    def setUp(self):
+        """Create an output directory with two runs and one unrelated folder."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        document = Document(
+            metadata={"title": "Test Document", "filename": "test.txt"},
+            paragraphs=[
+                Paragraph(id="p-1", text="one two three four five six seven eight nine ten",
+                          structural_tag=StructuralTag.THESIS),
+                Paragraph(id="p-2", text="one two three four five six seven eight nine ten",
+                          structural_tag=StructuralTag.POINT),
+            ]
+        )
+        self.old_run = self._make_run("test_20250101_090000", document, FORMAT_JSON)
+        self.new_run = self._make_run("test_20250102_090000", document, FORMAT_BINARY)
+        write_run_info(self.new_run, {
+            "timings": {"total": 2.5, "processing": 2.0},
+            "token_usage": {"prompt_tokens": 120, "completion_tokens": 30, "calls": 4},
+        })
+        os.makedirs(os.path.join(self.root, "empty"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_run(self, name, document, fmt):
+        run_dir = os.path.join(self.root, name)
+        os.makedirs(run_dir)
+        filename = "processed_document.samd" if fmt == FORMAT_BINARY else "processed_document.json"
+        save_document(document, os.path.join(run_dir, filename), fmt, synthesis="one two three four five")
+        return run_dir
+
+    def test_rows(self):
+        """Test that runs are summarized newest first and other folders skipped."""
+        index, read = update_index(self.root)
+
+        self.assertEqual(read, 3)
+        self.assertEqual(index.columns["run"], ["test_20250102_090000", "test_20250101_090000"])
+        row = index.rows()[0]
+        self.assertEqual(row["created"], "2025-01-02T09:00:00")
+        self.assertEqual(row["original_words"], 20)
+        self.assertEqual(row["reduction_pct"], 75.0)
+        self.assertEqual((row["tag_thesis"], row["tag_point"], row["tag_example"]), (1, 1, 0))
+        self.assertEqual((row["total_seconds"], row["prompt_tokens"], row["api_calls"]), (2.5, 120, 4))
+        self.assertIsNone(index.rows()[1]["total_seconds"])
+
+    def test_incremental_update(self):
+        """Test that only changed runs are read again and deleted runs dropped."""
+        update_index(self.root)
+        _, read = update_index(self.root)
+        self.assertEqual(read, 0)
+
+        write_run_info(self.old_run, {"timings": {"total": 1.0}})
+        index, read = update_index(self.root)
+        self.assertEqual(read, 1)
+        self.assertEqual(index.rows()[1]["total_seconds"], 1.0)
+
+        os.remove(os.path.join(self.new_run, "processed_document.samd"))
+        os.remove(os.path.join(self.new_run, "run_info.json"))
+        os.rmdir(self.new_run)
+        index = RunIndex.load(os.path.join(self.root, INDEX_FILENAME))
+        self.assertEqual(len(index), 2)
+        index, _ = update_index(self.root)
+        self.assertEqual(index.columns["run"], ["test_20250101_090000"])
+
+
+if __name__ == "__main__":
+    unittest.main()
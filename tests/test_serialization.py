@@ -0,0 +1,139 @@
+"""Tests for the document serialization module."""
+import glob
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.models.document import (
+    Document, Paragraph, GistSentence, StructuralTag, ArgumentRole
+)
+from src.models.serialization import (
+    FORMAT_BINARY, FORMAT_JSON, FORMAT_NDJSON, NDJSONWriter, SerializationError, dumps, loads,
+    iter_output_json, load_document, to_output_dict, save_document, sniff_format
+)
+
+
+class TestSerialization(unittest.TestCase):
+    """Test case for document serialization."""
+
+    def setUp(self):
+        """Set up a processed test document."""
+        self.document = Document(
+            metadata={"title": "Test Document", "source_path": "test.txt"},
+            paragraphs=[
+                Paragraph(id="p-1", text="Test Document"),
+                Paragraph(
+                    id="p-2",
+                    text="Digital literacy matters — für alle.",
+                    structural_tag=StructuralTag.THESIS,
+                    argument_role=ArgumentRole.SUPPORTING,
+                    gist="Digital literacy matters.",
+                    gist_sentences=[GistSentence(text="Digital literacy matters.", image_tag="A laptop")]
+                )
+            ]
+        )
+
+    def test_json_round_trip(self):
+        """Test that JSON output loads back to an equal document."""
+        data = dumps(self.document, FORMAT_JSON, synthesis="Summary", extras={"query": "x"})
+        loaded = loads(data)
+
+        self.assertEqual(loaded.document, self.document)
+        self.assertEqual(loaded.synthesis, "Summary")
+        self.assertEqual(loaded.extras, {"query": "x"})
+        self.assertEqual(json.loads(data)["paragraphs"][1]["word_count"], 6)
+
+    def test_streamed_json_matches_dumps(self):
+        """Test that streamed JSON chunks equal the indented output dictionary."""
+        extras = {"query": "x", "nested": {"a": [1, 2]}}
+        for document in (self.document, Document(metadata={}, paragraphs=[])):
+            expected = json.dumps(to_output_dict(document, "Summary", extras), indent=2)
+            self.assertEqual("".join(iter_output_json(document, "Summary", extras)), expected)
+
+    def test_binary_round_trip(self):
+        """Test that binary output loads back to an equal document."""
+        data = dumps(self.document, FORMAT_BINARY, synthesis="Summary")
+        loaded = loads(data)
+
+        self.assertTrue(data.startswith(b"SAMD"))
+        self.assertEqual(loaded.document, self.document)
+        self.assertEqual(loaded.synthesis, "Summary")
+        self.assertLess(len(data), len(dumps(self.document, FORMAT_JSON)))
+
+    def test_ndjson_round_trip(self):
+        """Test that NDJSON output loads back to an equal document."""
+        data = dumps(self.document, FORMAT_NDJSON, synthesis="Summary")
+        lines = data.decode('utf-8').splitlines()
+        loaded = loads(data)
+
+        self.assertEqual([json.loads(line)["type"] for line in lines],
+                         ["metadata", "paragraph", "paragraph", "synthesis"])
+        self.assertEqual(loaded.document, self.document)
+        self.assertEqual(loaded.synthesis, "Summary")
+
+    def test_ndjson_streaming(self):
+        """Test that each record is flushed and partial streams load."""
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream)
+        writer.write_header(self.document.metadata)
+        writer.write_paragraph(self.document.paragraphs[0])
+
+        partial = loads(stream.getvalue().encode('utf-8'))
+        self.assertEqual(writer.paragraphs_written, 1)
+        self.assertEqual(partial.document.paragraphs, self.document.paragraphs[:1])
+        self.assertIsNone(partial.synthesis)
+
+    def test_invalid_data(self):
+        """Test that corrupt or foreign data is rejected."""
+        data = dumps(self.document, FORMAT_BINARY)
+        with self.assertRaises(SerializationError):
+            loads(data[:-3])
+        with self.assertRaises(SerializationError):
+            loads(data[:4] + b"\x63\x00" + data[6:])
+        with self.assertRaises(SerializationError):
+            loads(b'{"title": "not a document"}')
+        with self.assertRaises(SerializationError):
+            loads(b'{"metadata": {}, "paragraphs": [{"text": "x"}]}')
+        with self.assertRaises(SerializationError):
+            loads(b'{"metadata": {}, "paragraphs": [{"id": "p-1", "text": "x", "structural_tag": "BOGUS"}]}')
+
+        # NDJSON lines that are not objects or have fields of the wrong type
+        header = dumps(Document(), FORMAT_NDJSON).split(b"\n")[0]
+        with self.assertRaises(SerializationError):
+            loads(header + b"\n[1]\n")
+        with self.assertRaises(SerializationError):
+            loads(header + b'\n{"type": "paragraph", "id": "p-1", "text": "x", "gist_sentences": 5}\n')
+
+        # Embedded metadata that is not valid JSON
+        metadata = json.dumps(self.document.metadata).encode('utf-8')
+        with self.assertRaises(SerializationError):
+            loads(data.replace(metadata, b"[" + metadata[1:], 1))
+
+    def test_save_and_sniff(self):
+        """Test saving to disk and detecting the format."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for fmt, name in ((FORMAT_JSON, "doc.json"), (FORMAT_BINARY, "doc.samd"),
+                              (FORMAT_NDJSON, "doc.ndjson")):
+                path = os.path.join(tmp_dir, name)
+                save_document(self.document, path, fmt)
+                self.assertEqual(sniff_format(path), fmt)
+                self.assertEqual(load_document(path).document, self.document)
+
+            text_path = os.path.join(tmp_dir, "plain.txt")
+            with open(text_path, 'w', encoding='utf-8') as f:
+                f.write("Just some text.")
+            self.assertIsNone(sniff_format(text_path))
+
+    def test_load_existing_outputs(self):
+        """Test loading processed documents written by earlier runs."""
+        root = os.path.join(os.path.dirname(__file__), "..", "output")
+        for path in glob.glob(os.path.join(root, "*", "processed_document.json")):
+            loaded = load_document(path)
+            self.assertTrue(loaded.document.paragraphs)
+            self.assertTrue(loaded.synthesis)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for sharded paragraph analysis."""
+import unittest
+
+from benchmarks.corpus import CorpusSpec, generate_document
+from benchmarks.fake_llm import FakeLLMClient
+from src.models.document import StructuralTag
+from src.processors.sharding import ShardedProcessor, analyze_shard, make_shards
+from src.processors.text_processor import TextProcessor
+
+
+def fake_processor():
+    """Create a processor answered by the fake client, in a worker process."""
+    processor = TextProcessor(api_key="test_key", request_delay=0)
+    processor.client = FakeLLMClient()
+    return processor
+
+
+class RecordingProcessor:
+    """Records the position context of every analyzed paragraph."""
+
+    def __init__(self):
+        self.request_delay = 0
+        self.token_usage = {"calls": 0}
+        self.contexts = {}
+
+    def _get_position_context(self, index, total):
+        return TextProcessor._get_position_context(self, index, total)
+
+    def analyze_paragraph(self, paragraph, position_context, document_title):
+        self.contexts[paragraph.id] = position_context
+        self.token_usage["calls"] += 1
+        return paragraph
+
+
+class TestSharding(unittest.TestCase):
+    """Test case for splitting documents into shards and merging the results."""
+
+    def setUp(self):
+        """Create a document whose title and two other paragraphs need no analysis."""
+        self.document = generate_document(CorpusSpec(paragraphs=20, seed=11))
+        for i in (0, 5, 20):
+            self.document.paragraphs[i].text = "Short line"
+
+    def test_make_shards(self):
+        """Test that shards are contiguous, cover the document and share the work evenly."""
+        shards = make_shards(self.document, 4)
+        self.assertEqual(len(shards), 4)
+        self.assertEqual(shards[0].start, 0)
+        self.assertEqual(shards[-1].end, 21)
+        for previous, shard in zip(shards, shards[1:]):
+            self.assertEqual(previous.end, shard.start)
+        self.assertEqual([len(shard.paragraphs) for shard in shards], [4, 5, 4, 5])
+        self.assertNotIn(5, [i for shard in shards for i, _, _ in shard.paragraphs])
+
+        # Never more shards than paragraphs to analyze
+        self.assertEqual(len(make_shards(self.document, 100)), 18)
+
+    def test_global_position_context(self):
+        """Test that paragraphs at shard edges get their position in the whole document."""
+        processor = RecordingProcessor()
+        results = [analyze_shard(shard, processor) for shard in make_shards(self.document, 8)]
+        self.assertEqual(processor.contexts[self.document.paragraphs[1].id], "beginning")
+        self.assertEqual(processor.contexts[self.document.paragraphs[2].id], "middle")
+        self.assertEqual(processor.contexts[self.document.paragraphs[18].id], "middle")
+        self.assertEqual(processor.contexts[self.document.paragraphs[19].id], "end")
+        self.assertEqual(sum(result.token_usage["calls"] for result in results), 18)
+
+    def test_matches_process_document(self):
+        """Test that a pool of processes produces the same document as processing in order."""
+        sharded = ShardedProcessor(3, fake_processor, shards_per_process=2)
+        seen = []
+        sharded.process_document(self.document, on_paragraph=lambda i, p: seen.append(i))
+        self.assertEqual(seen, list(range(21)))
+        self.assertEqual(self.document.paragraphs[5].structural_tag, StructuralTag.UNKNOWN)
+        self.assertGreater(sharded.token_usage["prompt_tokens"], 0)
+
+        expected = generate_document(CorpusSpec(paragraphs=20, seed=11))
+        for i in (0, 5, 20):
+            expected.paragraphs[i].text = "Short line"
+        processor = fake_processor()
+        processor.process_document(expected)
+        self.assertEqual([p.to_dict() for p in self.document.paragraphs],
+                         [p.to_dict() for p in expected.paragraphs])
+        self.assertEqual(sharded.token_usage, processor.token_usage)
+
+
+if __name__ == "__main__":
+    unittest.main()
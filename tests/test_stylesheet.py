@@ -0,0 +1,38 @@
+"""Tests for the comparison page stylesheet."""
+import unittest
+
+from src.synthesizers.stylesheet import compile_stylesheet, is_supported
+
+
+class TestStylesheet(unittest.TestCase):
+    """Test case for stylesheet compilation."""
+
+    def test_utilities_and_variants(self):
+        """Test that utilities compile in cascade order with variants last."""
+        css = compile_stylesheet(["hidden", "grid", "md:grid-cols-2", "hover:bg-gray-800"])
+
+        self.assertLess(css.index(".grid {"), css.index(".hidden {"))
+        self.assertIn(".hover\\:bg-gray-800:hover { background-color: #1f2937; }", css)
+        self.assertIn("@media (min-width: 768px) {\n.md\\:grid-cols-2 {", css)
+        self.assertLess(css.index(".hover\\:bg-gray-800"), css.index("@media"))
+
+    def test_components_only_when_used(self):
+        """Test that component rules are only included for classes on the page."""
+        css = compile_stylesheet(["btn", "btn-secondary"])
+
+        self.assertIn(".btn:focus {", css)
+        self.assertIn(".btn-secondary:hover { background-color: #1f2937; }", css)
+        self.assertNotIn(".btn-primary", css)
+        self.assertNotIn("pre.json", css)
+
+    def test_unsupported_classes(self):
+        """Test that unknown classes are reported."""
+        self.assertFalse(is_supported("text-purple-900"))
+        self.assertFalse(is_supported("xl:flex"))
+        self.assertTrue(is_supported("lg:px-8"))
+        with self.assertRaises(ValueError):
+            compile_stylesheet(["flex", "text-purple-900"])
+
+
+if __name__ == "__main__":
+    unittest.main()
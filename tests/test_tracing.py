@@ -0,0 +1,92 @@
+"""Tests for the tracing module."""
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.utils.tracing import STAGE, Tracer, begin_span, end_span, get_tracer, span, start_tracing, stop_tracing
+
+
+class TestTracing(unittest.TestCase):
+    """Test case for recording and exporting spans."""
+
+    def tearDown(self):
+        """Turn tracing off again."""
+        stop_tracing()
+
+    def test_inactive(self):
+        """Test that spans are not recorded while tracing is off."""
+        self.assertIsNone(get_tracer())
+        with span("work"):
+            pass
+        end_span(begin_span("stage", STAGE))
+        tracer = start_tracing()
+        self.assertEqual(tracer.spans, [])
+
+    def test_nested_spans(self):
+        """Test that nested spans are recorded inside their parent."""
+        tracer = start_tracing()
+        outer = begin_span("run", STAGE)
+        with span("inner", paragraph="p-1"):
+            pass
+        end_span(outer)
+
+        inner, run = tracer.spans
+        self.assertEqual((run.name, run.category), ("run", STAGE))
+        self.assertEqual(inner.args, {"paragraph": "p-1"})
+        self.assertGreaterEqual(inner.start, run.start)
+        self.assertLessEqual(inner.start + inner.duration, run.start + run.duration)
+        self.assertEqual(tracer.stage_timings(), {"run": run.duration})
+
+    def test_span_recorded_on_error(self):
+        """Test that a span is finished when its block raises."""
+        tracer = start_tracing()
+        with self.assertRaises(RuntimeError):
+            with span("failing"):
+                raise RuntimeError("boom")
+        self.assertEqual([record.name for record in tracer.spans], ["failing"])
+
+    def test_chrome_trace(self):
+        """Test the exported Chrome trace events."""
+        tracer = Tracer()
+        with tracer.span("outer", STAGE):
+            with tracer.span("inner"):
+                pass
+        worker = threading.Thread(target=lambda: tracer.end(tracer.begin("threaded")))
+        worker.start()
+        worker.join()
+
+        events = tracer.to_chrome_trace()["traceEvents"]
+        metadata = [event for event in events if event["ph"] == "M"]
+        spans = [event for event in events if event["ph"] == "X"]
+        self.assertEqual([event["args"]["name"] for event in metadata], ["main", "worker-1"])
+        self.assertEqual([event["name"] for event in spans], ["outer", "inner", "threaded"])
+        self.assertEqual(spans[0]["cat"], STAGE)
+        self.assertEqual(spans[2]["tid"], 1)
+        self.assertTrue(all(event["dur"] >= 0 for event in spans))
+
+    def test_summary_and_save(self):
+        """Test the per-span summary and the saved files."""
+        tracer = Tracer()
+        for _ in range(3):
+            with tracer.span("call"):
+                pass
+
+        summary = tracer.summary()
+        self.assertEqual(summary["call"]["count"], 3)
+        self.assertAlmostEqual(summary["call"]["mean"], summary["call"]["total"] / 3)
+        self.assertIn("call", tracer.format_summary())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_path = os.path.join(temp_dir, "trace.json")
+            summary_path = tracer.save(trace_path)
+            self.assertEqual(summary_path, os.path.join(temp_dir, "trace_summary.json"))
+            with open(trace_path, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)["traceEvents"]), 4)
+            with open(summary_path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["call"]["count"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
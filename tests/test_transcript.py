@@ -0,0 +1,174 @@
+"""Tests for the transcript engine."""
+import random
+import unittest
+
+from src.models.document import Document, Paragraph, StructuralTag, ArgumentRole
+from src.synthesizers.basic_synthesis import generate_transcript
+from src.synthesizers.transcript import TranscriptBuilder, TranscriptSection, DEFAULT_SECTIONS
+
+
+# Reference copy of the original multi-pass implementation
+def _legacy_generate_transcript(document: Document) -> str:
+    """
+    Generate a programmatic transcript from the document structure.
+    
+    This function creates a structured summary using only the gists of paragraphs
+    and their structural/argument roles.
+    
+    Args:
+        document: The processed document with gists and tags
+        
+    Returns:
+        str: A structured transcript of the document
+    """
+    if not document.paragraphs:
+        return "No content to summarize."
+    
+    transcript_parts = []
+    
+    # Add document title/metadata
+    title = document.metadata.get('title', 'Untitled Document')
+    transcript_parts.append(f"# {title}\n")
+    
+    # Find thesis (abstract/introduction) paragraphs
+    thesis_paragraphs = []
+    for p in document.paragraphs:
+        # Skip very short paragraphs and titles
+        if len(p.text.split()) < 5:
+            continue
+            
+        # Check for thesis paragraphs (by tag or keywords)
+        if (p.structural_tag.name == "THESIS" or
+            "abstract" in p.text.lower() or
+            "introduction" in p.text.lower()):
+            thesis_paragraphs.append(p)
+    
+    # If we found thesis paragraphs, add them
+    if thesis_paragraphs:
+        transcript_parts.append("## Main Thesis")
+        for p in thesis_paragraphs[:2]:  # Limit to first two thesis paragraphs
+            transcript_parts.append(p.gist)
+        transcript_parts.append("")
+    
+    # Add main points
+    main_points = []
+    for p in document.paragraphs:
+        # Skip very short paragraphs and already used thesis paragraphs
+        if len(p.text.split()) < 5 or p in thesis_paragraphs:
+            continue
+            
+        # Check for point paragraphs
+        if p.structural_tag.name == "POINT" and p.argument_role.name != "UNKNOWN":
+            main_points.append(p)
+    
+    if main_points:
+        transcript_parts.append("## Key Points")
+        for i, p in enumerate(main_points, 1):
+            if p.argument_role.name == "COUNTERPOINT":
+                transcript_parts.append(f"* 🔄 Counterpoint: {p.gist}")
+            elif p.argument_role.name == "SUPPORTING":
+                transcript_parts.append(f"* ✓ {p.gist}")
+            else:
+                transcript_parts.append(f"* {p.gist}")
+        transcript_parts.append("")
+    
+    # Add examples and evidence
+    examples = []
+    for p in document.paragraphs:
+        if p.structural_tag.name == "EXAMPLE" or "example" in p.text.lower():
+            examples.append(p)
+    
+    if examples:
+        transcript_parts.append("## Supporting Evidence")
+        for p in examples:
+            transcript_parts.append(f"* {p.gist}")
+        transcript_parts.append("")
+    
+    # Add conclusion
+    conclusions = []
+    for p in document.paragraphs:
+        if (p.structural_tag.name == "CONCLUSION" or 
+            "conclusion" in p.text.lower() or
+            "in summary" in p.text.lower()):
+            conclusions.append(p)
+    
+    if conclusions:
+        transcript_parts.append("## Conclusion")
+        for p in conclusions:
+            transcript_parts.append(p.gist)
+    
+    return "\n".join(transcript_parts)
+
+
+def _random_document(rng: random.Random, count: int) -> Document:
+    """Create a document with random tags, roles and keyword-bearing text."""
+    fillers = ["alpha", "beta", "gamma", "delta", "abstract", "introduction",
+               "example", "conclusion", "in summary", "In Summary", "EXAMPLE"]
+    paragraphs = []
+    for i in range(count):
+        words = rng.choices(fillers, k=rng.randint(1, 9))
+        paragraphs.append(Paragraph(
+            id=f"p-{i + 1}",
+            text=" ".join(words),
+            structural_tag=rng.choice(list(StructuralTag)),
+            argument_role=rng.choice(list(ArgumentRole)),
+            gist=f"Gist {i + 1}."
+        ))
+    return Document(metadata={"title": "Random"}, paragraphs=paragraphs)
+
+
+class TestTranscript(unittest.TestCase):
+    """Test case for the transcript engine."""
+
+    def test_matches_original_output(self):
+        """Test that the default layout reproduces the original transcript."""
+        rng = random.Random(42)
+        for count in (0, 1, 3, 10, 60):
+            for _ in range(20):
+                document = _random_document(rng, count)
+                self.assertEqual(generate_transcript(document),
+                                 _legacy_generate_transcript(document))
+
+    def test_exclusive_sections(self):
+        """Test that exclusive mode places each paragraph only once."""
+        document = Document(
+            metadata={"title": "Doc"},
+            paragraphs=[Paragraph(
+                id="p-1",
+                text="In conclusion, this example shows the whole idea.",
+                structural_tag=StructuralTag.EXAMPLE,
+                argument_role=ArgumentRole.SUPPORTING,
+                gist="The idea holds."
+            )]
+        )
+
+        self.assertEqual(generate_transcript(document).count("The idea holds."), 2)
+        self.assertEqual(generate_transcript(document, exclusive=True).count("The idea holds."), 1)
+
+    def test_custom_sections_and_order(self):
+        """Test custom section templates and output ordering."""
+        sections = list(DEFAULT_SECTIONS) + [
+            TranscriptSection(key="unknown", heading="Other", tags=("UNKNOWN",), item_format="- {gist}")
+        ]
+        builder = TranscriptBuilder(sections, order=["unknown", "thesis"])
+        document = Document(
+            metadata={"title": "Doc"},
+            paragraphs=[
+                Paragraph(id="p-1", text="Untagged text here.", gist="Untagged."),
+                Paragraph(id="p-2", text="The main claim of this text.",
+                          structural_tag=StructuralTag.THESIS, gist="Claim.")
+            ]
+        )
+
+        self.assertEqual(builder.build(document), "# Doc\n\n## Other\n- Untagged.\n\n## Main Thesis\nClaim.\n")
+
+    def test_invalid_configuration(self):
+        """Test that invalid section configurations are rejected."""
+        with self.assertRaises(ValueError):
+            TranscriptBuilder([TranscriptSection(key="a", heading="A", exclude=("b",))])
+        with self.assertRaises(ValueError):
+            TranscriptBuilder(order=["missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Tests for the work queue and paragraph jobs."""
+import os
+import tempfile
+import threading
+import unittest
+
+from benchmarks.corpus import CorpusSpec, generate_document
+from benchmarks.fake_llm import FakeLLMClient
+from src.jobs.paragraph_jobs import apply_results, enqueue_document, run_worker
+from src.jobs.work_queue import DONE, FAILED, LEASED, QUEUED, WorkQueue
+from src.models.document import StructuralTag
+from src.processors.text_processor import TextProcessor
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWorkQueue(unittest.TestCase):
+    """Test case for leasing, completing and requeueing jobs."""
+
+    def setUp(self):
+        """Create a queue in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "queue.db")
+        self.clock = FakeClock()
+        self.queue = WorkQueue(self.path, lease_seconds=60, max_attempts=2, clock=self.clock)
+
+    def tearDown(self):
+        """Remove the queue."""
+        self.temp_dir.cleanup()
+
+    def test_claim_and_complete(self):
+        """Test that jobs are handed out once and results come back in order."""
+        batch = self.queue.create_batch([(2, {"n": 2}), (0, {"n": 0}), (1, {"n": 1})], {"title": "T"})
+        claimed = [self.queue.claim("w1"), self.queue.claim("w2"), self.queue.claim("w1")]
+        self.assertIsNone(self.queue.claim("w2"))
+        self.assertEqual(sorted(job.seq for job in claimed), [0, 1, 2])
+        self.assertEqual(self.queue.counts(batch)[LEASED], 3)
+
+        for job in reversed(claimed):
+            worker = "w2" if job is claimed[1] else "w1"
+            self.assertTrue(self.queue.complete(job, worker, {"double": job.payload["n"] * 2}))
+
+        results = self.queue.results(batch)
+        self.assertEqual([r.seq for r in results], [0, 1, 2])
+        self.assertEqual([r.result["double"] for r in results], [0, 2, 4])
+        self.assertEqual(self.queue.counts(batch)[DONE], 3)
+        self.assertEqual(self.queue.batch_metadata(batch), {"title": "T"})
+
+    def test_expired_lease_is_requeued(self):
+        """Test that a job whose worker stopped renewing its lease goes to another worker."""
+        batch = self.queue.create_batch([(0, {})])
+        first = self.queue.claim("w1")
+
+        # Heartbeats keep the lease alive past its original expiry
+        self.clock.now += 50
+        self.assertTrue(self.queue.heartbeat(first, "w1"))
+        self.clock.now += 50
+        self.assertIsNone(self.queue.claim("w2"))
+
+        # Without heartbeats the lease expires and the job is claimed again
+        self.clock.now += 61
+        second = self.queue.claim("w2")
+        self.assertEqual((second.id, second.attempts), (first.id, 2))
+        self.assertFalse(self.queue.heartbeat(first, "w1"))
+        self.assertFalse(self.queue.complete(first, "w1", {"stale": True}))
+        self.assertTrue(self.queue.complete(second, "w2", {"fresh": True}))
+        self.assertEqual(self.queue.results(batch)[0].result, {"fresh": True})
+
+    def test_attempts_exhausted(self):
+        """Test that jobs fail after too many failed or expired attempts."""
+        batch = self.queue.create_batch([(0, {}), (1, {})])
+        job = self.queue.claim("w1")
+        self.assertTrue(self.queue.fail(job, "w1", "rate limited"))
+        self.assertEqual(self.queue.counts(batch)[QUEUED], 2)
+
+        job = self.queue.claim("w1")
+        self.queue.fail(job, "w1", "rate limited again")
+        other = self.queue.claim("w1")
+        self.assertNotEqual(other.id, job.id)
+
+        # A second expired lease also uses up the last attempt
+        self.clock.now += 61
+        self.assertEqual(self.queue.requeue_expired(), 1)
+        other = self.queue.claim("w1")
+        self.clock.now += 61
+        self.assertEqual(self.queue.requeue_expired(), 1)
+
+        results = self.queue.results(batch)
+        self.assertEqual([r.status for r in results], [FAILED, FAILED])
+        self.assertEqual(results[0].error, "rate limited again")
+        self.assertEqual(results[1].error, "Lease expired")
+        self.assertEqual(self.queue.wait(batch, poll_interval=0)[FAILED], 2)
+
+    def test_wait_timeout(self):
+        """Test that waiting for an unfinished batch can time out."""
+        batch = self.queue.create_batch([(0, {})])
+        with self.assertRaises(TimeoutError):
+            self.queue.wait(batch, poll_interval=0.01, timeout=0.05)
+
+    def test_wait_stops_without_workers(self):
+        """Test that waiting stops once nobody works on the batch any more."""
+        batch = self.queue.create_batch([(0, {})])
+        self.assertEqual(self.queue.wait(batch, poll_interval=0, active=lambda: False)[QUEUED], 1)
+
+    def test_paragraph_jobs(self):
+        """Test processing a document with several workers sharing the queue."""
+        document = generate_document(CorpusSpec(paragraphs=12, seed=5))
+        document.paragraphs[3].text = "Short line"
+        queue = WorkQueue(self.path)
+        batch = enqueue_document(queue, document)
+        self.assertEqual(sum(queue.counts(batch).values()), 12)  # All but the short paragraph
+
+        def work(name):
+            processor = TextProcessor(api_key="test_key", request_delay=0)
+            processor.client = FakeLLMClient(latency=0.001)
+            completed[name] = run_worker(queue, processor, name, idle_timeout=0, poll_interval=0.01)
+
+        completed = {}
+        threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(completed.values()), 12)
+        self.assertEqual(apply_results(queue, batch, document), 0)
+        self.assertEqual(document.paragraphs[3].structural_tag, StructuralTag.UNKNOWN)
+
+        # Results match what processing the document in order produces
+        expected = generate_document(CorpusSpec(paragraphs=12, seed=5))
+        expected.paragraphs[3].text = "Short line"
+        processor = TextProcessor(api_key="test_key", request_delay=0)
+        processor.client = FakeLLMClient()
+        processor.process_document(expected)
+        self.assertEqual([p.to_dict() for p in document.paragraphs],
+                         [p.to_dict() for p in expected.paragraphs])
+
+
+if __name__ == "__main__":
+    unittest.main()